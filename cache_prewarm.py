@@ -0,0 +1,289 @@
+"""
+🔥 Cache Pre-warming
+อ่าน log ของคำขอ (รูปแบบเดียวกับ /full_tts) จัดอันดับ (ข้อความ, เสียง, โมเดล, พารามิเตอร์) ตามความถี่
+แล้วสร้างเสียงล่วงหน้าเบื้องหลังตอนเริ่มระบบ เพื่อเติมแคช TTS และแคชการแปลงเสียง RVC
+จำกัดอัตราและหลีกทางให้คำขอจริงเสมอ
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+from tts_cache import normalize_text
+from tts_concurrency import TokenBucket
+
+logger = logging.getLogger("CACHE_PREWARM")
+
+# พารามิเตอร์ของ /full_tts ที่มีผลต่อเสียง และค่าเริ่มต้น (เหมือนใน main_api_server)
+REQUEST_DEFAULTS = {
+    "tts_voice": "th-TH-PremwadeeNeural",
+    "tts_speed": 1.0,
+    "enable_rvc": False,
+    "rvc_model": None,
+    "rvc_transpose": 0,
+    "rvc_index_ratio": 0.7,
+    "rvc_f0_method": "rmvpe"
+}
+
+# ช่วงเวลาตรวจซ้ำระหว่างรอให้คำขอจริงเบาลง (วินาที)
+BUSY_POLL_S = 0.5
+
+_log_lock = threading.Lock()
+
+
+def append_request_log(path: str, request: Dict[str, Any], max_bytes: int = 16 * 1024 * 1024):
+    """
+    เพิ่มคำขอ /full_tts หนึ่งบรรทัดลง log (JSON Lines) สำหรับใช้ pre-warm ครั้งถัดไป
+
+    log เก็บข้อความที่ผู้ใช้ส่งมาแบบเต็ม จึงปิดไว้โดยค่าเริ่มต้น (request_log_path ว่าง)
+    เปิดใช้เฉพาะเมื่อเก็บข้อความของผู้ใช้ไว้บนดิสก์ได้ตามนโยบายความเป็นส่วนตัวของระบบ
+
+    Args:
+        path: ไฟล์ log
+        request: body ของคำขอ
+        max_bytes: ขนาดสูงสุดของไฟล์ log เมื่อเกินจะย้ายไปเป็น <path>.1 (แทนที่ไฟล์เดิม) แล้วเริ่มไฟล์ใหม่
+    """
+    entry = {key: request.get(key, default) for key, default in REQUEST_DEFAULTS.items()}
+    entry["text"] = request.get("text", "")
+    entry["ts"] = round(time.time(), 3)
+    log_path = Path(path)
+    try:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with _log_lock:
+            try:
+                if log_path.stat().st_size >= max_bytes:
+                    os.replace(log_path, f"{log_path}.1")
+            except FileNotFoundError:
+                pass
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning(f"Failed to append request log {log_path}: {e}")
+
+
+def _request_key(request: Dict[str, Any]) -> Optional[Tuple]:
+    """แปลงคำขอเป็น tuple (ข้อความ, เสียง, โมเดล, พารามิเตอร์) หรือ None ถ้าคำขอใช้ไม่ได้"""
+    # รองรับทั้งบรรทัดที่เป็น body ของคำขอโดยตรง และ access log ที่ห่อ body ไว้
+    for wrapper in ("request", "body", "json"):
+        if isinstance(request.get(wrapper), dict):
+            request = request[wrapper]
+            break
+    text = request.get("text")
+    if not isinstance(text, str) or not text.strip():
+        return None
+    params = {key: request.get(key, default) for key, default in REQUEST_DEFAULTS.items()}
+    if not params["enable_rvc"] or not params["rvc_model"]:
+        # พารามิเตอร์ RVC ไม่มีผลเมื่อไม่ได้แปลงเสียง
+        params.update(enable_rvc=False, rvc_model=None, rvc_transpose=0, rvc_index_ratio=0.7, rvc_f0_method="rmvpe")
+    try:
+        return (
+            normalize_text(text),
+            str(params["tts_voice"]),
+            params["rvc_model"],
+            float(params["tts_speed"]),
+            int(params["rvc_transpose"]),
+            float(params["rvc_index_ratio"]),
+            str(params["rvc_f0_method"])
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def rank_requests(lines: Iterable[str]) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    จัดอันดับคำขอจาก log ตามความถี่
+
+    Args:
+        lines: บรรทัดของ log (JSON หนึ่งคำขอต่อบรรทัด บรรทัดที่อ่านไม่ได้จะถูกข้าม)
+
+    Returns:
+        List[Tuple[Dict, int]]: (พารามิเตอร์สำหรับ process_unified, จำนวนครั้ง) เรียงจากบ่อยที่สุด
+    """
+    counts: Counter = Counter()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(request, dict):
+            key = _request_key(request)
+            if key is not None:
+                counts[key] += 1
+
+    ranked = []
+    for (text, voice, rvc_model, speed, transpose, index_ratio, f0_method), count in counts.most_common():
+        ranked.append(({
+            "text": text,
+            "tts_voice": voice,
+            "tts_speed": speed,
+            "enable_rvc": rvc_model is not None,
+            "rvc_model": rvc_model,
+            "rvc_transpose": transpose,
+            "rvc_index_ratio": index_ratio,
+            "rvc_f0_method": f0_method
+        }, count))
+    return ranked
+
+
+class CachePrewarmer:
+    """งานเบื้องหลังที่เล่นคำขอยอดนิยมจาก log ซ้ำผ่าน core เพื่อเติมแคช"""
+
+    def __init__(self, core, log_paths: Iterable[str], max_entries: int = 200, min_count: int = 2,
+                 rate_per_s: float = 0.5, max_text_chars: int = 3000, start_delay_s: float = 5.0):
+        """
+        เริ่มต้นงาน pre-warm
+
+        Args:
+            core: TTSRVCCore ที่ใช้สร้างเสียง (แคชของ core จะถูกเติม)
+            log_paths: ไฟล์ log ของคำขอ (JSON Lines)
+            max_entries: จำนวนคำขอยอดนิยมสูงสุดที่จะสร้างล่วงหน้า
+            min_count: จำนวนครั้งขั้นต่ำที่คำขอต้องปรากฏใน log
+            rate_per_s: จำนวนคำขอ pre-warm สูงสุดต่อวินาที
+            max_text_chars: ข้ามข้อความที่ยาวกว่านี้ (ข้อความยาวไม่คุ้มที่จะสร้างล่วงหน้า)
+            start_delay_s: เวลารอหลังเริ่มระบบก่อนเริ่มงาน
+        """
+        self.core = core
+        self.log_paths = [Path(path) for path in log_paths]
+        self.max_entries = max(0, int(max_entries))
+        self.min_count = max(1, int(min_count))
+        self.max_text_chars = max_text_chars
+        self.start_delay_s = start_delay_s
+        # burst 1: ไม่ส่งคำขอ pre-warm ติดกันเป็นชุด
+        self.bucket = TokenBucket(rate_per_s, 1)
+        self._task: Optional[asyncio.Task] = None
+        self.progress: Dict[str, Any] = {
+            "state": "idle",
+            "total": 0,
+            "completed": 0,
+            "failed": 0,
+            "skipped": 0,
+            "log_requests": 0,
+            "started_at": None,
+            "finished_at": None,
+            "current": None,
+            "error": None
+        }
+
+    def load(self) -> List[Tuple[Dict[str, Any], int]]:
+        """อ่านและจัดอันดับคำขอจากทุกไฟล์ log ที่มีอยู่"""
+        def lines():
+            for path in self.log_paths:
+                if not path.is_file():
+                    continue
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    yield from f
+
+        ranked = rank_requests(lines())
+        self.progress["log_requests"] = sum(count for _, count in ranked)
+        selected = []
+        for request, count in ranked:
+            if count < self.min_count or len(selected) >= self.max_entries:
+                break
+            if len(request["text"]) > self.max_text_chars:
+                self.progress["skipped"] += 1
+                continue
+            selected.append((request, count))
+        return selected
+
+    def start(self) -> asyncio.Task:
+        """เริ่มงานเบื้องหลัง (เรียกซ้ำได้ งานที่กำลังทำอยู่จะไม่ถูกเริ่มใหม่)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        """ยกเลิกงานเบื้องหลัง"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def _busy(self, request: Dict[str, Any]) -> bool:
+        """มีคำขอจริงใช้ทรัพยากรอยู่หรือไม่ (pre-warm จะรอจนกว่าจะว่าง)"""
+        stats = self.core.tts_controller.get_stats()
+        if stats["waiting"] > 0 or stats["in_flight"] >= stats["limit"]:
+            return True
+        return bool(request["enable_rvc"]) and self.core._rvc_in_flight > 0
+
+    def _can_warm_rvc(self) -> bool:
+        """
+        สร้างผลการแปลงเสียงล่วงหน้าได้หรือไม่
+
+        ต้องมีแคช RVC ให้เก็บผลลัพธ์ และมี worker อย่างน้อยสองตัว (pre-warm ใช้ได้เฉพาะเมื่อยังเหลือ worker ว่างให้คำขอจริง)
+        ถ้าไม่ได้ จะสร้างล่วงหน้าเฉพาะเสียง TTS
+        """
+        core = self.core
+        return core.rvc_available and core.rvc_cache is not None and core.rvc_max_workers > 1
+
+    async def _warm(self, request: Dict[str, Any]):
+        """สร้างเสียงของคำขอหนึ่งรายการ ผลลัพธ์ถูกเก็บในแคช TTS และแคช RVC ของ core"""
+        from tts_rvc_core import RVCQueueFullError
+
+        core = self.core
+        tts_audio = await core.generate_tts(request["text"], request["tts_voice"], request["tts_speed"])
+        if not request["enable_rvc"]:
+            return
+        while True:
+            try:
+                # background: ส่งงานได้เฉพาะเมื่อคำขอจริงยังมี worker ว่าง (ตรวจตอนส่งงาน ไม่ใช่ตอนเริ่มคำขอ)
+                await core.convert_voice_async(
+                    tts_audio, request["rvc_model"], request["rvc_transpose"],
+                    request["rvc_index_ratio"], request["rvc_f0_method"], background=True
+                )
+                return
+            except RVCQueueFullError:
+                await asyncio.sleep(BUSY_POLL_S)
+
+    async def run(self):
+        """สร้างเสียงของคำขอยอดนิยมทีละคำขอตามลำดับความถี่"""
+        progress = self.progress
+        try:
+            await asyncio.sleep(self.start_delay_s)
+            progress.update(state="loading", started_at=time.time())
+            selected = await asyncio.to_thread(self.load)
+            progress.update(state="running", total=len(selected))
+            logger.info(f"Pre-warming {len(selected)} popular requests "
+                        f"from {progress['log_requests']} logged requests")
+
+            for request, count in selected:
+                if request["enable_rvc"] and not self._can_warm_rvc():
+                    request = {**request, "enable_rvc": False, "rvc_model": None}
+                await self.bucket.acquire()
+                while self._busy(request):
+                    await asyncio.sleep(BUSY_POLL_S)
+                progress["current"] = {"text": request["text"][:60], "voice": request["tts_voice"],
+                                       "rvc_model": request["rvc_model"], "count": count}
+                try:
+                    await self._warm(request)
+                    progress["completed"] += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    progress["failed"] += 1
+                    logger.debug(f"Pre-warm request failed: {e}")
+
+            progress.update(state="done", current=None, finished_at=time.time())
+            logger.info(f"Pre-warm finished: {progress['completed']} warmed, {progress['failed']} failed")
+        except asyncio.CancelledError:
+            progress.update(state="cancelled", current=None, finished_at=time.time())
+            raise
+        except Exception as e:
+            progress.update(state="failed", current=None, error=str(e), finished_at=time.time())
+            logger.error(f"Pre-warm failed: {e}")
+
+    def get_progress(self) -> Dict[str, Any]:
+        """ความคืบหน้าของงาน pre-warm"""
+        progress = dict(self.progress)
+        total = progress["total"]
+        progress["percent"] = round(100.0 * (progress["completed"] + progress["failed"]) / total, 1) if total else 0.0
+        started = progress["started_at"]
+        if started:
+            progress["elapsed_s"] = round((progress["finished_at"] or time.time()) - started, 1)
+        return progress
@@ -98,6 +98,10 @@ except ImportError:
     RVC_AVAILABLE = False
     print("⚠️ RVC system not available")
 
+# Core system (shared TTS + RVC state)
+from tts_rvc_core import get_shared_core, shutdown_shared_core, RVCQueueFullError
+from cache_prewarm import CachePrewarmer, append_request_log
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("VICTOR-TTS-UNIFIED")
@@ -185,7 +189,9 @@ for dir_path in [config["temp_dir"], config["output_dir"], config["models_dir"]]
     Path(dir_path).mkdir(parents=True, exist_ok=True)
 
 # Global instances
+core_instance = None
 rvc_instance = None
+prewarm_instance = None
 
 # Setup GPU based on configuration and command line arguments
 def setup_gpu(args):
@@ -284,12 +290,102 @@ EDGE_VOICES = {
     "zh-CN-XiaoxiaoNeural": {"name": "Xiaoxiao (Chinese Female)", "gender": "Female", "language": "Chinese"}
 }
 
+# เสียงพื้นฐาน (แบบละเอียด สำหรับ /voices)
+VOICES_DETAILED = {
+    "lao": [
+        {
+            "value": "lo-LA-KeomanyNeural",
+            "label": "แก้วมณี (ผู้หญิง)",
+            "name_lao": "ແກ້ວມະນີ",
+            "gender": "female",
+            "language": "lao",
+            "description": "เสียงผู้หญิงลาว นุ่มนวล เป็นธรรมชาติ",
+            "recommended_speed": 0.7,
+            "icon": "👩"
+        },
+        {
+            "value": "lo-LA-ChanthavongNeural", 
+            "label": "จันทวง (ผู้ชาย)",
+            "name_lao": "ຈັນທະວົງ",
+            "gender": "male",
+            "language": "lao", 
+            "description": "เสียงผู้ชายลาว แข็งแกร่ง ชัดเจน",
+            "recommended_speed": 0.7,
+            "icon": "👨"
+        }
+    ],
+    "thai": [
+        {
+            "value": "th-TH-PremwadeeNeural",
+            "label": "เปรมวดี (ผู้หญิง)",
+            "gender": "female",
+            "language": "thai",
+            "description": "เสียงผู้หญิงไทย นุ่มนวล",
+            "recommended_speed": 0.8,
+            "icon": "👩"
+        },
+        {
+            "value": "th-TH-NiwatNeural",
+            "label": "นิวัฒน์ (ผู้ชาย)", 
+            "gender": "male",
+            "language": "thai",
+            "description": "เสียงผู้ชายไทย แข็งแกร่ง",
+            "recommended_speed": 0.8,
+            "icon": "👨"
+        }
+    ],
+    "english": [
+        {
+            "value": "en-US-AriaNeural",
+            "label": "Aria (Female)",
+            "gender": "female",
+            "language": "english",
+            "description": "American Female - Natural and expressive",
+            "recommended_speed": 1.0,
+            "icon": "👩"
+        },
+        {
+            "value": "en-US-GuyNeural",
+            "label": "Guy (Male)",
+            "gender": "male", 
+            "language": "english",
+            "description": "American Male - Clear and confident",
+            "recommended_speed": 1.0,
+            "icon": "👨"
+        },
+        {
+            "value": "en-US-JennyNeural",
+            "label": "Jenny (Female)",
+            "gender": "female",
+            "language": "english", 
+            "description": "American Female - Warm and friendly",
+            "recommended_speed": 1.0,
+            "icon": "👩"
+        }
+    ]
+}
+
+# รวมเสียงทั้งหมด (สร้างครั้งเดียวตอนโหลดโมดูล)
+VOICES_LIST = [voice for lang_voices in VOICES_DETAILED.values() for voice in lang_voices]
+
+VOICES_DATA = {
+    "voices": EDGE_VOICES,  # เสียงแบบเดิม
+    "voices_detailed": VOICES_DETAILED,  # เสียงแบบละเอียด
+    "voices_list": VOICES_LIST,  # รายการทั้งหมด
+    "total_voices": len(VOICES_LIST),
+    "languages": list(VOICES_DETAILED.keys())
+}
+
 # Request/Response Models
 class TTSRequest(BaseModel):
     text: str = Field(..., description="Text to convert to speech")
     voice: str = Field(..., description="Voice to use")
     speed: float = Field(1.0, description="Speech speed (0.5-2.0)")
     
+class TTSStreamRequest(TTSRequest):
+    pitch: str = Field("+0Hz", description="Pitch adjustment (e.g. +0Hz, +10Hz)")
+    format: str = Field("mp3", description="Stream format: mp3, or pcm (16-bit mono, 24 kHz)")
+    
 class VoiceConversionRequest(BaseModel):
     model_name: str = Field(..., description="RVC model name")
     transpose: int = Field(0, description="Transpose (-12 to 12)")
@@ -303,6 +399,21 @@ class UnifiedRequest(BaseModel):
     enable_rvc: bool = Field(False, description="Enable voice conversion")
     rvc_params: Optional[VoiceConversionRequest] = Field(None, description="RVC parameters")
 
+class UnifiedStreamRequest(UnifiedRequest):
+    first_chunk_chars: int = Field(60, description="Maximum length of the first sentence chunk")
+    crossfade_ms: int = Field(20, description="Crossfade at sentence joins (ms)")
+    sample_rate: int = Field(44100, description="Output PCM sample rate")
+
+class TemplateTTSRequest(BaseModel):
+    template: str = Field(..., description="Template text with {slot} placeholders, e.g. 'Order {id} has shipped to {city}'")
+    slots: Dict[str, Any] = Field(default_factory=dict, description="Slot values")
+    tts_voice: str = Field(..., description="TTS voice")
+    speed: float = Field(1.0, description="Speech speed")
+    pitch: str = Field("+0Hz", description="Pitch adjustment (e.g. +0Hz, +10Hz)")
+    enable_rvc: bool = Field(False, description="Enable voice conversion")
+    rvc_params: Optional[VoiceConversionRequest] = Field(None, description="RVC parameters")
+    crossfade_ms: Optional[int] = Field(None, description="Crossfade at fragment joins (ms)")
+
 class APIResponse(BaseModel):
     success: bool
     message: str
@@ -324,18 +435,28 @@ def cleanup_temp_files():
     except Exception as e:
         logger.error(f"Cleanup error: {e}")
 
+def get_core():
+    """Get the process-wide TTS-RVC core, creating it on first use"""
+    global core_instance
+    if core_instance is None:
+        use_gpu = config["gpu"]["enabled"] and GPU_AVAILABLE
+        core_instance = get_shared_core(use_gpu=use_gpu, gpu_id=config["gpu"]["device_id"])
+        logger.info(f"TTS-RVC core initialized on {core_instance.device}")
+    return core_instance
+
 def initialize_rvc():
-    """Initialize RVC system"""
+    """Initialize RVC system (shared with the core instance)"""
     global rvc_instance
     try:
         if not RVC_AVAILABLE:
             return False
             
         if rvc_instance is None:
-            # Pass GPU configuration to RVC
-            device = f"cuda:{config['gpu']['device_id']}" if config["gpu"]["enabled"] and GPU_AVAILABLE else "cpu"
-            rvc_instance = RVCConverter(device=device)
-            logger.info(f"RVC initialized successfully on {device}")
+            core = get_core()
+            if not core.rvc_available:
+                return False
+            rvc_instance = core.rvc_instance
+            logger.info(f"RVC initialized successfully on {core.device}")
         return True
     except Exception as e:
         logger.error(f"RVC initialization failed: {e}")
@@ -360,53 +481,27 @@ async def generate_tts(text: str, voice: str, speed: float = 1.0) -> bytes:
         raise HTTPException(status_code=400, detail=f"Voice '{voice}' not available")
     
     try:
-        # Create communicate object
-        rate = f"{speed:+.0%}" if speed != 1.0 else "+0%"
-        communicate = edge_tts.Communicate(text, voice, rate=rate)
-        
-        # Generate audio
-        audio_data = b""
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_data += chunk["data"]
-        
-        return audio_data
+        # Shared core: TTS cache, voice catalog and Edge-TTS concurrency control apply here too
+        return await get_core().generate_tts(text, voice, speed)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS generation failed: {str(e)}")
 
-def apply_voice_conversion(audio_data: bytes, rvc_params: VoiceConversionRequest) -> bytes:
-    """Apply voice conversion to audio"""
+async def apply_voice_conversion(audio_data: bytes, rvc_params: VoiceConversionRequest) -> bytes:
+    """Apply voice conversion to audio (in memory, on the core's RVC executor)"""
     if not initialize_rvc():
         raise HTTPException(status_code=500, detail="RVC not available")
     
     try:
-        # Save input audio to temp file
-        temp_input = Path(config["temp_dir"]) / f"input_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.wav"
-        temp_output = Path(config["temp_dir"]) / f"output_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.wav"
-        
-        with open(temp_input, "wb") as f:
-            f.write(audio_data)
-        
-        # Convert voice
-        result_path = rvc_instance.convert_voice(
-            input_path=str(temp_input),
-            output_path=str(temp_output),
+        return await get_core().convert_voice_async(
+            audio_data,
             model_name=rvc_params.model_name,
             transpose=rvc_params.transpose,
             index_ratio=rvc_params.index_ratio,
             f0_method=rvc_params.f0_method
         )
         
-        # Read converted audio
-        with open(result_path, "rb") as f:
-            converted_audio = f.read()
-        
-        # Cleanup
-        temp_input.unlink(missing_ok=True)
-        temp_output.unlink(missing_ok=True)
-        
-        return converted_audio
-        
+    except RVCQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Voice conversion failed: {str(e)}")
 
@@ -462,7 +557,9 @@ async def health_check():
             "config": {
                 "max_text_length": config["max_text_length"],
                 "available_voices": len(EDGE_VOICES)
-            }
+            },
+            "rvc_workers": core_instance.rvc_workers.get_status() if core_instance and core_instance.rvc_workers else None,
+            "cache_prewarm": prewarm_instance.get_progress() if prewarm_instance else None
         }
     )
 
@@ -664,97 +761,10 @@ async def root():
 @app.get("/voices")
 async def get_voices():
     """Get available TTS voices with detailed information"""
-    
-    # เสียงพื้นฐาน
-    basic_voices = {
-        "lao": [
-            {
-                "value": "lo-LA-KeomanyNeural",
-                "label": "แก้วมณี (ผู้หญิง)",
-                "name_lao": "ແກ້ວມະນີ",
-                "gender": "female",
-                "language": "lao",
-                "description": "เสียงผู้หญิงลาว นุ่มนวล เป็นธรรมชาติ",
-                "recommended_speed": 0.7,
-                "icon": "👩"
-            },
-            {
-                "value": "lo-LA-ChanthavongNeural", 
-                "label": "จันทวง (ผู้ชาย)",
-                "name_lao": "ຈັນທະວົງ",
-                "gender": "male",
-                "language": "lao", 
-                "description": "เสียงผู้ชายลาว แข็งแกร่ง ชัดเจน",
-                "recommended_speed": 0.7,
-                "icon": "👨"
-            }
-        ],
-        "thai": [
-            {
-                "value": "th-TH-PremwadeeNeural",
-                "label": "เปรมวดี (ผู้หญิง)",
-                "gender": "female",
-                "language": "thai",
-                "description": "เสียงผู้หญิงไทย นุ่มนวล",
-                "recommended_speed": 0.8,
-                "icon": "👩"
-            },
-            {
-                "value": "th-TH-NiwatNeural",
-                "label": "นิวัฒน์ (ผู้ชาย)", 
-                "gender": "male",
-                "language": "thai",
-                "description": "เสียงผู้ชายไทย แข็งแกร่ง",
-                "recommended_speed": 0.8,
-                "icon": "👨"
-            }
-        ],
-        "english": [
-            {
-                "value": "en-US-AriaNeural",
-                "label": "Aria (Female)",
-                "gender": "female",
-                "language": "english",
-                "description": "American Female - Natural and expressive",
-                "recommended_speed": 1.0,
-                "icon": "👩"
-            },
-            {
-                "value": "en-US-GuyNeural",
-                "label": "Guy (Male)",
-                "gender": "male", 
-                "language": "english",
-                "description": "American Male - Clear and confident",
-                "recommended_speed": 1.0,
-                "icon": "👨"
-            },
-            {
-                "value": "en-US-JennyNeural",
-                "label": "Jenny (Female)",
-                "gender": "female",
-                "language": "english", 
-                "description": "American Female - Warm and friendly",
-                "recommended_speed": 1.0,
-                "icon": "👩"
-            }
-        ]
-    }
-    
-    # รวมเสียงทั้งหมด
-    all_voices = []
-    for lang_voices in basic_voices.values():
-        all_voices.extend(lang_voices)
-    
     return APIResponse(
         success=True,
         message="Voices retrieved successfully",
-        data={
-            "voices": EDGE_VOICES,  # เสียงแบบเดิม
-            "voices_detailed": basic_voices,  # เสียงแบบละเอียด
-            "voices_list": all_voices,  # รายการทั้งหมด
-            "total_voices": len(all_voices),
-            "languages": list(basic_voices.keys())
-        }
+        data=VOICES_DATA
     )
 
 @app.get("/models")
@@ -803,6 +813,38 @@ async def text_to_speech(request: TTSRequest, background_tasks: BackgroundTasks)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS error: {str(e)}")
 
+STREAM_MEDIA_TYPES = {
+    "mp3": "audio/mpeg",
+    "pcm": "audio/L16; rate=24000; channels=1"
+}
+
+@app.post("/tts/stream")
+async def text_to_speech_stream(request: TTSStreamRequest):
+    """Streaming text-to-speech: audio is forwarded as soon as Edge-TTS produces it"""
+    if request.format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format '{request.format}'")
+    if request.voice not in EDGE_VOICES:
+        raise HTTPException(status_code=400, detail=f"Voice '{request.voice}' not available")
+    
+    stream = get_core().stream_tts(
+        request.text, request.voice, request.speed, request.pitch, request.format
+    )
+    
+    # Pull the first chunk here so failures still surface as an HTTP error status
+    try:
+        first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail="TTS stream produced no audio")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"TTS stream error: {str(e)}")
+    
+    async def audio_stream():
+        yield first_chunk
+        async for chunk in stream:
+            yield chunk
+    
+    return StreamingResponse(audio_stream(), media_type=STREAM_MEDIA_TYPES[request.format])
+
 @app.post("/voice_conversion")
 async def voice_conversion_only(
     audio: UploadFile = File(...),
@@ -820,7 +862,7 @@ async def voice_conversion_only(
         audio_data = await audio.read()
         
         # Apply voice conversion
-        converted_audio = apply_voice_conversion(audio_data, rvc_params)
+        converted_audio = await apply_voice_conversion(audio_data, rvc_params)
         
         # Encode to base64
         audio_base64 = base64.b64encode(converted_audio).decode('utf-8')
@@ -843,6 +885,8 @@ async def voice_conversion_only(
             processing_time=processing_time
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Voice conversion error: {str(e)}")
 
@@ -857,7 +901,7 @@ async def unified_processing(request: UnifiedRequest, background_tasks: Backgrou
         
         # Apply voice conversion if enabled
         if request.enable_rvc and request.rvc_params:
-            audio_data = apply_voice_conversion(audio_data, request.rvc_params)
+            audio_data = await apply_voice_conversion(audio_data, request.rvc_params)
         
         # Encode to base64
         audio_base64 = base64.b64encode(audio_data).decode('utf-8')
@@ -880,9 +924,54 @@ async def unified_processing(request: UnifiedRequest, background_tasks: Backgrou
             processing_time=processing_time
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unified processing error: {str(e)}")
 
+@app.post("/unified/stream")
+async def unified_processing_stream(request: UnifiedStreamRequest):
+    """Sentence-pipelined TTS + voice conversion, streamed as 16-bit mono PCM"""
+    if request.tts_voice not in EDGE_VOICES:
+        raise HTTPException(status_code=400, detail=f"Voice '{request.tts_voice}' not available")
+    
+    rvc_params = request.rvc_params if request.enable_rvc else None
+    if rvc_params and not initialize_rvc():
+        raise HTTPException(status_code=500, detail="RVC not available")
+    
+    stream = get_core().stream_unified(
+        request.text,
+        request.tts_voice,
+        rvc_model=rvc_params.model_name if rvc_params else None,
+        tts_speed=request.speed,
+        rvc_transpose=rvc_params.transpose if rvc_params else 0,
+        rvc_index_ratio=rvc_params.index_ratio if rvc_params else 0.75,
+        rvc_f0_method=rvc_params.f0_method if rvc_params else "rmvpe",
+        first_chunk_chars=request.first_chunk_chars,
+        crossfade_ms=request.crossfade_ms,
+        sample_rate=request.sample_rate
+    )
+    
+    # Pull the first chunk here so failures still surface as an HTTP error status
+    try:
+        first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail="Unified stream produced no audio")
+    except RVCQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unified stream error: {str(e)}")
+    
+    async def audio_stream():
+        yield first_chunk
+        async for chunk in stream:
+            yield chunk
+    
+    return StreamingResponse(
+        audio_stream(),
+        media_type=f"audio/L16; rate={request.sample_rate}; channels=1"
+    )
+
 @app.post("/full_tts")
 async def full_tts_processing(request: dict, background_tasks: BackgroundTasks):
     """Full TTS processing with HTML-compatible format"""
@@ -898,6 +987,7 @@ async def full_tts_processing(request: dict, background_tasks: BackgroundTasks):
         rvc_transpose = request.get("rvc_transpose", 0)
         rvc_index_ratio = request.get("rvc_index_ratio", 0.7)
         rvc_f0_method = request.get("rvc_f0_method", "rmvpe")
+        document_id = request.get("document_id")
         
         # Validate input
         if not text.strip():
@@ -906,13 +996,15 @@ async def full_tts_processing(request: dict, background_tasks: BackgroundTasks):
         if not tts_voice:
             raise HTTPException(status_code=400, detail="TTS voice is required")
         
-        # Use TTSRVCCore for processing
-        from tts_rvc_core import create_core_instance
+        # Use the shared TTSRVCCore for processing
+        core = get_core()
         
-        core = create_core_instance()
+        # Documents with an id are rendered incrementally: only edited sentences are re-synthesized
+        process = core.process_long_text if document_id else core.process_unified
+        extra = {"document_id": str(document_id)} if document_id else {}
         
         # Process unified TTS + RVC
-        result = await core.process_unified(
+        result = await process(
             text=text,
             tts_voice=tts_voice,
             enable_rvc=enable_rvc,
@@ -920,19 +1012,26 @@ async def full_tts_processing(request: dict, background_tasks: BackgroundTasks):
             tts_speed=tts_speed,
             rvc_transpose=rvc_transpose,
             rvc_index_ratio=rvc_index_ratio,
-            rvc_f0_method=rvc_f0_method
+            rvc_f0_method=rvc_f0_method,
+            **extra
         )
         
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result.get("error", "Processing failed"))
         
         # Encode to base64
-        audio_base64 = base64.b64encode(result["audio_data"]).decode('utf-8')
+        audio_base64 = base64.b64encode(result["final_audio_data"]).decode('utf-8')
         
         processing_time = (datetime.now() - start_time).total_seconds()
         
-        # Schedule cleanup
+        # Schedule cleanup and record the request for cache pre-warming after the next restart
         background_tasks.add_task(cleanup_temp_files)
+        request_log_path = core.performance_config.get("request_log_path")
+        if request_log_path and len(text) <= core.performance_config.get("prewarm_max_text_chars", 3000):
+            background_tasks.add_task(
+                append_request_log, request_log_path, request,
+                core.performance_config.get("request_log_max_mb", 16) * 1024 * 1024
+            )
         
         return APIResponse(
             success=True,
@@ -941,7 +1040,7 @@ async def full_tts_processing(request: dict, background_tasks: BackgroundTasks):
                 "audio_base64": audio_base64,
                 "format": "wav",
                 "text_length": len(text),
-                "audio_size": len(result["audio_data"]),
+                "audio_size": len(result["final_audio_data"]),
                 "voice_conversion_applied": "voice_conversion" in result.get("processing_steps", []),
                 "processing_steps": result.get("processing_steps", []),
                 "stats": result.get("stats", {})
@@ -955,6 +1054,60 @@ async def full_tts_processing(request: dict, background_tasks: BackgroundTasks):
         logger.error(f"Full TTS processing error: {e}")
         raise HTTPException(status_code=500, detail=f"Full TTS processing error: {str(e)}")
 
+@app.post("/template_tts")
+async def template_tts_processing(request: TemplateTTSRequest, background_tasks: BackgroundTasks):
+    """Templated TTS: static fragments come from the PCM cache, only slot values are synthesized"""
+    start_time = datetime.now()
+    
+    try:
+        if not request.template.strip():
+            raise HTTPException(status_code=400, detail="Template is required")
+        
+        core = get_core()
+        rvc_params = request.rvc_params
+        result = await core.synthesize_template(
+            template=request.template,
+            slots=request.slots,
+            tts_voice=request.tts_voice,
+            tts_speed=request.speed,
+            tts_pitch=request.pitch,
+            enable_rvc=request.enable_rvc and rvc_params is not None,
+            rvc_model=rvc_params.model_name if rvc_params else None,
+            rvc_transpose=rvc_params.transpose if rvc_params else 0,
+            rvc_index_ratio=rvc_params.index_ratio if rvc_params else 0.75,
+            rvc_f0_method=rvc_params.f0_method if rvc_params else "rmvpe",
+            crossfade_ms=request.crossfade_ms
+        )
+        
+        if not result["success"]:
+            error = result.get("error") or "Processing failed"
+            status_code = 400 if error.startswith(("Invalid template", "Missing template slots", "Template has nothing")) else 500
+            raise HTTPException(status_code=status_code, detail=error)
+        
+        audio_base64 = base64.b64encode(result["final_audio_data"]).decode('utf-8')
+        processing_time = (datetime.now() - start_time).total_seconds()
+        background_tasks.add_task(cleanup_temp_files)
+        
+        return APIResponse(
+            success=True,
+            message="Template TTS processing completed successfully",
+            data={
+                "audio_base64": audio_base64,
+                "format": "wav",
+                "audio_size": len(result["final_audio_data"]),
+                "voice_conversion_applied": "voice_conversion" in result.get("processing_steps", []),
+                "processing_steps": result.get("processing_steps", []),
+                "stats": result.get("stats", {})
+            },
+            processing_time=processing_time
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Template TTS processing error: {e}")
+        raise HTTPException(status_code=500, detail=f"Template TTS processing error: {str(e)}")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize on startup"""
@@ -966,10 +1119,14 @@ async def startup_event():
     # Cleanup temp files
     cleanup_temp_files()
     
-    # Initialize RVC
+    # Initialize the shared core and RVC
+    core = get_core()
     rvc_ready = initialize_rvc()
     models = get_available_models()
     
+    # Replay popular logged requests in the background to warm the TTS and RVC caches
+    start_cache_prewarm(core)
+    
     # Log GPU status
     if config["gpu"]["enabled"] and GPU_AVAILABLE:
         logger.info(f"🖥️ Using GPU: {torch.cuda.get_device_name(config['gpu']['device_id'])}")
@@ -981,9 +1138,41 @@ async def startup_event():
     logger.info(f"🎭 RVC models: {len(models)}")
     logger.info(f"🔥 Max text length: {config['max_text_length']:,} characters")
 
+def start_cache_prewarm(core):
+    """Start the background cache pre-warm job if it is enabled"""
+    global prewarm_instance
+    perf = core.performance_config
+    if not perf.get("prewarm_enabled", False):
+        return
+    request_log_path = perf.get("request_log_path")
+    log_paths = perf.get("prewarm_log_paths") or (
+        [f"{request_log_path}.1", request_log_path] if request_log_path else []
+    )
+    if not log_paths:
+        logger.warning("Cache pre-warm is enabled but no request log is configured")
+        return
+    prewarm_instance = CachePrewarmer(
+        core,
+        [path for path in log_paths if path],
+        max_entries=perf.get("prewarm_max_entries", 200),
+        min_count=perf.get("prewarm_min_count", 2),
+        rate_per_s=perf.get("prewarm_rate_per_s", 0.5),
+        max_text_chars=perf.get("prewarm_max_text_chars", 3000),
+        start_delay_s=perf.get("prewarm_start_delay_s", 5)
+    )
+    prewarm_instance.start()
+    logger.info(f"🔥 Cache pre-warm scheduled from {len(prewarm_instance.log_paths)} request log(s)")
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    global core_instance, rvc_instance, prewarm_instance
+    if prewarm_instance:
+        prewarm_instance.stop()
+        prewarm_instance = None
+    rvc_instance = None
+    core_instance = None
+    shutdown_shared_core()
     cleanup_temp_files()
     logger.info("👋 VICTOR-TTS UNIFIED API Shutdown")
 
@@ -0,0 +1,143 @@
+"""
+📚 Render Store
+เก็บ manifest ของการเรนเดอร์เอกสารยาว (รายการประโยคและ key ของเสียง) และเสียง PCM ของแต่ละประโยคบนดิสก์
+ใช้สำหรับเรนเดอร์ใหม่เฉพาะประโยคที่แก้ไข เมื่อเอกสารเดิมถูกส่งมาอีกครั้ง
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+from tts_cache import normalize_text
+from rvc.infer.cache_utils import prune_directory
+
+logger = logging.getLogger("RENDER_STORE")
+
+# จำนวนการเขียน PCM ระหว่างการตรวจขนาดโฟลเดอร์
+PRUNE_EVERY = 32
+
+
+class RenderStore:
+    """manifest ต่อเอกสาร + เสียง PCM 16-bit ต่อประโยค (content-addressed ตามข้อความและการตั้งค่า, จำกัดขนาดบนดิสก์)"""
+
+    def __init__(self, root: str = "storage/renders", max_disk_bytes: int = 2048 * 1024 * 1024,
+                 max_manifest_bytes: int = 64 * 1024 * 1024):
+        """
+        เริ่มต้นที่เก็บ
+
+        Args:
+            root: โฟลเดอร์หลัก (manifests/ และ pcm/ อยู่ภายใน)
+            max_disk_bytes: ขนาดสูงสุดของ PCM บนดิสก์ (ไฟล์ที่ใช้ล่าสุดนานที่สุดถูกลบก่อน)
+            max_manifest_bytes: ขนาดสูงสุดของ manifest บนดิสก์
+        """
+        self.root = Path(root)
+        self.manifest_dir = self.root / "manifests"
+        self.pcm_dir = self.root / "pcm"
+        self.max_disk_bytes = max_disk_bytes
+        self.max_manifest_bytes = max_manifest_bytes
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        self.pcm_dir.mkdir(parents=True, exist_ok=True)
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def settings_key(settings: Dict[str, Any]) -> str:
+        """key ของชุดการตั้งค่า (เสียง, ความเร็ว, โมเดล RVC, ...) เสียงของประโยคใช้ซ้ำได้เฉพาะการตั้งค่าเดียวกัน"""
+        payload = json.dumps(settings, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def unit_key(text: str) -> str:
+        """key ของประโยคจากข้อความที่ normalize แล้ว"""
+        return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def diff(old_keys: List[str], new_keys: List[str]) -> Dict[str, int]:
+        """เปรียบเทียบลำดับประโยคเดิมกับลำดับใหม่"""
+        stats = {"unchanged": 0, "changed": 0, "inserted": 0, "deleted": 0}
+        matcher = SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+            if tag == "equal":
+                stats["unchanged"] += new_end - new_start
+            elif tag == "replace":
+                stats["changed"] += new_end - new_start
+                stats["deleted"] += max(0, (old_end - old_start) - (new_end - new_start))
+            elif tag == "insert":
+                stats["inserted"] += new_end - new_start
+            elif tag == "delete":
+                stats["deleted"] += old_end - old_start
+        return stats
+
+    def _manifest_path(self, document_id: str) -> Path:
+        # ชื่อไฟล์อ่านได้ + hash กันชื่อซ้ำหลังแทนอักขระพิเศษ
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", document_id)[:64]
+        digest = hashlib.sha1(document_id.encode("utf-8")).hexdigest()[:8]
+        return self.manifest_dir / f"{safe_name}-{digest}.json"
+
+    def _pcm_path(self, settings_key: str, key: str) -> Path:
+        # ไฟล์ทั้งหมดอยู่ในโฟลเดอร์เดียว เพื่อให้ prune_directory จำกัดขนาดรวมได้
+        return self.pcm_dir / f"{settings_key}_{key}.npy"
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        return path.parent / f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def load_manifest(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """อ่าน manifest ของการเรนเดอร์ครั้งก่อน"""
+        path = self._manifest_path(document_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read render manifest {path}: {e}")
+            return None
+
+    def save_manifest(self, document_id: str, manifest: Dict[str, Any]):
+        """บันทึก manifest แบบ atomic"""
+        path = self._manifest_path(document_id)
+        tmp_path = self._tmp_path(path)
+        manifest = {**manifest, "document_id": document_id, "updated_at": time.time()}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        prune_directory(str(self.manifest_dir), self.max_manifest_bytes, suffix=".json")
+
+    def load_pcm(self, settings_key: str, key: str) -> Optional[np.ndarray]:
+        """อ่านเสียงของประโยค (float32 ช่วง -1..1) หรือ None ถ้ายังไม่เคยเรนเดอร์"""
+        path = self._pcm_path(settings_key, key)
+        try:
+            pcm = np.load(path)
+            # อัปเดตเวลาเพื่อให้การตัดไฟล์เป็นแบบ LRU
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return pcm.astype(np.float32) / 32767.0
+
+    def save_pcm(self, settings_key: str, key: str, audio: np.ndarray):
+        """บันทึกเสียงของประโยคเป็น PCM 16-bit แบบ atomic"""
+        path = self._pcm_path(settings_key, key)
+        tmp_path = self._tmp_path(path)
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, pcm)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write render PCM: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 0
+        if prune:
+            prune_directory(str(self.pcm_dir), self.max_disk_bytes)
@@ -0,0 +1,109 @@
+import threading
+
+
+class _PendingBatch:
+    """
+    Requests collected for one batch key, filled by concurrent callers until the leader runs it.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.results = None
+        self.error = None
+        self.closed = False
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class BatchScheduler:
+    """
+    Groups concurrent requests that share a key into micro-batches.
+
+    The first caller for a key becomes the leader: it waits up to max_wait_ms (or until the
+    batch holds max_batch_size items), then runs the whole batch in its own thread and hands
+    each follower its result. No background thread is involved, so callers keep whatever
+    concurrency limits (executor size, locks) they already have.
+    """
+
+    def __init__(self, max_batch_size=1, max_wait_ms=20):
+        """
+        Initializes the scheduler.
+
+        Args:
+            max_batch_size: Largest number of requests run together (1 disables batching).
+            max_wait_ms: How long the leader waits for more requests before running the batch.
+        """
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0, max_wait_ms) / 1000
+        self.batches_run = 0
+        self.items_run = 0
+        self._open = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_batch_size > 1
+
+    def submit(self, key, item, run_batch):
+        """
+        Adds item to the open batch for key and returns its result.
+
+        Args:
+            key: Hashable key; only items with the same key are batched together.
+            item: The request payload.
+            run_batch: Callable taking a list of items and returning one result per item.
+
+        Raises:
+            Exception: Whatever run_batch raised for the batch this item was part of.
+        """
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = _PendingBatch()
+                self._open[key] = batch
+            position = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.max_batch_size:
+                self._close(key, batch)
+
+        if leader:
+            batch.full.wait(self.max_wait)
+            with self._lock:
+                self._close(key, batch)
+            try:
+                batch.results = run_batch(batch.items)
+            except Exception as error:
+                batch.error = error
+            with self._lock:
+                self.batches_run += 1
+                self.items_run += len(batch.items)
+            batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[position]
+
+    def _close(self, key, batch):
+        """
+        Stops a batch from accepting more items (lock held).
+        """
+        if not batch.closed:
+            batch.closed = True
+            if self._open.get(key) is batch:
+                del self._open[key]
+            batch.full.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000),
+                "batches_run": self.batches_run,
+                "items_run": self.items_run,
+                "avg_batch_size": round(self.items_run / self.batches_run, 2)
+                if self.batches_run
+                else 0,
+            }
@@ -0,0 +1,158 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class ByteLRUCache:
+    """
+    A thread-safe least-recently-used mapping bounded by the total byte size of its values.
+    """
+
+    def __init__(self, max_bytes, on_evict=None):
+        """
+        Initializes the cache.
+
+        Args:
+            max_bytes: Byte budget for all stored values combined.
+            on_evict: Optional callback invoked with (key, value) for every evicted entry.
+        """
+        self.max_bytes = int(max_bytes)
+        self.on_evict = on_evict
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Returns the cached value for key (marking it as recently used), or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes):
+        """
+        Stores a value, evicting least-recently-used entries until it fits.
+
+        Args:
+            key: Hashable cache key.
+            value: The value to store.
+            nbytes: Number of bytes charged against the budget for this value.
+
+        Returns:
+            True if the value was stored, False if it alone exceeds the budget.
+        """
+        nbytes = int(nbytes)
+        if nbytes > self.max_bytes:
+            return False
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, (old_value, old_bytes) = self._entries.popitem(last=False)
+                self._bytes -= old_bytes
+                self.evictions += 1
+                evicted.append((old_key, old_value))
+        if self.on_evict is not None:
+            for old_key, old_value in evicted:
+                self.on_evict(old_key, old_value)
+        return True
+
+    def pop(self, key):
+        """
+        Removes key from the cache and returns its value, or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def resize(self, max_bytes):
+        """
+        Changes the byte budget, evicting entries if the cache is now over it.
+        """
+        evicted = []
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            while self._bytes > self.max_bytes and self._entries:
+                old_key, (old_value, old_bytes) = self._entries.popitem(last=False)
+                self._bytes -= old_bytes
+                self.evictions += 1
+                evicted.append((old_key, old_value))
+        if self.on_evict is not None:
+            for old_key, old_value in evicted:
+                self.on_evict(old_key, old_value)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Returns counters and occupancy as a plain dictionary.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def prune_directory(directory, max_bytes, suffix=".npy"):
+    """
+    Deletes the oldest files (by access/modification time) in a cache directory until its
+    total size is within max_bytes.
+
+    Args:
+        directory: Cache directory to prune.
+        max_bytes: Size budget for files ending with suffix.
+        suffix: Only files with this suffix are considered.
+    """
+    try:
+        entries = []
+        total = 0
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    stat = entry.stat()
+                    entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+    except FileNotFoundError:
+        pass
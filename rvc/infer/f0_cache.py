@@ -0,0 +1,134 @@
+import os
+import hashlib
+import threading
+import numpy as np
+
+from rvc.infer.cache_utils import ByteLRUCache, prune_directory
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024  # 1 GB
+PRUNE_EVERY = 64  # disk writes between directory prunes
+
+
+class F0Cache:
+    """
+    A content-addressed cache of raw F0 contours, stored before transposition.
+
+    The key covers the padded 16 kHz audio, the F0 method, the hop length and the autotune settings,
+    so the same utterance converted with another model or another transpose value reuses the contour.
+    Contours live in a byte-bounded memory tier and, optionally, in an on-disk .npy tier.
+    """
+
+    def __init__(
+        self,
+        max_bytes=DEFAULT_MAX_BYTES,
+        disk_dir=None,
+        max_disk_bytes=DEFAULT_MAX_DISK_BYTES,
+    ):
+        """
+        Initializes the F0 cache.
+
+        Args:
+            max_bytes: Byte budget for the memory tier (0 disables caching).
+            disk_dir: Directory for the on-disk tier, or None to keep contours in memory only.
+            max_disk_bytes: Size budget for the on-disk tier.
+        """
+        self.memory = ByteLRUCache(max_bytes)
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_hits = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.memory.max_bytes > 0 or bool(self.disk_dir)
+
+    @staticmethod
+    def make_key(x, f0_method, hop_length, f0_autotune, f0_autotune_strength):
+        """
+        Builds the cache key for an audio signal and F0 settings.
+
+        Args:
+            x: The padded 16 kHz input audio as a NumPy array.
+            f0_method: Method used for F0 estimation.
+            hop_length: Hop length for F0 estimation methods.
+            f0_autotune: Whether autotune is applied to the contour.
+            f0_autotune_strength: Autotune strength.
+        """
+        digest = hashlib.sha1(np.ascontiguousarray(x).tobytes())
+        digest.update(
+            f"|{x.dtype}|{x.shape}|{f0_method}|{int(hop_length)}"
+            f"|{bool(f0_autotune)}|{float(f0_autotune_strength) if f0_autotune else 0}".encode()
+        )
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Returns a copy of the cached contour for key, or None.
+        """
+        f0 = self.memory.get(key)
+        if f0 is None and self.disk_dir:
+            path = os.path.join(self.disk_dir, f"{key}.npy")
+            try:
+                f0 = np.load(path, allow_pickle=False)
+                self.disk_hits += 1
+                self.memory.put(key, f0, f0.nbytes)
+            except (FileNotFoundError, ValueError, OSError):
+                f0 = None
+        return None if f0 is None else f0.copy()
+
+    def put(self, key, f0):
+        """
+        Stores a raw (untransposed) contour in the memory tier and, if configured, on disk.
+        """
+        f0 = np.array(f0, copy=True)
+        self.memory.put(key, f0, f0.nbytes)
+        if not self.disk_dir:
+            return
+        path = os.path.join(self.disk_dir, f"{key}.npy")
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, f0, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError as error:
+            print(f"An error occurred writing the F0 cache: {error}")
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 0
+        if prune:
+            prune_directory(self.disk_dir, self.max_disk_bytes)
+
+    def stats(self):
+        return {**self.memory.stats(), "disk_hits": self.disk_hits, "disk_dir": self.disk_dir}
+
+
+_f0_cache = F0Cache()
+
+
+def get_f0_cache():
+    """
+    Returns the process-wide F0 cache.
+    """
+    return _f0_cache
+
+
+def configure_f0_cache(max_bytes=None, disk_dir=None, max_disk_bytes=None):
+    """
+    Adjusts the process-wide F0 cache settings.
+
+    Args:
+        max_bytes: Byte budget for the memory tier (0 disables it).
+        disk_dir: Directory for the on-disk tier ("" disables it).
+        max_disk_bytes: Size budget for the on-disk tier.
+    """
+    if max_bytes is not None:
+        _f0_cache.memory.resize(max_bytes)
+    if disk_dir is not None:
+        _f0_cache.disk_dir = disk_dir or None
+    if max_disk_bytes is not None:
+        _f0_cache.max_disk_bytes = max_disk_bytes
+    return _f0_cache
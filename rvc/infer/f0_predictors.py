@@ -0,0 +1,98 @@
+import os
+import sys
+import threading
+import torch
+
+now_dir = os.getcwd()
+sys.path.append(now_dir)
+
+from rvc.lib.predictors.RMVPE import RMVPE0Predictor
+from rvc.lib.predictors.FCPE import FCPEF0Predictor
+
+PREDICTOR_PATHS = {
+    "rmvpe": os.path.join("rvc", "models", "predictors", "rmvpe.pt"),
+    "fcpe": os.path.join("rvc", "models", "predictors", "fcpe.pt"),
+}
+
+
+class F0PredictorRegistry:
+    """
+    A process-wide, lazily populated registry of F0 predictors keyed by method, device and parameters.
+
+    Each predictor is loaded once, on first use, and then shared by every Pipeline instance and by
+    feature extraction. Crepe is not listed here because torchcrepe keeps its own loaded model.
+    """
+
+    def __init__(self):
+        self._predictors = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, method, device, **params):
+        """
+        Returns the predictor for a method/device pair, loading it on first use.
+
+        Args:
+            method: F0 method name ("rmvpe" or "fcpe").
+            device: Torch device string the predictor runs on.
+            **params: Constructor parameters that distinguish predictor instances (e.g. f0_min for FCPE).
+        """
+        key = (method, str(device), tuple(sorted(params.items())))
+        predictor = self._predictors.get(key)
+        if predictor is not None:
+            return predictor
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            predictor = self._predictors.get(key)
+            if predictor is None:
+                predictor = self._create(method, device, **params)
+                self._predictors[key] = predictor
+        return predictor
+
+    @staticmethod
+    def _create(method, device, **params):
+        if method == "rmvpe":
+            return RMVPE0Predictor(PREDICTOR_PATHS["rmvpe"], device=device)
+        if method == "fcpe":
+            return FCPEF0Predictor(
+                PREDICTOR_PATHS["fcpe"],
+                f0_min=params.get("f0_min", 50),
+                f0_max=params.get("f0_max", 1100),
+                dtype=torch.float32,
+                device=device,
+                sample_rate=params.get("sample_rate", 16000),
+                threshold=params.get("threshold", 0.03),
+            )
+        raise ValueError(f"Unsupported F0 predictor: {method}")
+
+    def loaded(self):
+        """
+        Returns the (method, device) pairs that are currently loaded.
+        """
+        return [(key[0], key[1]) for key in list(self._predictors)]
+
+    def clear(self):
+        with self._lock:
+            self._predictors.clear()
+            self._key_locks.clear()
+
+
+_registry = F0PredictorRegistry()
+
+
+def get_f0_predictor(method, device, **params):
+    """
+    Returns a shared F0 predictor from the process-wide registry.
+
+    Args:
+        method: F0 method name ("rmvpe" or "fcpe").
+        device: Torch device string the predictor runs on.
+        **params: Constructor parameters that distinguish predictor instances.
+    """
+    return _registry.get(method, device, **params)
+
+
+def get_f0_predictor_registry():
+    return _registry
@@ -0,0 +1,129 @@
+import os
+import hashlib
+import threading
+import numpy as np
+
+from rvc.infer.cache_utils import ByteLRUCache, prune_directory
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+DEFAULT_MAX_DISK_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+PRUNE_EVERY = 64  # disk writes between directory prunes
+
+
+class FeatureCache:
+    """
+    A cache of embedder outputs (HuBERT/ContentVec last_hidden_state) keyed by chunk content and embedder.
+
+    The features depend only on the input chunk and the embedder, not on the target RVC model, so
+    converting one utterance to several voices (or retrying it) skips the transformer pass. Features
+    are kept as float32 arrays in a byte-bounded memory tier and, optionally, in a memory-mapped
+    on-disk .npy tier.
+    """
+
+    def __init__(
+        self,
+        max_bytes=DEFAULT_MAX_BYTES,
+        disk_dir=None,
+        max_disk_bytes=DEFAULT_MAX_DISK_BYTES,
+    ):
+        """
+        Initializes the feature cache.
+
+        Args:
+            max_bytes: Byte budget for the memory tier (0 disables it).
+            disk_dir: Directory for the memory-mapped disk tier, or None for memory only.
+            max_disk_bytes: Size budget for the disk tier.
+        """
+        self.memory = ByteLRUCache(max_bytes)
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_hits = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.memory.max_bytes > 0 or bool(self.disk_dir)
+
+    @staticmethod
+    def make_key(audio, embedder_key):
+        """
+        Builds the cache key for an audio chunk and embedder.
+
+        Args:
+            audio: The padded 16 kHz audio chunk fed to the embedder.
+            embedder_key: Identifier of the embedder model (name and custom path).
+        """
+        digest = hashlib.sha1(np.ascontiguousarray(audio).tobytes())
+        digest.update(f"|{audio.dtype}|{audio.shape}|{embedder_key}".encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached features for key as a NumPy array (possibly memory-mapped), or None.
+        """
+        feats = self.memory.get(key)
+        if feats is None and self.disk_dir:
+            path = os.path.join(self.disk_dir, f"{key}.npy")
+            try:
+                feats = np.load(path, mmap_mode="r")
+                self.disk_hits += 1
+                self.memory.put(key, feats, feats.nbytes)
+            except (FileNotFoundError, ValueError, OSError):
+                feats = None
+        return feats
+
+    def put(self, key, feats):
+        """
+        Stores float32 features in the memory tier and, if configured, on disk.
+        """
+        feats = np.ascontiguousarray(feats, dtype=np.float32)
+        self.memory.put(key, feats, feats.nbytes)
+        if not self.disk_dir:
+            return
+        path = os.path.join(self.disk_dir, f"{key}.npy")
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, feats, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError as error:
+            print(f"An error occurred writing the feature cache: {error}")
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 0
+        if prune:
+            prune_directory(self.disk_dir, self.max_disk_bytes)
+
+    def stats(self):
+        return {**self.memory.stats(), "disk_hits": self.disk_hits, "disk_dir": self.disk_dir}
+
+
+_feature_cache = FeatureCache()
+
+
+def get_feature_cache():
+    """
+    Returns the process-wide feature cache.
+    """
+    return _feature_cache
+
+
+def configure_feature_cache(max_bytes=None, disk_dir=None, max_disk_bytes=None):
+    """
+    Adjusts the process-wide feature cache settings.
+
+    Args:
+        max_bytes: Byte budget for the memory tier (0 disables it).
+        disk_dir: Directory for the memory-mapped disk tier ("" disables it).
+        max_disk_bytes: Size budget for the disk tier.
+    """
+    if max_bytes is not None:
+        _feature_cache.memory.resize(max_bytes)
+    if disk_dir is not None:
+        _feature_cache.disk_dir = disk_dir or None
+    if max_disk_bytes is not None:
+        _feature_cache.max_disk_bytes = max_disk_bytes
+    return _feature_cache
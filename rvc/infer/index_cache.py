@@ -0,0 +1,174 @@
+import os
+import hashlib
+import threading
+import faiss
+import numpy as np
+
+from rvc.infer.cache_utils import ByteLRUCache
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+DEFAULT_NPY_CACHE_DIR = os.path.join("storage", "cache", "faiss")
+
+
+class IndexCache:
+    """
+    Keeps FAISS indices and their reconstructed vectors (big_npy) resident across conversions.
+
+    Entries are keyed by index path, modification time and size, so a retrained index is picked up
+    automatically. With memory mapping enabled the index is opened with IO_FLAG_MMAP and big_npy is
+    persisted once as a .npy sidecar and loaded with mmap_mode="r", which keeps large indices
+    page-cache backed and shared between worker processes.
+    """
+
+    def __init__(
+        self,
+        max_bytes=DEFAULT_MAX_BYTES,
+        use_mmap=True,
+        npy_cache_dir=DEFAULT_NPY_CACHE_DIR,
+    ):
+        """
+        Initializes the index cache.
+
+        Args:
+            max_bytes: Byte budget for all resident indices and vector matrices.
+            use_mmap: Whether to memory-map indices and vector matrices.
+            npy_cache_dir: Directory for the memory-mapped big_npy sidecar files.
+        """
+        self.use_mmap = use_mmap
+        self.npy_cache_dir = npy_cache_dir
+        self._cache = ByteLRUCache(max_bytes)
+        self._load_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(file_index):
+        stat = os.stat(file_index)
+        return (os.path.abspath(file_index), stat.st_mtime_ns, stat.st_size)
+
+    def get(self, file_index):
+        """
+        Returns the (index, big_npy) pair for a FAISS index file, loading it on first use.
+
+        Args:
+            file_index: Path to the FAISS index file.
+        """
+        key = self._cache_key(file_index)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._load_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+            # Drop stale entries for the same file (index was rebuilt)
+            for old_key in self._cache.keys():
+                if old_key[0] == key[0]:
+                    self._cache.pop(old_key)
+
+            index, big_npy, nbytes = self._load(file_index, key)
+            self._cache.put(key, (index, big_npy), nbytes)
+            return index, big_npy
+
+    def _load(self, file_index, key):
+        index = None
+        mmapped = False
+        if self.use_mmap:
+            try:
+                index = faiss.read_index(
+                    file_index, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+                mmapped = True
+            except Exception as error:
+                print(f"Memory-mapped FAISS load failed, reading into memory: {error}")
+        if index is None:
+            index = faiss.read_index(file_index)
+
+        big_npy = None
+        if self.use_mmap and self.npy_cache_dir:
+            big_npy = self._load_npy_sidecar(index, key)
+        if big_npy is None:
+            big_npy = index.reconstruct_n(0, index.ntotal)
+
+        nbytes = big_npy.nbytes + (0 if mmapped else key[2])
+        return index, big_npy, nbytes
+
+    def _load_npy_sidecar(self, index, key):
+        path, mtime_ns, _ = key
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+        npy_path = os.path.join(self.npy_cache_dir, f"{digest}_{mtime_ns}.npy")
+        try:
+            if not os.path.exists(npy_path):
+                os.makedirs(self.npy_cache_dir, exist_ok=True)
+                tmp_path = f"{npy_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    np.save(f, index.reconstruct_n(0, index.ntotal), allow_pickle=False)
+                os.replace(tmp_path, npy_path)
+                self._remove_stale_sidecars(digest, npy_path)
+            return np.load(npy_path, mmap_mode="r")
+        except Exception as error:
+            print(f"An error occurred caching FAISS vectors at {npy_path}: {error}")
+            return None
+
+    def _remove_stale_sidecars(self, digest, current_path):
+        """
+        Deletes sidecars written for older versions of the same index file.
+        """
+        try:
+            with os.scandir(self.npy_cache_dir) as it:
+                stale = [
+                    entry.path
+                    for entry in it
+                    if entry.name.startswith(f"{digest}_")
+                    and entry.name.endswith(".npy")
+                    and entry.path != current_path
+                ]
+        except FileNotFoundError:
+            return
+        for path in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                # Still mapped by another process on platforms that forbid deleting open files
+                pass
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+
+_index_cache = None
+_index_cache_lock = threading.Lock()
+
+
+def get_index_cache():
+    """
+    Returns the process-wide IndexCache, creating it with default settings on first use.
+    """
+    global _index_cache
+    if _index_cache is None:
+        with _index_cache_lock:
+            if _index_cache is None:
+                _index_cache = IndexCache()
+    return _index_cache
+
+
+def configure_index_cache(max_bytes=None, use_mmap=None, npy_cache_dir=None):
+    """
+    Adjusts the process-wide IndexCache settings.
+
+    Args:
+        max_bytes: New byte budget (entries are evicted if the cache is over it).
+        use_mmap: Whether newly loaded indices are memory-mapped.
+        npy_cache_dir: Directory for the memory-mapped big_npy sidecar files.
+    """
+    cache = get_index_cache()
+    if use_mmap is not None:
+        cache.use_mmap = use_mmap
+    if npy_cache_dir is not None:
+        cache.npy_cache_dir = npy_cache_dir
+    if max_bytes is not None:
+        cache._cache.resize(max_bytes)
+    return cache
@@ -6,6 +6,7 @@ import torch
 import librosa
 import logging
 import traceback
+import threading
 import numpy as np
 import soundfile as sf
 import noisereduce as nr
@@ -38,6 +39,29 @@ logging.getLogger("faiss").setLevel(logging.WARNING)
 logging.getLogger("faiss.loader").setLevel(logging.WARNING)
 
 
+class LoadedModel:
+    """
+    A ready-to-run synthesizer together with the metadata needed to drive it.
+    """
+
+    def __init__(self, weight_root, net_g, vc, tgt_sr, version, use_f0, n_spk):
+        self.weight_root = weight_root
+        self.net_g = net_g
+        self.vc = vc
+        self.tgt_sr = tgt_sr
+        self.version = version
+        self.use_f0 = use_f0
+        self.n_spk = n_spk
+
+    @property
+    def nbytes(self):
+        """
+        Approximate memory held by the synthesizer parameters and buffers.
+        """
+        tensors = list(self.net_g.parameters()) + list(self.net_g.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+
 class VoiceConverter:
     """
     A class for performing voice conversion using the Retrieval-Based Voice Conversion (RVC) method.
@@ -52,6 +76,7 @@ class VoiceConverter:
             None  # Initialize the Hubert model (for embedding extraction)
         )
         self.last_embedder_model = None  # Last used embedder model
+        self.hubert_lock = threading.Lock()  # Guards embedder (re)loading across threads
         self.tgt_sr = None  # Target sampling rate for the output audio
         self.net_g = None  # Generator network for voice conversion
         self.vc = None  # Voice conversion pipeline instance
@@ -60,6 +85,7 @@ class VoiceConverter:
         self.n_spk = None  # Number of speakers in the model
         self.use_f0 = None  # Whether the model uses F0
         self.loaded_model = None
+        self.model = None  # Active LoadedModel used when none is passed explicitly
 
     def load_hubert(self, embedder_model: str, embedder_model_custom: str = None):
         """
@@ -246,8 +272,6 @@ class VoiceConverter:
             print("No model path provided. Aborting conversion.")
             return
 
-        self.get_vc(model_path, sid)
-
         try:
             start_time = time.time()
             print(f"Converting audio '{audio_input_path}'...")
@@ -257,80 +281,31 @@ class VoiceConverter:
                 16000,
                 **kwargs,
             )
-            audio_max = np.abs(audio).max() / 0.95
-
-            if audio_max > 1:
-                audio /= audio_max
-
-            if not self.hubert_model or embedder_model != self.last_embedder_model:
-                self.load_hubert(embedder_model, embedder_model_custom)
-                self.last_embedder_model = embedder_model
-
-            file_index = (
-                index_path.strip()
-                .strip('"')
-                .strip("\n")
-                .strip('"')
-                .strip()
-                .replace("trained", "added")
+            audio_opt, tgt_sr = self._convert_16k(
+                audio,
+                model_path=model_path,
+                index_path=index_path,
+                pitch=pitch,
+                f0_file=f0_file,
+                f0_method=f0_method,
+                index_rate=index_rate,
+                volume_envelope=volume_envelope,
+                protect=protect,
+                hop_length=hop_length,
+                split_audio=split_audio,
+                f0_autotune=f0_autotune,
+                f0_autotune_strength=f0_autotune_strength,
+                embedder_model=embedder_model,
+                embedder_model_custom=embedder_model_custom,
+                clean_audio=clean_audio,
+                clean_strength=clean_strength,
+                post_process=post_process,
+                resample_sr=resample_sr,
+                sid=sid,
+                **kwargs,
             )
 
-            if self.tgt_sr != resample_sr >= 16000:
-                self.tgt_sr = resample_sr
-
-            if split_audio:
-                chunks, intervals = process_audio(audio, 16000)
-                print(f"Audio split into {len(chunks)} chunks for processing.")
-            else:
-                chunks = []
-                chunks.append(audio)
-
-            converted_chunks = []
-            for c in chunks:
-                audio_opt = self.vc.pipeline(
-                    model=self.hubert_model,
-                    net_g=self.net_g,
-                    sid=sid,
-                    audio=c,
-                    pitch=pitch,
-                    f0_method=f0_method,
-                    file_index=file_index,
-                    index_rate=index_rate,
-                    pitch_guidance=self.use_f0,
-                    volume_envelope=volume_envelope,
-                    version=self.version,
-                    protect=protect,
-                    hop_length=hop_length,
-                    f0_autotune=f0_autotune,
-                    f0_autotune_strength=f0_autotune_strength,
-                    f0_file=f0_file,
-                )
-                converted_chunks.append(audio_opt)
-                if split_audio:
-                    print(f"Converted audio chunk {len(converted_chunks)}")
-
-            if split_audio:
-                audio_opt = merge_audio(
-                    chunks, converted_chunks, intervals, 16000, self.tgt_sr
-                )
-            else:
-                audio_opt = converted_chunks[0]
-
-            if clean_audio:
-                cleaned_audio = self.remove_audio_noise(
-                    audio_opt, self.tgt_sr, clean_strength
-                )
-                if cleaned_audio is not None:
-                    audio_opt = cleaned_audio
-
-            if post_process:
-                audio_opt = self.post_process_audio(
-                    audio_input=audio_opt,
-                    sample_rate=self.tgt_sr,
-                    **kwargs,
-                )
-
-            sf.write(audio_output_path, audio_opt, self.tgt_sr, format="WAV")
+            sf.write(audio_output_path, audio_opt, tgt_sr, format="WAV")
             output_path_format = audio_output_path.replace(
                 ".wav", f".{export_format.lower()}"
             )
@@ -346,6 +321,293 @@ class VoiceConverter:
             print(f"An error occurred during audio conversion: {error}")
             print(traceback.format_exc())
 
+    def convert_array(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        model_path: str,
+        index_path: str,
+        **kwargs,
+    ):
+        """
+        Performs voice conversion on an in-memory audio signal, without touching the disk.
+
+        Args:
+            audio (numpy.ndarray): Input audio, mono or (samples, channels).
+            sample_rate (int): Sample rate of the input audio.
+            model_path (str): Path to the voice conversion model.
+            index_path (str): Path to the index file.
+            **kwargs: Conversion parameters, as accepted by convert_audio.
+
+        Returns:
+            tuple: The converted audio as a float32 NumPy array and its sample rate.
+        """
+        if not model_path:
+            raise ValueError("No model path provided.")
+
+        audio = np.asarray(audio, dtype=np.float32)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        if sample_rate != 16000:
+            audio = soxr.resample(audio, sample_rate, 16000)
+
+        return self._convert_16k(
+            audio, model_path=model_path, index_path=index_path, **kwargs
+        )
+
+    def _convert_16k(
+        self,
+        audio: np.ndarray,
+        model_path: str,
+        index_path: str,
+        pitch: int = 0,
+        f0_file: str = None,
+        f0_method: str = "rmvpe",
+        index_rate: float = 0.75,
+        volume_envelope: float = 1,
+        protect: float = 0.5,
+        hop_length: int = 128,
+        split_audio: bool = False,
+        f0_autotune: bool = False,
+        f0_autotune_strength: float = 1,
+        embedder_model: str = "contentvec",
+        embedder_model_custom: str = None,
+        clean_audio: bool = False,
+        clean_strength: float = 0.5,
+        post_process: bool = False,
+        resample_sr: int = 0,
+        sid: int = 0,
+        loaded_model: LoadedModel = None,
+        batch_chunks: bool = False,
+        chunk_batch_size: int = 4,
+        **kwargs,
+    ):
+        """
+        Runs the conversion pipeline on 16 kHz mono audio and returns (audio, tgt_sr).
+
+        If loaded_model is given it is used as-is (e.g. from a model cache) and the
+        converter's active model is left untouched. With batch_chunks, the segments of
+        long inputs are converted in padded batches of up to chunk_batch_size.
+        """
+        if loaded_model is None:
+            self.get_vc(model_path, sid)
+            loaded_model = self.model
+        if loaded_model is None:
+            raise ValueError(f"Could not load model: {model_path}")
+
+        audio_max = np.abs(audio).max() / 0.95
+
+        if audio_max > 1:
+            audio = audio / audio_max
+
+        hubert_model = self.get_hubert(embedder_model, embedder_model_custom)
+        file_index = self.clean_index_path(index_path)
+
+        tgt_sr = loaded_model.tgt_sr
+        if tgt_sr != resample_sr >= 16000:
+            tgt_sr = resample_sr
+
+        if split_audio:
+            chunks, intervals = process_audio(audio, 16000)
+            print(f"Audio split into {len(chunks)} chunks for processing.")
+        else:
+            chunks = []
+            chunks.append(audio)
+
+        converted_chunks = []
+        for c in chunks:
+            audio_opt = loaded_model.vc.pipeline(
+                model=hubert_model,
+                net_g=loaded_model.net_g,
+                sid=sid,
+                audio=c,
+                pitch=pitch,
+                f0_method=f0_method,
+                file_index=file_index,
+                index_rate=index_rate,
+                pitch_guidance=loaded_model.use_f0,
+                volume_envelope=volume_envelope,
+                version=loaded_model.version,
+                protect=protect,
+                hop_length=hop_length,
+                f0_autotune=f0_autotune,
+                f0_autotune_strength=f0_autotune_strength,
+                f0_file=f0_file,
+                embedder_key=f"{embedder_model}:{embedder_model_custom or ''}",
+                batch_chunks=batch_chunks,
+                chunk_batch_size=chunk_batch_size,
+            )
+            converted_chunks.append(audio_opt)
+            if split_audio:
+                print(f"Converted audio chunk {len(converted_chunks)}")
+
+        if split_audio:
+            audio_opt = merge_audio(
+                chunks, converted_chunks, intervals, 16000, tgt_sr
+            )
+        else:
+            audio_opt = converted_chunks[0]
+
+        audio_opt = self.finish_audio(
+            audio_opt, tgt_sr, clean_audio, clean_strength, post_process, **kwargs
+        )
+
+        return audio_opt, tgt_sr
+
+    def convert_array_batch(
+        self,
+        audios: list,
+        sample_rates: list,
+        model_path: str,
+        index_path: str,
+        pitch: int = 0,
+        f0_method: str = "rmvpe",
+        index_rate: float = 0.75,
+        volume_envelope: float = 1,
+        protect: float = 0.5,
+        hop_length: int = 128,
+        f0_autotune: bool = False,
+        f0_autotune_strength: float = 1,
+        embedder_model: str = "contentvec",
+        embedder_model_custom: str = None,
+        clean_audio: bool = False,
+        clean_strength: float = 0.5,
+        post_process: bool = False,
+        resample_sr: int = 0,
+        sid: int = 0,
+        loaded_model: LoadedModel = None,
+        **kwargs,
+    ):
+        """
+        Performs voice conversion on several short in-memory signals with the same settings at once.
+
+        The embedder and the synthesizer run once for the whole batch (see Pipeline.pipeline_batch).
+
+        Args:
+            audios (list): Input signals, mono or (samples, channels).
+            sample_rates (list): Sample rate of each input signal.
+            model_path (str): Path to the voice conversion model.
+            index_path (str): Path to the index file.
+            **kwargs: Other conversion parameters, as accepted by convert_array.
+
+        Returns:
+            list: One (audio, tgt_sr) tuple per input.
+        """
+        if loaded_model is None:
+            self.get_vc(model_path, sid)
+            loaded_model = self.model
+        if loaded_model is None:
+            raise ValueError(f"Could not load model: {model_path}")
+
+        inputs = []
+        for audio, sample_rate in zip(audios, sample_rates):
+            audio = np.asarray(audio, dtype=np.float32)
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1)
+            if sample_rate != 16000:
+                audio = soxr.resample(audio, sample_rate, 16000)
+            audio_max = np.abs(audio).max() / 0.95
+            if audio_max > 1:
+                audio = audio / audio_max
+            inputs.append(audio)
+
+        hubert_model = self.get_hubert(embedder_model, embedder_model_custom)
+
+        tgt_sr = loaded_model.tgt_sr
+        if tgt_sr != resample_sr >= 16000:
+            tgt_sr = resample_sr
+
+        converted = loaded_model.vc.pipeline_batch(
+            model=hubert_model,
+            net_g=loaded_model.net_g,
+            sid=sid,
+            audios=inputs,
+            pitch=pitch,
+            f0_method=f0_method,
+            file_index=self.clean_index_path(index_path),
+            index_rate=index_rate,
+            pitch_guidance=loaded_model.use_f0,
+            volume_envelope=volume_envelope,
+            version=loaded_model.version,
+            protect=protect,
+            hop_length=hop_length,
+            f0_autotune=f0_autotune,
+            f0_autotune_strength=f0_autotune_strength,
+            embedder_key=f"{embedder_model}:{embedder_model_custom or ''}",
+        )
+
+        return [
+            (
+                self.finish_audio(
+                    audio_opt, tgt_sr, clean_audio, clean_strength, post_process, **kwargs
+                ),
+                tgt_sr,
+            )
+            for audio_opt in converted
+        ]
+
+    def get_hubert(self, embedder_model: str, embedder_model_custom: str = None):
+        """
+        Returns the embedder model, (re)loading it if a different one is requested.
+
+        Args:
+            embedder_model (str): Path to the pre-trained HuBERT model.
+            embedder_model_custom (str): Path to the custom HuBERT model.
+        """
+        with self.hubert_lock:
+            if not self.hubert_model or embedder_model != self.last_embedder_model:
+                self.load_hubert(embedder_model, embedder_model_custom)
+                self.last_embedder_model = embedder_model
+            return self.hubert_model
+
+    @staticmethod
+    def clean_index_path(index_path: str):
+        """
+        Normalizes a user-supplied index path (quotes, whitespace, trained -> added index).
+
+        Args:
+            index_path (str): Path to the index file, or None.
+        """
+        return (
+            (index_path or "")
+            .strip()
+            .strip('"')
+            .strip("\n")
+            .strip('"')
+            .strip()
+            .replace("trained", "added")
+        )
+
+    def finish_audio(
+        self, audio_opt, tgt_sr, clean_audio, clean_strength, post_process, **kwargs
+    ):
+        """
+        Applies the optional noise reduction and post-processing effects to converted audio.
+
+        Args:
+            audio_opt (numpy.ndarray): The converted audio.
+            tgt_sr (int): Sample rate of the converted audio.
+            clean_audio (bool): Whether to clean the audio.
+            clean_strength (float): Strength of the audio cleaning.
+            post_process (bool): Whether to apply post-processing effects.
+            **kwargs: Post-processing effect settings.
+        """
+        if clean_audio:
+            cleaned_audio = self.remove_audio_noise(
+                audio_opt, tgt_sr, clean_strength
+            )
+            if cleaned_audio is not None:
+                audio_opt = cleaned_audio
+
+        if post_process:
+            audio_opt = self.post_process_audio(
+                audio_input=audio_opt,
+                sample_rate=tgt_sr,
+                **kwargs,
+            )
+
+        return audio_opt
+
     def convert_audio_batch(
         self,
         audio_input_paths: str,
@@ -426,67 +688,72 @@ class VoiceConverter:
                 torch.cuda.empty_cache()
 
         if not self.loaded_model or self.loaded_model != weight_root:
-            self.load_model(weight_root)
-            if self.cpt is not None:
-                self.setup_network()
-                self.setup_vc_instance()
+            model = self.build_model(weight_root)
+            if model is not None:
+                self.activate_model(model)
             self.loaded_model = weight_root
 
     def cleanup_model(self):
         """
         Cleans up the model and releases resources.
         """
-        if self.hubert_model is not None:
-            del self.net_g, self.n_spk, self.vc, self.hubert_model, self.tgt_sr
-            self.hubert_model = self.net_g = self.n_spk = self.vc = self.tgt_sr = None
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-
-        del self.net_g, self.cpt
+        self.hubert_model = self.net_g = self.n_spk = self.vc = self.tgt_sr = None
+        self.cpt = self.model = self.loaded_model = None
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
-        self.cpt = None
 
-    def load_model(self, weight_root):
+    def build_model(self, weight_root):
         """
-        Loads the model weights from the specified path.
+        Loads model weights and builds a ready-to-run synthesizer and pipeline, without
+        changing the converter's active model.
 
         Args:
             weight_root (str): Path to the model weights.
+
+        Returns:
+            LoadedModel or None if the weights file does not exist.
         """
-        self.cpt = (
-            torch.load(weight_root, map_location="cpu", weights_only=True)
-            if os.path.isfile(weight_root)
-            else None
+        if not os.path.isfile(weight_root):
+            return None
+        cpt = torch.load(weight_root, map_location="cpu", weights_only=True)
+
+        tgt_sr = cpt["config"][-1]
+        cpt["config"][-3] = cpt["weight"]["emb_g.weight"].shape[0]
+        use_f0 = cpt.get("f0", 1)
+        version = cpt.get("version", "v1")
+        net_g = Synthesizer(
+            *cpt["config"],
+            use_f0=use_f0,
+            text_enc_hidden_dim=768 if version == "v2" else 256,
+            vocoder=cpt.get("vocoder", "HiFi-GAN"),
+        )
+        del net_g.enc_q
+        net_g.load_state_dict(cpt["weight"], strict=False)
+        net_g = net_g.to(self.config.device).float()
+        net_g.eval()
+
+        return LoadedModel(
+            weight_root=weight_root,
+            net_g=net_g,
+            vc=VC(tgt_sr, self.config),
+            tgt_sr=tgt_sr,
+            version=version,
+            use_f0=use_f0,
+            n_spk=cpt["config"][-3],
         )
 
-    def setup_network(self):
-        """
-        Sets up the network configuration based on the loaded checkpoint.
+    def activate_model(self, model):
         """
-        if self.cpt is not None:
-            self.tgt_sr = self.cpt["config"][-1]
-            self.cpt["config"][-3] = self.cpt["weight"]["emb_g.weight"].shape[0]
-            self.use_f0 = self.cpt.get("f0", 1)
+        Makes a LoadedModel the converter's active model.
 
-            self.version = self.cpt.get("version", "v1")
-            self.text_enc_hidden_dim = 768 if self.version == "v2" else 256
-            self.vocoder = self.cpt.get("vocoder", "HiFi-GAN")
-            self.net_g = Synthesizer(
-                *self.cpt["config"],
-                use_f0=self.use_f0,
-                text_enc_hidden_dim=self.text_enc_hidden_dim,
-                vocoder=self.vocoder,
-            )
-            del self.net_g.enc_q
-            self.net_g.load_state_dict(self.cpt["weight"], strict=False)
-            self.net_g = self.net_g.to(self.config.device).float()
-            self.net_g.eval()
-
-    def setup_vc_instance(self):
-        """
-        Sets up the voice conversion pipeline instance based on the target sampling rate and configuration.
+        Args:
+            model (LoadedModel): The model to activate.
         """
-        if self.cpt is not None:
-            self.vc = VC(self.tgt_sr, self.config)
-            self.n_spk = self.cpt["config"][-3]
+        self.model = model
+        self.net_g = model.net_g
+        self.vc = model.vc
+        self.tgt_sr = model.tgt_sr
+        self.version = model.version
+        self.use_f0 = model.use_f0
+        self.n_spk = model.n_spk
+        self.loaded_model = model.weight_root
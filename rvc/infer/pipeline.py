@@ -1,11 +1,9 @@
 import os
-import gc
 import re
 import sys
 import torch
 import torch.nn.functional as F
 import torchcrepe
-import faiss
 import librosa
 import numpy as np
 from scipy import signal
@@ -14,8 +12,10 @@ from torch import Tensor
 now_dir = os.getcwd()
 sys.path.append(now_dir)
 
-from rvc.lib.predictors.RMVPE import RMVPE0Predictor
-from rvc.lib.predictors.FCPE import FCPEF0Predictor
+from rvc.infer.index_cache import get_index_cache
+from rvc.infer.f0_predictors import get_f0_predictor
+from rvc.infer.f0_cache import get_f0_cache
+from rvc.infer.feature_cache import get_feature_cache
 
 import logging
 
@@ -30,6 +30,31 @@ bh, ah = signal.butter(
 
 input_audio_path2wav = {}
 
+MAX_BATCH_PAD_RATIO = 0.1  # Max share of padding when batching segments of different lengths
+
+
+def _length_groups(lengths, max_pad_ratio=MAX_BATCH_PAD_RATIO, max_group_size=None):
+    """
+    Groups item indices so that padding each group to its longest item wastes at most max_pad_ratio.
+
+    Args:
+        lengths: Length of each item.
+        max_pad_ratio: Maximum fraction of the longest item that may be padding.
+        max_group_size: Maximum number of items per group (None for no limit).
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    groups = []
+    for i in order:
+        if (
+            groups
+            and lengths[i] >= lengths[groups[-1][0]] * (1 - max_pad_ratio)
+            and (not max_group_size or len(groups[-1]) < max_group_size)
+        ):
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    return groups
+
 
 class AudioProcessor:
     """
@@ -205,9 +230,18 @@ class Pipeline:
         ]
         self.autotune = Autotune(self.ref_freqs)
         self.note_dict = self.autotune.note_dict
-        self.model_rmvpe = RMVPE0Predictor(
-            os.path.join("rvc", "models", "predictors", "rmvpe.pt"),
-            device=self.device,
+
+    def _get_fcpe(self, f0_min, f0_max):
+        """
+        Returns the shared FCPE predictor for this device and F0 range.
+        """
+        return get_f0_predictor(
+            "fcpe",
+            self.device,
+            f0_min=f0_min,
+            f0_max=f0_max,
+            sample_rate=self.sample_rate,
+            threshold=0.03,
         )
 
     def get_f0_crepe(
@@ -293,21 +327,14 @@ class Pipeline:
                     x, f0_min, f0_max, p_len, int(hop_length)
                 )
             elif method == "rmvpe":
-                f0 = self.model_rmvpe.infer_from_audio(x, thred=0.03)
+                f0 = get_f0_predictor("rmvpe", self.device).infer_from_audio(
+                    x, thred=0.03
+                )
                 f0 = f0[1:]
             elif method == "fcpe":
-                self.model_fcpe = FCPEF0Predictor(
-                    os.path.join("rvc", "models", "predictors", "fcpe.pt"),
-                    f0_min=int(f0_min),
-                    f0_max=int(f0_max),
-                    dtype=torch.float32,
-                    device=self.device,
-                    sample_rate=self.sample_rate,
-                    threshold=0.03,
+                f0 = self._get_fcpe(int(f0_min), int(f0_max)).compute_f0(
+                    x, p_len=p_len
                 )
-                f0 = self.model_fcpe.compute_f0(x, p_len=p_len)
-                del self.model_fcpe
-                gc.collect()
             f0_computation_stack.append(f0)
 
         f0_computation_stack = [fc for fc in f0_computation_stack if fc is not None]
@@ -318,30 +345,27 @@ class Pipeline:
             f0_median_hybrid = np.nanmedian(f0_computation_stack, axis=0)
         return f0_median_hybrid
 
-    def get_f0(
+    def _compute_f0(
         self,
         input_audio_path,
         x,
         p_len,
-        pitch,
         f0_method,
         hop_length,
         f0_autotune,
         f0_autotune_strength,
-        inp_f0=None,
     ):
         """
-        Estimates the fundamental frequency (F0) of a given audio signal using various methods.
+        Estimates the raw (untransposed) F0 contour, applying autotune if requested.
 
         Args:
             input_audio_path: Path to the input audio file.
             x: The input audio signal as a NumPy array.
             p_len: Desired length of the F0 output.
-            pitch: Key to adjust the pitch of the F0 contour.
             f0_method: Method to use for F0 estimation (e.g., "crepe").
             hop_length: Hop length for F0 estimation methods.
             f0_autotune: Whether to apply autotune to the F0 contour.
-            inp_f0: Optional input F0 contour to use instead of estimating.
+            f0_autotune_strength: Autotune strength.
         """
         global input_audio_path2wav
         if f0_method == "crepe":
@@ -351,20 +375,13 @@ class Pipeline:
                 x, self.f0_min, self.f0_max, p_len, int(hop_length), "tiny"
             )
         elif f0_method == "rmvpe":
-            f0 = self.model_rmvpe.infer_from_audio(x, thred=0.03)
+            f0 = get_f0_predictor("rmvpe", self.device).infer_from_audio(
+                x, thred=0.03
+            )
         elif f0_method == "fcpe":
-            self.model_fcpe = FCPEF0Predictor(
-                os.path.join("rvc", "models", "predictors", "fcpe.pt"),
-                f0_min=int(self.f0_min),
-                f0_max=int(self.f0_max),
-                dtype=torch.float32,
-                device=self.device,
-                sample_rate=self.sample_rate,
-                threshold=0.03,
+            f0 = self._get_fcpe(int(self.f0_min), int(self.f0_max)).compute_f0(
+                x, p_len=p_len
             )
-            f0 = self.model_fcpe.compute_f0(x, p_len=p_len)
-            del self.model_fcpe
-            gc.collect()
         elif "hybrid" in f0_method:
             input_audio_path2wav[input_audio_path] = x.astype(np.double)
             f0 = self.get_f0_hybrid(
@@ -379,7 +396,56 @@ class Pipeline:
         if f0_autotune is True:
             f0 = Autotune.autotune_f0(self, f0, f0_autotune_strength)
 
-        f0 *= pow(2, pitch / 12)
+        return f0
+
+    def get_f0(
+        self,
+        input_audio_path,
+        x,
+        p_len,
+        pitch,
+        f0_method,
+        hop_length,
+        f0_autotune,
+        f0_autotune_strength,
+        inp_f0=None,
+    ):
+        """
+        Estimates the fundamental frequency (F0) of a given audio signal using various methods.
+
+        Args:
+            input_audio_path: Path to the input audio file.
+            x: The input audio signal as a NumPy array.
+            p_len: Desired length of the F0 output.
+            pitch: Key to adjust the pitch of the F0 contour.
+            f0_method: Method to use for F0 estimation (e.g., "crepe").
+            hop_length: Hop length for F0 estimation methods.
+            f0_autotune: Whether to apply autotune to the F0 contour.
+            inp_f0: Optional input F0 contour to use instead of estimating.
+        """
+        f0_cache = get_f0_cache()
+        cache_key = None
+        f0 = None
+        if f0_cache.enabled:
+            cache_key = f0_cache.make_key(
+                x, f0_method, hop_length, f0_autotune, f0_autotune_strength
+            )
+            f0 = f0_cache.get(cache_key)
+        if f0 is None:
+            f0 = self._compute_f0(
+                input_audio_path,
+                x,
+                p_len,
+                f0_method,
+                hop_length,
+                f0_autotune,
+                f0_autotune_strength,
+            )
+            if cache_key is not None:
+                f0_cache.put(cache_key, f0)
+
+        # transpose on a copy so the cached contour stays untransposed
+        f0 = f0 * pow(2, pitch / 12)
         tf0 = self.sample_rate // self.window
         if inp_f0 is not None:
             delta_t = np.round(
@@ -416,6 +482,7 @@ class Pipeline:
         index_rate,
         version,
         protect,
+        embedder_key=None,
     ):
         """
         Performs voice conversion on a given audio segment.
@@ -432,16 +499,12 @@ class Pipeline:
             index_rate: Blending rate for speaker embedding retrieval.
             version: Model version (Keep to support old models).
             protect: Protection level for preserving the original pitch.
+            embedder_key: Identifier of the embedder, enables the feature cache when set.
         """
         with torch.no_grad():
             pitch_guidance = pitch != None and pitchf != None
-            # prepare source audio
-            feats = torch.from_numpy(audio0).float()
-            feats = feats.mean(-1) if feats.dim() == 2 else feats
-            assert feats.dim() == 1, feats.dim()
-            feats = feats.view(1, -1).to(self.device)
             # extract features
-            feats = model(feats)["last_hidden_state"]
+            feats = self._extract_features(model, audio0, embedder_key)
             feats = (
                 model.final_proj(feats[0]).unsqueeze(0) if version == "v1" else feats
             )
@@ -488,6 +551,242 @@ class Pipeline:
                 torch.cuda.empty_cache()
         return audio1
 
+    def voice_conversion_batch(
+        self,
+        model,
+        net_g,
+        sid,
+        segments,
+        pitches,
+        pitchfs,
+        index,
+        big_npy,
+        index_rate,
+        version,
+        protect,
+        embedder_key=None,
+        max_batch_size=None,
+    ):
+        """
+        Performs voice conversion on several audio segments at once.
+
+        Segments of similar length are padded into one batch, so the embedder, the FAISS search
+        and net_g.infer run once per group instead of once per segment.
+
+        Args:
+            model: The feature extractor model.
+            net_g: The generative model for synthesizing speech.
+            sid: Speaker ID for the target voice.
+            segments: The input audio segments.
+            pitches: Quantized F0 contour per segment, or None without pitch guidance.
+            pitchfs: Original F0 contour per segment, or None without pitch guidance.
+            index: FAISS index for speaker embedding retrieval.
+            big_npy: Speaker embeddings stored in a NumPy array.
+            index_rate: Blending rate for speaker embedding retrieval.
+            version: Model version (Keep to support old models).
+            protect: Protection level for preserving the original pitch.
+            embedder_key: Identifier of the embedder, enables the feature cache when set.
+            max_batch_size: Maximum number of segments per batch (None for no limit).
+
+        Returns:
+            The converted segments, as voice_conversion returns them one by one.
+        """
+        if pitches is None or pitchfs is None:
+            pitches = pitchfs = [None] * len(segments)
+        outputs = [None] * len(segments)
+        for group in _length_groups(
+            [segment.shape[0] for segment in segments], max_group_size=max_batch_size
+        ):
+            if len(group) == 1:
+                i = group[0]
+                outputs[i] = self.voice_conversion(
+                    model,
+                    net_g,
+                    sid,
+                    segments[i],
+                    pitches[i],
+                    pitchfs[i],
+                    index,
+                    big_npy,
+                    index_rate,
+                    version,
+                    protect,
+                    embedder_key,
+                )
+                continue
+            converted = self._voice_conversion_group(
+                model,
+                net_g,
+                sid,
+                [segments[i] for i in group],
+                [pitches[i] for i in group],
+                [pitchfs[i] for i in group],
+                index,
+                big_npy,
+                index_rate,
+                version,
+                protect,
+                embedder_key,
+            )
+            for i, audio1 in zip(group, converted):
+                outputs[i] = audio1
+        return outputs
+
+    def _voice_conversion_group(
+        self,
+        model,
+        net_g,
+        sid,
+        segments,
+        pitches,
+        pitchfs,
+        index,
+        big_npy,
+        index_rate,
+        version,
+        protect,
+        embedder_key=None,
+    ):
+        """
+        Converts one group of similar-length segments with a single padded batch.
+        """
+        with torch.no_grad():
+            pitch_guidance = pitches[0] is not None and pitchfs[0] is not None
+            # extract features
+            feats_list = self._extract_features_batch(model, segments, embedder_key)
+            if version == "v1":
+                feats_list = [
+                    model.final_proj(feats[0]).unsqueeze(0) for feats in feats_list
+                ]
+            # make a copy for pitch guidance and protection
+            feats0_list = (
+                [feats.clone() for feats in feats_list] if pitch_guidance else None
+            )
+            if index:
+                feats_list = self._retrieve_speaker_embeddings_batch(
+                    feats_list, index, big_npy, index_rate
+                )
+            batch_feats, batch_pitch, batch_pitchf, lengths = [], [], [], []
+            for k, feats in enumerate(feats_list):
+                # feature upsampling
+                feats = F.interpolate(feats.permute(0, 2, 1), scale_factor=2).permute(
+                    0, 2, 1
+                )
+                # adjust the length if the audio is short
+                p_len = min(segments[k].shape[0] // self.window, feats.shape[1])
+                if pitch_guidance:
+                    feats0 = F.interpolate(
+                        feats0_list[k].permute(0, 2, 1), scale_factor=2
+                    ).permute(0, 2, 1)
+                    pitch, pitchf = pitches[k][:, :p_len], pitchfs[k][:, :p_len]
+                    # Pitch protection blending
+                    if protect < 0.5:
+                        pitchff = pitchf.clone()
+                        pitchff[pitchf > 0] = 1
+                        pitchff[pitchf < 1] = protect
+                        feats = feats * pitchff.unsqueeze(-1) + feats0 * (
+                            1 - pitchff.unsqueeze(-1)
+                        )
+                        feats = feats.to(feats0.dtype)
+                    batch_pitch.append(pitch[0])
+                    batch_pitchf.append(pitchf[0])
+                batch_feats.append(feats[0])
+                lengths.append(p_len)
+            # pad into one batch: net_g masks the text encoder and flow by p_len, and the padded
+            # tail of each output is cut off below
+            frames = [feats.shape[0] for feats in batch_feats]
+            feats = torch.nn.utils.rnn.pad_sequence(batch_feats, batch_first=True)
+            p_len = torch.tensor(lengths, device=self.device).long()
+            batch_sid = sid.expand(feats.shape[0])
+            if pitch_guidance:
+                pitch = torch.nn.utils.rnn.pad_sequence(batch_pitch, batch_first=True)
+                pitchf = torch.nn.utils.rnn.pad_sequence(batch_pitchf, batch_first=True)
+                pitch = F.pad(pitch, (0, feats.shape[1] - pitch.shape[1]))
+                pitchf = F.pad(pitchf, (0, feats.shape[1] - pitchf.shape[1]))
+                audio1 = net_g.infer(
+                    feats.float(), p_len, pitch, pitchf.float(), batch_sid
+                )[0]
+            else:
+                audio1 = net_g.infer(feats.float(), p_len, None, None, batch_sid)[0]
+            # split the batch back into segments
+            hop = audio1.shape[-1] // feats.shape[1]
+            audio1 = audio1.data.cpu().float().numpy()
+            outputs = [audio1[k, 0, : frames[k] * hop] for k in range(len(frames))]
+            # clean up
+            del feats, feats0_list, p_len
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        return outputs
+
+    def _extract_features(self, model, audio0, embedder_key=None):
+        """
+        Runs the embedder on an audio segment, reusing cached features when available.
+
+        Args:
+            model: The feature extractor model.
+            audio0: The input audio segment.
+            embedder_key: Identifier of the embedder, enables the feature cache when set.
+        """
+        feature_cache = get_feature_cache()
+        cache_key = None
+        if embedder_key and feature_cache.enabled:
+            cache_key = feature_cache.make_key(audio0, embedder_key)
+            cached = feature_cache.get(cache_key)
+            if cached is not None:
+                return torch.from_numpy(np.array(cached)).to(self.device)
+        # prepare source audio
+        feats = torch.from_numpy(audio0).float()
+        feats = feats.mean(-1) if feats.dim() == 2 else feats
+        assert feats.dim() == 1, feats.dim()
+        feats = feats.view(1, -1).to(self.device)
+        feats = model(feats)["last_hidden_state"]
+        if cache_key is not None:
+            feature_cache.put(cache_key, feats.float().cpu().numpy())
+        return feats
+
+    def _extract_features_batch(self, model, segments, embedder_key=None):
+        """
+        Runs the embedder on several audio segments, batching segments of equal length, reusing cached features when available.
+
+        Args:
+            model: The feature extractor model.
+            segments: The input audio segments.
+            embedder_key: Identifier of the embedder, enables the feature cache when set.
+
+        Returns:
+            One (1, frames, channels) feature tensor per segment.
+        """
+        feature_cache = get_feature_cache()
+        use_cache = bool(embedder_key) and feature_cache.enabled
+        feats_list = [None] * len(segments)
+        cache_keys = [None] * len(segments)
+        missing = []
+        for i, audio0 in enumerate(segments):
+            if use_cache:
+                cache_keys[i] = feature_cache.make_key(audio0, embedder_key)
+                cached = feature_cache.get(cache_keys[i])
+                if cached is not None:
+                    feats_list[i] = torch.from_numpy(np.array(cached)).to(self.device)
+                    continue
+            missing.append(i)
+        # The embedder's group norm and self-attention see zero padding, so only segments of
+        # exactly the same length share a pass; features then match the single-segment path
+        # and are safe to cache under the segment's own key.
+        same_length = {}
+        for i in missing:
+            same_length.setdefault(segments[i].shape[0], []).append(i)
+        for indices in same_length.values():
+            # prepare source audio
+            waves = [torch.from_numpy(segments[i]).float() for i in indices]
+            waves = [wave.mean(-1) if wave.dim() == 2 else wave for wave in waves]
+            hidden = model(torch.stack(waves).to(self.device))["last_hidden_state"]
+            for k, i in enumerate(indices):
+                feats = hidden[k : k + 1]
+                feats_list[i] = feats
+                if cache_keys[i] is not None:
+                    feature_cache.put(cache_keys[i], feats.float().cpu().numpy())
+        return feats_list
+
     def _retrieve_speaker_embeddings(self, feats, index, big_npy, index_rate):
         npy = feats[0].cpu().numpy()
         score, ix = index.search(npy, k=8)
@@ -500,6 +799,27 @@ class Pipeline:
         )
         return feats
 
+    def _retrieve_speaker_embeddings_batch(self, feats_list, index, big_npy, index_rate):
+        """
+        Blends retrieved speaker embeddings into several feature tensors with one FAISS search.
+        """
+        npy = np.concatenate([feats[0].cpu().numpy() for feats in feats_list])
+        score, ix = index.search(npy, k=8)
+        weight = np.square(1 / score)
+        weight /= weight.sum(axis=1, keepdims=True)
+        npy = np.sum(big_npy[ix] * np.expand_dims(weight, axis=2), axis=1)
+        retrieved = []
+        start = 0
+        for feats in feats_list:
+            end = start + feats.shape[1]
+            retrieved.append(
+                torch.from_numpy(npy[start:end]).unsqueeze(0).to(self.device)
+                * index_rate
+                + (1 - index_rate) * feats
+            )
+            start = end
+        return retrieved
+
     def pipeline(
         self,
         model,
@@ -518,6 +838,9 @@ class Pipeline:
         f0_autotune,
         f0_autotune_strength,
         f0_file,
+        embedder_key=None,
+        batch_chunks=False,
+        chunk_batch_size=4,
     ):
         """
         The main pipeline function for performing voice conversion.
@@ -541,11 +864,13 @@ class Pipeline:
             hop_length: Hop length for F0 estimation methods.
             f0_autotune: Whether to apply autotune to the F0 contour.
             f0_file: Path to a file containing an F0 contour to use.
+            embedder_key: Identifier of the embedder, enables the feature cache when set.
+            batch_chunks: Whether to convert the split segments in padded batches (see voice_conversion_batch).
+            chunk_batch_size: Maximum number of segments per batch when batch_chunks is set.
         """
         if file_index != "" and os.path.exists(file_index) and index_rate > 0:
             try:
-                index = faiss.read_index(file_index)
-                big_npy = index.reconstruct_n(0, index.ntotal)
+                index, big_npy = get_index_cache().get(file_index)
             except Exception as error:
                 print(f"An error occurred reading the FAISS index: {error}")
                 index = big_npy = None
@@ -602,73 +927,58 @@ class Pipeline:
                 pitchf = pitchf.astype(np.float32)
             pitch = torch.tensor(pitch, device=self.device).unsqueeze(0).long()
             pitchf = torch.tensor(pitchf, device=self.device).unsqueeze(0).float()
+        segments, pitches, pitchfs = [], [], []
         for t in opt_ts:
             t = t // self.window * self.window
+            segments.append(audio_pad[s : t + self.t_pad2 + self.window])
             if pitch_guidance:
-                audio_opt.append(
-                    self.voice_conversion(
-                        model,
-                        net_g,
-                        sid,
-                        audio_pad[s : t + self.t_pad2 + self.window],
-                        pitch[:, s // self.window : (t + self.t_pad2) // self.window],
-                        pitchf[:, s // self.window : (t + self.t_pad2) // self.window],
-                        index,
-                        big_npy,
-                        index_rate,
-                        version,
-                        protect,
-                    )[self.t_pad_tgt : -self.t_pad_tgt]
+                pitches.append(
+                    pitch[:, s // self.window : (t + self.t_pad2) // self.window]
                 )
-            else:
-                audio_opt.append(
-                    self.voice_conversion(
-                        model,
-                        net_g,
-                        sid,
-                        audio_pad[s : t + self.t_pad2 + self.window],
-                        None,
-                        None,
-                        index,
-                        big_npy,
-                        index_rate,
-                        version,
-                        protect,
-                    )[self.t_pad_tgt : -self.t_pad_tgt]
+                pitchfs.append(
+                    pitchf[:, s // self.window : (t + self.t_pad2) // self.window]
                 )
             s = t
+        segments.append(audio_pad[t:])
         if pitch_guidance:
-            audio_opt.append(
-                self.voice_conversion(
-                    model,
-                    net_g,
-                    sid,
-                    audio_pad[t:],
-                    pitch[:, t // self.window :] if t is not None else pitch,
-                    pitchf[:, t // self.window :] if t is not None else pitchf,
-                    index,
-                    big_npy,
-                    index_rate,
-                    version,
-                    protect,
-                )[self.t_pad_tgt : -self.t_pad_tgt]
+            pitches.append(pitch[:, t // self.window :] if t is not None else pitch)
+            pitchfs.append(pitchf[:, t // self.window :] if t is not None else pitchf)
+        if batch_chunks and len(segments) > 1:
+            converted = self.voice_conversion_batch(
+                model,
+                net_g,
+                sid,
+                segments,
+                pitches if pitch_guidance else None,
+                pitchfs if pitch_guidance else None,
+                index,
+                big_npy,
+                index_rate,
+                version,
+                protect,
+                embedder_key,
+                max_batch_size=chunk_batch_size,
             )
         else:
-            audio_opt.append(
+            converted = [
                 self.voice_conversion(
                     model,
                     net_g,
                     sid,
-                    audio_pad[t:],
-                    None,
-                    None,
+                    segment,
+                    pitches[i] if pitch_guidance else None,
+                    pitchfs[i] if pitch_guidance else None,
                     index,
                     big_npy,
                     index_rate,
                     version,
                     protect,
-                )[self.t_pad_tgt : -self.t_pad_tgt]
-            )
+                    embedder_key,
+                )
+                for i, segment in enumerate(segments)
+            ]
+        for audio1 in converted:
+            audio_opt.append(audio1[self.t_pad_tgt : -self.t_pad_tgt])
         audio_opt = np.concatenate(audio_opt)
         if volume_envelope != 1:
             audio_opt = AudioProcessor.change_rms(
@@ -683,3 +993,122 @@ class Pipeline:
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
         return audio_opt
+
+    def pipeline_batch(
+        self,
+        model,
+        net_g,
+        sid,
+        audios,
+        pitch,
+        f0_method,
+        file_index,
+        index_rate,
+        pitch_guidance,
+        volume_envelope,
+        version,
+        protect,
+        hop_length,
+        f0_autotune,
+        f0_autotune_strength,
+        embedder_key=None,
+    ):
+        """
+        Converts several short inputs with the same settings in one batch.
+
+        Each input must fit in a single segment (no split points, see pipeline); inputs that do not
+        are converted individually with pipeline.
+
+        Args:
+            audios: The input audio signals.
+            Other arguments are as in pipeline (without f0_file).
+
+        Returns:
+            The converted audio signals, in input order.
+        """
+        if file_index != "" and os.path.exists(file_index) and index_rate > 0:
+            try:
+                index, big_npy = get_index_cache().get(file_index)
+            except Exception as error:
+                print(f"An error occurred reading the FAISS index: {error}")
+                index = big_npy = None
+        else:
+            index = big_npy = None
+        results = [None] * len(audios)
+        batch, filtered, segments, pitches, pitchfs = [], [], [], [], []
+        sid = torch.tensor(sid, device=self.device).unsqueeze(0).long()
+        for i, audio in enumerate(audios):
+            if audio.shape[0] + self.window > self.t_max:
+                results[i] = self.pipeline(
+                    model,
+                    net_g,
+                    sid.item(),
+                    audio,
+                    pitch,
+                    f0_method,
+                    file_index,
+                    index_rate,
+                    pitch_guidance,
+                    volume_envelope,
+                    version,
+                    protect,
+                    hop_length,
+                    f0_autotune,
+                    f0_autotune_strength,
+                    None,
+                    embedder_key,
+                )
+                continue
+            audio = signal.filtfilt(bh, ah, audio)
+            audio_pad = np.pad(audio, (self.t_pad, self.t_pad), mode="reflect")
+            p_len = audio_pad.shape[0] // self.window
+            if pitch_guidance:
+                pitch_i, pitchf_i = self.get_f0(
+                    "input_audio_path",
+                    audio_pad,
+                    p_len,
+                    pitch,
+                    f0_method,
+                    hop_length,
+                    f0_autotune,
+                    f0_autotune_strength,
+                    None,
+                )
+                pitch_i = pitch_i[:p_len]
+                pitchf_i = pitchf_i[:p_len]
+                if self.device == "mps":
+                    pitchf_i = pitchf_i.astype(np.float32)
+                pitches.append(torch.tensor(pitch_i, device=self.device).unsqueeze(0).long())
+                pitchfs.append(torch.tensor(pitchf_i, device=self.device).unsqueeze(0).float())
+            batch.append(i)
+            filtered.append(audio)
+            segments.append(audio_pad)
+        if batch:
+            converted = self.voice_conversion_batch(
+                model,
+                net_g,
+                sid,
+                segments,
+                pitches if pitch_guidance else None,
+                pitchfs if pitch_guidance else None,
+                index,
+                big_npy,
+                index_rate,
+                version,
+                protect,
+                embedder_key,
+            )
+            for i, audio, audio_opt in zip(batch, filtered, converted):
+                audio_opt = audio_opt[self.t_pad_tgt : -self.t_pad_tgt]
+                if volume_envelope != 1:
+                    audio_opt = AudioProcessor.change_rms(
+                        audio, self.sample_rate, audio_opt, self.sample_rate, volume_envelope
+                    )
+                audio_max = np.abs(audio_opt).max() / 0.99
+                if audio_max > 1:
+                    audio_opt /= audio_max
+                results[i] = audio_opt
+        del sid
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        return results
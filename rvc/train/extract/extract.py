@@ -18,7 +18,7 @@ import rvc.lib.zluda
 
 from rvc.lib.utils import load_audio, load_embedding
 from rvc.train.extract.preparing_files import generate_config, generate_filelist
-from rvc.lib.predictors.RMVPE import RMVPE0Predictor
+from rvc.infer.f0_predictors import get_f0_predictor
 from rvc.configs.config import Config
 
 # Load config
@@ -103,10 +103,7 @@ class FeatureInput:
     def process_files(self, files, f0_method, hop_length, device, threads):
         self.device = device
         if f0_method == "rmvpe":
-            self.model_rmvpe = RMVPE0Predictor(
-                os.path.join("rvc", "models", "predictors", "rmvpe.pt"),
-                device=device,
-            )
+            self.model_rmvpe = get_f0_predictor("rmvpe", device)
 
         def worker(file_info):
             self.process_file(file_info, f0_method, hop_length)
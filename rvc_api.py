@@ -5,17 +5,25 @@ Enhanced implementation for RVC voice cloning
 
 import os
 import sys
+import json
+import time
 import torch
 import logging
+import threading
 import numpy as np
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 # Add paths
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import RVC modules
 from rvc.infer.infer import VoiceConverter
+from rvc.infer.index_cache import configure_index_cache
+from rvc.infer.f0_cache import configure_f0_cache
+from rvc.infer.feature_cache import configure_feature_cache
+from rvc.infer.batching import BatchScheduler
 
 logger = logging.getLogger("RVC_API")
 
@@ -40,23 +48,227 @@ class RVCConverter:
         self.current_model_path = None
         self.current_index_path = None
         self.device = device if device else ("cuda:0" if torch.cuda.is_available() else "cpu")
-        self.performance_config = performance_config or {}
+        self.performance_config = self._load_performance_config(performance_config)
         
         # Performance settings
-        self.batch_size = self.performance_config.get('batch_size', 1)
+        self.batch_size = self.performance_config.get(
+            'rvc_batch_size', self.performance_config.get('batch_size', 1)
+        )
         self.max_memory_usage = self.performance_config.get('max_memory_mb', 4096)
         
-        # Model cache for faster switching
-        self.model_cache = {}
-        self.cache_size_limit = self.performance_config.get('cache_size', 2)
+        # Model cache for faster switching: model name -> resident synthesizer entry (LRU order)
+        self.model_cache = OrderedDict()
+        self.cache_enabled = self.performance_config.get(
+            'rvc_cache_models', self.performance_config.get('enable_model_cache', True)
+        )
+        self.cache_size_limit = max(1, self.performance_config.get('cache_size', 2)) if self.cache_enabled else 1
+        self.model_idle_ttl = self.performance_config.get('model_idle_ttl_s', 1800)
+        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._cache_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        
+        # Resident FAISS index cache (shared by all models in this process)
+        configure_index_cache(
+            max_bytes=self.performance_config.get('index_cache_mb', 1024) * 1024 * 1024,
+            use_mmap=self.performance_config.get('index_use_mmap', True)
+        )
+        
+        # F0 contour cache (reused across models and transpose values)
+        configure_f0_cache(
+            max_bytes=self.performance_config.get('f0_cache_mb', 64) * 1024 * 1024,
+            disk_dir=self.performance_config.get('f0_cache_dir', ""),
+            max_disk_bytes=self.performance_config.get('f0_cache_disk_mb', 1024) * 1024 * 1024
+        )
+        
+        # Embedder feature cache (reused across target models)
+        configure_feature_cache(
+            max_bytes=self.performance_config.get('feature_cache_mb', 256) * 1024 * 1024,
+            disk_dir=self.performance_config.get('feature_cache_dir', ""),
+            max_disk_bytes=self.performance_config.get('feature_cache_disk_mb', 2048) * 1024 * 1024
+        )
+        
+        # Batched inference over the split segments of long inputs
+        self.batch_chunks = self.performance_config.get('rvc_batch_chunks', False)
+        self.chunk_batch_size = self.performance_config.get('rvc_chunk_batch_size', 4)
+        
+        # Micro-batching of concurrent short conversions with the same model and settings
+        self.batcher = BatchScheduler(
+            max_batch_size=self.batch_size,
+            max_wait_ms=self.performance_config.get('rvc_batch_wait_ms', 20)
+        )
         
         logger.info(f"RVC Converter initialized with device: {self.device}")
-        logger.info(f"Performance config: batch_size={self.batch_size}, cache_size={self.cache_size_limit}")
+        logger.info(f"Performance config: batch_size={self.batch_size}, cache_size={self.cache_size_limit}, max_memory_mb={self.max_memory_usage}")
         
         # Create temp directory for processing
         self.temp_dir = Path("storage/temp/rvc")
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         
+    @staticmethod
+    def _load_performance_config(performance_config: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Merge config/rvc_performance_config.json with an explicit performance config
+        
+        Args:
+            performance_config: Values that override the file settings
+            
+        Returns:
+            Flat settings dict
+        """
+        config = {}
+        config_file = Path("config/rvc_performance_config.json")
+        if config_file.exists():
+            try:
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    file_config = json.load(f)
+                for section in ("performance", "rvc"):
+                    config.update(file_config.get(section, {}))
+            except Exception as e:
+                logger.warning(f"Failed to load RVC performance config: {e}")
+        config.update(performance_config or {})
+        return config
+    
+    def _resolve_model_files(self, model_name: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Find the model .pth and .index files for a model
+        
+        Returns:
+            Tuple of (model_path, index_path) or None if the model is unusable
+        """
+        model_dir = self.models_dir / model_name
+        if not model_dir.exists():
+            logger.error(f"Model directory not found: {model_dir}")
+            return None
+        
+        # Find model files
+        pth_files = list(model_dir.glob("*.pth"))
+        index_files = list(model_dir.glob("*.index"))
+        
+        # Filter out training files (D_*.pth, G_*.pth) - keep only model files
+        model_pth_files = [f for f in pth_files if not (f.name.startswith('D_') or f.name.startswith('G_'))]
+        
+        if not model_pth_files:
+            logger.error(f"No model .pth files found for model: {model_name}")
+            return None
+        
+        # Use the first model .pth file found
+        return str(model_pth_files[0]), (str(index_files[0]) if index_files else None)
+    
+    def _acquire_model(self, model_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a resident model from the cache, loading (and evicting) as needed
+        
+        Args:
+            model_name: Name of the model
+            
+        Returns:
+            Cache entry with "model" (LoadedModel), "model_path" and "index_path", or None
+        """
+        with self._cache_lock:
+            self._evict_idle_models()
+            entry = self.model_cache.get(model_name)
+            if entry is not None:
+                self.model_cache.move_to_end(model_name)
+                entry["last_used"] = time.time()
+                self.cache_stats["hits"] += 1
+                return entry
+        
+        with self._load_lock:
+            # Another thread may have loaded it while we waited
+            with self._cache_lock:
+                entry = self.model_cache.get(model_name)
+                if entry is not None:
+                    self.model_cache.move_to_end(model_name)
+                    entry["last_used"] = time.time()
+                    self.cache_stats["hits"] += 1
+                    return entry
+                self.cache_stats["misses"] += 1
+            
+            paths = self._resolve_model_files(model_name)
+            if paths is None:
+                return None
+            model_path, index_path = paths
+            
+            if self.voice_converter is None:
+                self.voice_converter = VoiceConverter()
+            
+            logger.info(f"Loading model: {model_path}")
+            if index_path:
+                logger.info(f"Using index: {index_path}")
+            loaded = self.voice_converter.build_model(model_path)
+            if loaded is None:
+                logger.error(f"Failed to build model from {model_path}")
+                return None
+            
+            entry = {
+                "model": loaded,
+                "model_path": model_path,
+                "index_path": index_path,
+                "nbytes": loaded.nbytes,
+                "last_used": time.time()
+            }
+            with self._cache_lock:
+                self.model_cache[model_name] = entry
+                self._evict_over_budget()
+            logger.info(f"Model cached: {model_name} ({entry['nbytes'] / (1024 * 1024):.1f} MB)")
+            return entry
+    
+    def _evict_idle_models(self):
+        """Drop models that have not been used within the idle TTL (cache lock held)"""
+        if not self.model_idle_ttl or self.model_idle_ttl <= 0:
+            return
+        cutoff = time.time() - self.model_idle_ttl
+        for name in [n for n, e in self.model_cache.items() if e["last_used"] < cutoff]:
+            self._evict_model(name)
+    
+    def _evict_over_budget(self):
+        """Evict least recently used models beyond cache_size / max_memory_mb (cache lock held)"""
+        budget = self.max_memory_usage * 1024 * 1024
+        while len(self.model_cache) > 1:
+            total = sum(e["nbytes"] for e in self.model_cache.values())
+            if len(self.model_cache) <= self.cache_size_limit and total <= budget:
+                break
+            self._evict_model(next(iter(self.model_cache)))
+    
+    def _evict_model(self, model_name: str):
+        """Remove one model from the cache (cache lock held)"""
+        entry = self.model_cache.pop(model_name, None)
+        if entry is None:
+            return
+        self.cache_stats["evictions"] += 1
+        if self.current_model == model_name:
+            self.current_model = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        logger.info(f"Model evicted from cache: {model_name}")
+    
+    def _can_batch(self, entry: Dict[str, Any], audio: np.ndarray, sample_rate: int,
+                   split_audio: bool, kwargs: Dict[str, Any]) -> bool:
+        """Whether a conversion is short and plain enough to join a micro-batch"""
+        if not self.batcher.enabled or split_audio or kwargs.get('f0_file'):
+            return False
+        pipeline = entry["model"].vc
+        samples_16k = len(audio) * 16000 // sample_rate
+        return samples_16k + pipeline.window <= pipeline.t_max
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get model cache statistics
+        
+        Returns:
+            Dictionary with hit/miss/eviction counters and residency
+        """
+        with self._cache_lock:
+            return {
+                **self.cache_stats,
+                "resident_models": list(self.model_cache.keys()),
+                "resident_mb": round(sum(e["nbytes"] for e in self.model_cache.values()) / (1024 * 1024), 1),
+                "cache_size": self.cache_size_limit,
+                "max_memory_mb": self.max_memory_usage,
+                "idle_ttl_s": self.model_idle_ttl,
+                "batching": self.batcher.stats()
+            }
+    
     def get_available_models(self) -> List[str]:
         """
         Get list of available RVC models
@@ -98,7 +310,7 @@ class RVCConverter:
     
     def load_model(self, model_name: str) -> bool:
         """
-        Load specific RVC model
+        Load specific RVC model (kept resident in the model cache)
         
         Args:
             model_name: Name of the model to load
@@ -107,37 +319,13 @@ class RVCConverter:
             True if successful, False otherwise
         """
         try:
-            model_dir = self.models_dir / model_name
-            if not model_dir.exists():
-                logger.error(f"Model directory not found: {model_dir}")
+            entry = self._acquire_model(model_name)
+            if entry is None:
                 return False
             
-            # Find model files
-            pth_files = list(model_dir.glob("*.pth"))
-            index_files = list(model_dir.glob("*.index"))
-            
-            # Filter out training files (D_*.pth, G_*.pth) - keep only model files
-            model_pth_files = [f for f in pth_files if not (f.name.startswith('D_') or f.name.startswith('G_'))]
-            
-            if not model_pth_files:
-                logger.error(f"No model .pth files found for model: {model_name}")
-                return False
-            
-            # Use the first model .pth file found
-            model_path = str(model_pth_files[0])
-            index_path = str(index_files[0]) if index_files else None
-            
-            logger.info(f"Loading model: {model_path}")
-            if index_path:
-                logger.info(f"Using index: {index_path}")
-            
-            # Initialize voice converter if not already done
-            if self.voice_converter is None:
-                self.voice_converter = VoiceConverter()
-            
             # Store model paths for later use
-            self.current_model_path = model_path
-            self.current_index_path = index_path
+            self.current_model_path = entry["model_path"]
+            self.current_index_path = entry["index_path"]
             self.current_model = model_name
             logger.info(f"Successfully prepared model: {model_name}")
             return True
@@ -193,26 +381,23 @@ class RVCConverter:
             # Ensure output directory exists
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            # Load model if not current
-            if self.current_model != model_name:
-                if not self.load_model(model_name):
-                    logger.error(f"Failed to load model: {model_name}")
-                    return None
-            
-            # Ensure voice converter is initialized
-            if self.voice_converter is None:
-                logger.error("Voice converter not initialized")
+            # Get resident model (loads on cache miss)
+            entry = self._acquire_model(model_name)
+            if entry is None:
+                logger.error(f"Failed to load model: {model_name}")
                 return None
+            self.current_model = model_name
             
-            # Perform voice conversion using stored model paths
+            # Perform voice conversion using the cached model
             logger.info(f"Converting voice: {input_path} -> {output_path}")
             logger.info(f"Using model: {model_name} (pitch: {pitch}, index_rate: {index_rate})")
             
             self.voice_converter.convert_audio(
                 audio_input_path=input_path,
                 audio_output_path=output_path,
-                model_path=self.current_model_path,
-                index_path=self.current_index_path,
+                model_path=entry["model_path"],
+                index_path=entry["index_path"],
+                loaded_model=entry["model"],
                 pitch=pitch,
                 f0_method=f0_method,
                 index_rate=index_rate,
@@ -223,6 +408,8 @@ class RVCConverter:
                 clean_strength=clean_strength,
                 split_audio=split_audio,
                 post_process=post_process,
+                batch_chunks=self.batch_chunks,
+                chunk_batch_size=self.chunk_batch_size,
                 **kwargs
             )
             
@@ -241,6 +428,117 @@ class RVCConverter:
             logger.error(traceback.format_exc())
             return None
     
+    def convert_voice_array(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        model_name: str,
+        pitch: int = 0,
+        index_rate: float = 0.75,
+        volume_envelope: float = 0.25,
+        protect: float = 0.33,
+        hop_length: int = 512,
+        f0_method: str = "rmvpe",
+        clean_audio: bool = True,
+        clean_strength: float = 0.7,
+        split_audio: bool = False,
+        post_process: bool = False,
+        **kwargs
+    ) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Convert in-memory audio using RVC (no temporary files)
+        
+        Args:
+            audio: Input audio samples (mono, or samples x channels)
+            sample_rate: Sample rate of the input audio
+            model_name: Name of RVC model to use
+            pitch: Pitch adjustment (-12 to +12 semitones)
+            index_rate: Index rate (0.0 to 1.0)
+            volume_envelope: Volume envelope (0.0 to 1.0)
+            protect: Protect consonants (0.0 to 0.5)
+            hop_length: Hop length for processing
+            f0_method: F0 extraction method (rmvpe, crepe, fcpe)
+            clean_audio: Whether to clean audio
+            clean_strength: Audio cleaning strength
+            split_audio: Whether to split long audio
+            post_process: Whether to apply post-processing effects
+            
+        Returns:
+            Tuple of (converted audio, target sample rate) if successful, None otherwise
+        """
+        try:
+            if audio is None or len(audio) == 0:
+                logger.error("Input audio is empty")
+                return None
+            
+            # Get resident model (loads on cache miss)
+            entry = self._acquire_model(model_name)
+            if entry is None:
+                logger.error(f"Failed to load model: {model_name}")
+                return None
+            self.current_model = model_name
+            
+            logger.info(f"Converting voice in memory: {len(audio)} samples @ {sample_rate}Hz")
+            logger.info(f"Using model: {model_name} (pitch: {pitch}, index_rate: {index_rate})")
+            
+            params = dict(
+                pitch=pitch,
+                f0_method=f0_method,
+                index_rate=index_rate,
+                volume_envelope=volume_envelope,
+                protect=protect,
+                hop_length=hop_length,
+                clean_audio=clean_audio,
+                clean_strength=clean_strength,
+                post_process=post_process,
+                **kwargs
+            )
+            if self._can_batch(entry, audio, sample_rate, split_audio, kwargs):
+                audio_opt, tgt_sr = self.batcher.submit(
+                    (model_name, repr(sorted(params.items()))),
+                    (audio, sample_rate),
+                    lambda items: self.voice_converter.convert_array_batch(
+                        [item[0] for item in items],
+                        [item[1] for item in items],
+                        model_path=entry["model_path"],
+                        index_path=entry["index_path"],
+                        loaded_model=entry["model"],
+                        **params
+                    )
+                )
+                logger.info(f"Voice conversion completed: {len(audio_opt)} samples @ {tgt_sr}Hz")
+                return audio_opt, tgt_sr
+            
+            audio_opt, tgt_sr = self.voice_converter.convert_array(
+                audio,
+                sample_rate,
+                model_path=entry["model_path"],
+                index_path=entry["index_path"],
+                loaded_model=entry["model"],
+                pitch=pitch,
+                f0_method=f0_method,
+                index_rate=index_rate,
+                volume_envelope=volume_envelope,
+                protect=protect,
+                hop_length=hop_length,
+                clean_audio=clean_audio,
+                clean_strength=clean_strength,
+                split_audio=split_audio,
+                post_process=post_process,
+                batch_chunks=self.batch_chunks,
+                chunk_batch_size=self.chunk_batch_size,
+                **kwargs
+            )
+            
+            logger.info(f"Voice conversion completed: {len(audio_opt)} samples @ {tgt_sr}Hz")
+            return audio_opt, tgt_sr
+                
+        except Exception as e:
+            logger.error(f"Error in voice conversion: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return None
+    
     def is_available(self) -> bool:
         """
         Check if RVC system is available
@@ -315,9 +613,8 @@ class RVCConverter:
             self.current_model = None
             
             # Clear model cache
-            for model_name in list(self.model_cache.keys()):
-                del self.model_cache[model_name]
-            self.model_cache.clear()
+            with self._cache_lock:
+                self.model_cache.clear()
             
             # Clean up temp files
             if hasattr(self, 'temp_dir') and self.temp_dir.exists():
@@ -0,0 +1,282 @@
+"""
+⚙️ RVC Worker Pool
+pool ของ process แยกสำหรับงานแปลงเสียง RVC (หลีกเลี่ยง GIL และใช้ทุกคอร์ของเครื่อง CPU)
+ข้อมูลเสียงเข้า/ออกส่งผ่าน multiprocessing.shared_memory แทนการ pickle bytes
+"""
+
+import os
+import logging
+import time
+import threading
+import multiprocessing as mp
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("RVC_WORKERS")
+
+# อัตราสุ่มสูงสุดของโมเดล RVC ใช้ประเมินขนาด buffer ผลลัพธ์ล่วงหน้า
+MAX_TARGET_SAMPLE_RATE = 48000
+
+# เวลาประมวลผลเริ่มต้นต่องาน (วินาที) ก่อนมีข้อมูลจริงสำหรับประเมินเวลารอคิว
+DEFAULT_SERVICE_TIME = 1.0
+SERVICE_TIME_ALPHA = 0.2
+
+# สถานะภายใน worker process (หนึ่ง converter ต่อ process, โมเดลอยู่ในหน่วยความจำของ process นั้น)
+_worker_converter = None
+
+
+def _worker_init(models_dir: str, device: str, performance_config: Dict[str, Any], num_threads: int):
+    """เริ่มต้น worker process: กำหนดจำนวน thread ของ torch และสร้าง RVCConverter ของตัวเอง"""
+    global _worker_converter
+    import torch
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+    from rvc_api import RVCConverter
+    # worker ทำงานทีละงาน micro-batching ไม่มีงานอื่นให้รวม batch จะเสียเวลารอ rvc_batch_wait_ms ทุกงาน
+    _worker_converter = RVCConverter(
+        models_dir=models_dir,
+        device=device,
+        performance_config={**performance_config, "rvc_batch_size": 1}
+    )
+
+
+def _worker_convert(in_name: str, in_length: int, out_name: str, out_capacity: int,
+                    sample_rate: int, model_name: str, params: Dict[str, Any]):
+    """
+    แปลงเสียงภายใน worker process
+
+    Returns:
+        None ถ้าแปลงไม่สำเร็จ, หรือ (จำนวน sample ที่เขียนลง buffer ผลลัพธ์, sample rate, array สำรอง)
+        array สำรองจะถูกส่งกลับแบบ pickle เฉพาะกรณีผลลัพธ์ยาวเกิน buffer
+    """
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    try:
+        audio = np.ndarray((in_length,), dtype=np.float32, buffer=in_shm.buf).copy()
+    finally:
+        in_shm.close()
+
+    result = _worker_converter.convert_voice_array(audio, sample_rate, model_name=model_name, **params)
+    if result is None:
+        return None
+
+    converted, tgt_sr = result
+    converted = np.ascontiguousarray(converted, dtype=np.float32).reshape(-1)
+    if converted.size > out_capacity:
+        return converted.size, tgt_sr, converted
+
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        np.ndarray((converted.size,), dtype=np.float32, buffer=out_shm.buf)[:] = converted
+    finally:
+        out_shm.close()
+    return converted.size, tgt_sr, None
+
+
+class RVCWorkerPool:
+    """pool ของ RVC worker process (worker ละหนึ่ง process ที่มีโมเดลของตัวเอง)"""
+
+    def __init__(self, num_workers: int, models_dir: str = "logs", device: str = "cpu",
+                 performance_config: Dict[str, Any] = None, threads_per_worker: int = None,
+                 models_per_worker: int = 2, affinity_max_delay: float = 2.0):
+        """
+        เริ่มต้น worker pool
+
+        Args:
+            num_workers: จำนวน worker process
+            models_dir: โฟลเดอร์ที่เก็บโมเดล RVC
+            device: อุปกรณ์ที่ใช้ประมวลผลใน worker
+            performance_config: การตั้งค่าประสิทธิภาพที่ส่งต่อให้ RVCConverter ของแต่ละ worker
+            threads_per_worker: จำนวน torch thread ต่อ worker (None = แบ่งจากจำนวนคอร์)
+            models_per_worker: จำนวนโมเดลที่ worker หนึ่งเก็บไว้ในหน่วยความจำได้ (ตามแคชของ RVCConverter)
+            affinity_max_delay: เวลารอคิวสูงสุด (วินาที) ที่ยอมรอ worker ที่มีโมเดลอยู่แล้ว ก่อนจะโหลดโมเดลที่ worker อื่น
+        """
+        self.num_workers = max(1, int(num_workers))
+        self.device = device
+        if not threads_per_worker:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // self.num_workers)
+        self.threads_per_worker = threads_per_worker
+
+        # ใช้ spawn เสมอ (CUDA/torch ไม่ปลอดภัยกับ fork)
+        self._context = mp.get_context("spawn")
+        self._initargs = (models_dir, device, performance_config or {}, threads_per_worker)
+        self.workers: List[ProcessPoolExecutor] = [self._create_worker() for _ in range(self.num_workers)]
+        self.pending = [0] * self.num_workers
+        self.completed = [0] * self.num_workers
+        self.restarts = [0] * self.num_workers
+        self._lock = threading.Lock()
+
+        # ตัวจัดเส้นทางตามโมเดล: สำเนาของแคชโมเดล (LRU) ในแต่ละ worker
+        self.models_per_worker = max(1, int(models_per_worker))
+        self.affinity_max_delay = affinity_max_delay
+        self.resident: List[OrderedDict] = [OrderedDict() for _ in range(self.num_workers)]
+        self.service_time = [DEFAULT_SERVICE_TIME] * self.num_workers
+        self.affinity_hits = [0] * self.num_workers
+        self.swaps = [0] * self.num_workers
+
+        logger.info(
+            f"RVC worker pool started: {self.num_workers} workers on {device}, "
+            f"{threads_per_worker} torch threads each"
+        )
+
+    def _create_worker(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self._context,
+            initializer=_worker_init,
+            initargs=self._initargs
+        )
+
+    def _restart_worker(self, worker: int, broken: ProcessPoolExecutor):
+        """
+        สร้าง worker process ใหม่แทน process ที่ตาย (OOM, CUDA fault, ...)
+
+        งานที่ค้างอยู่ใน worker เดิมจะได้ BrokenProcessPool เหมือนกัน จึงสร้างใหม่เฉพาะครั้งแรก
+        โมเดลใน process ใหม่ยังไม่ถูกโหลด สำเนาแคชโมเดลของ worker นี้จึงถูกล้าง
+        """
+        with self._lock:
+            if self.workers[worker] is not broken:
+                return
+            self.workers[worker] = self._create_worker()
+            self.resident[worker].clear()
+            self.restarts[worker] += 1
+        logger.error(f"RVC worker {worker} died, restarted it (restart #{self.restarts[worker]})")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _expected_delay(self, worker: int) -> float:
+        """ประเมินเวลารอคิวของ worker (เรียกขณะถือ lock)"""
+        return self.pending[worker] * self.service_time[worker]
+
+    def _select_worker(self, model_name: str) -> int:
+        """
+        เลือก worker สำหรับโมเดล (เรียกขณะถือ lock)
+
+        ส่งไป worker ที่มีโมเดลอยู่แล้วก่อน และจะโหลดโมเดลที่ worker อื่นเฉพาะเมื่อ
+        เวลารอคิวของ worker ที่มีโมเดลเกิน affinity_max_delay
+        """
+        workers = range(self.num_workers)
+        holders = [i for i in workers if model_name in self.resident[i]]
+        if holders:
+            best_holder = min(holders, key=self._expected_delay)
+            if self._expected_delay(best_holder) <= self.affinity_max_delay:
+                return best_holder
+
+        # โหลดใหม่: เลือก worker ที่ว่างที่สุด โดยเลี่ยงการไล่โมเดลออกจากแคชถ้าทำได้
+        return min(
+            workers,
+            key=lambda i: (self._expected_delay(i), len(self.resident[i]) >= self.models_per_worker)
+        )
+
+    def _record_route(self, worker: int, model_name: str):
+        """บันทึกการส่งงานและอัปเดตสำเนาแคชโมเดลของ worker (เรียกขณะถือ lock)"""
+        resident = self.resident[worker]
+        if model_name in resident:
+            resident.move_to_end(model_name)
+            self.affinity_hits[worker] += 1
+            return
+        resident[model_name] = time.time()
+        self.swaps[worker] += 1
+        while len(resident) > self.models_per_worker:
+            resident.popitem(last=False)
+
+    def convert_array(self, audio: np.ndarray, sample_rate: int, model_name: str,
+                      **params) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        แปลงเสียงใน worker process (บล็อกจนกว่าจะเสร็จ ควรเรียกจาก thread ของ executor)
+
+        Args:
+            audio: ข้อมูลเสียง mono float32
+            sample_rate: sample rate ของเสียงต้นฉบับ
+            model_name: ชื่อโมเดล RVC
+            **params: พารามิเตอร์ของ RVCConverter.convert_voice_array
+
+        Returns:
+            (ข้อมูลเสียงที่แปลงแล้ว, sample rate) หรือ None ถ้าแปลงไม่สำเร็จ
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32).reshape(-1)
+        out_capacity = int(np.ceil(audio.size * MAX_TARGET_SAMPLE_RATE / sample_rate)) + MAX_TARGET_SAMPLE_RATE
+
+        in_shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+        out_shm = shared_memory.SharedMemory(create=True, size=out_capacity * 4)
+
+        with self._lock:
+            worker = self._select_worker(model_name)
+            self._record_route(worker, model_name)
+            self.pending[worker] += 1
+            executor = self.workers[worker]
+
+        started = time.time()
+        succeeded = False
+        try:
+            np.ndarray((audio.size,), dtype=np.float32, buffer=in_shm.buf)[:] = audio
+            try:
+                future = executor.submit(
+                    _worker_convert, in_shm.name, audio.size, out_shm.name, out_capacity,
+                    sample_rate, model_name, params
+                )
+                result = future.result()
+            except BrokenProcessPool:
+                self._restart_worker(worker, executor)
+                raise
+            if result is None:
+                return None
+
+            succeeded = True
+            length, tgt_sr, overflow = result
+            if overflow is not None:
+                return overflow, tgt_sr
+            return np.ndarray((length,), dtype=np.float32, buffer=out_shm.buf).copy(), tgt_sr
+        finally:
+            elapsed = time.time() - started
+            with self._lock:
+                self.pending[worker] -= 1
+                self.completed[worker] += 1
+                self.service_time[worker] += SERVICE_TIME_ALPHA * (elapsed - self.service_time[worker])
+                if not succeeded:
+                    # โมเดลอาจโหลดไม่สำเร็จ ไม่ถือว่าอยู่ใน worker นี้
+                    self.resident[worker].pop(model_name, None)
+            for shm in (in_shm, out_shm):
+                shm.close()
+                shm.unlink()
+
+    def get_status(self) -> Dict[str, Any]:
+        """สถานะของ worker pool"""
+        with self._lock:
+            return {
+                "workers": self.num_workers,
+                "device": self.device,
+                "threads_per_worker": self.threads_per_worker,
+                "models_per_worker": self.models_per_worker,
+                "affinity_max_delay_s": self.affinity_max_delay,
+                "total_swaps": sum(self.swaps),
+                "total_affinity_hits": sum(self.affinity_hits),
+                "total_restarts": sum(self.restarts),
+                "per_worker": [
+                    {
+                        "worker": i,
+                        "resident_models": list(self.resident[i].keys()),
+                        "pending": self.pending[i],
+                        "completed": self.completed[i],
+                        "swaps": self.swaps[i],
+                        "affinity_hits": self.affinity_hits[i],
+                        "restarts": self.restarts[i],
+                        "avg_service_s": round(self.service_time[i], 3),
+                        "expected_delay_s": round(self._expected_delay(i), 3)
+                    }
+                    for i in range(self.num_workers)
+                ]
+            }
+
+    def shutdown(self):
+        """ปิด worker process ทั้งหมด"""
+        for worker in self.workers:
+            worker.shutdown(wait=False, cancel_futures=True)
+        logger.info("RVC worker pool shut down")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+✂️ Text Chunker Benchmark
+Measures chunking throughput and chunk-duration balance on large Thai, Lao, English and mixed corpora.
+
+Usage:
+  python scripts/benchmark_text_chunker.py
+  python scripts/benchmark_text_chunker.py --sizes 100000 1000000 --target 20
+  python scripts/benchmark_text_chunker.py --corpus my_document.txt
+"""
+
+import sys
+import time
+import unicodedata
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from text_chunker import chunk_text, estimate_duration, FOLLOWING_CHARS, LEADING_CHARS
+
+SAMPLE_SENTENCES = {
+    "lao": [
+        "ສະບາຍດີ ທຸກຄົນ",
+        "ມື້ນີ້ອາກາດດີຫຼາຍ ພວກເຮົາໄປທ່ຽວກັນເຖາະ",
+        "ຂ້ອຍມັກເມືອງລາວຫຼາຍໆ",
+        "ປະເທດລາວມີແມ່ນ້ຳຂອງໄຫຼຜ່ານ ແລະ ມີພູເຂົາຫຼາຍ",
+        "ຂອບໃຈຫຼາຍໆ ທີ່ມາຢ້ຽມຢາມ ຯລຯ",
+    ],
+    "thai": [
+        "สวัสดีครับ",
+        "วันนี้อากาศดีมาก เราไปเที่ยวกันเถอะ",
+        "ผมชอบประเทศไทยมากๆ",
+        "กรุงเทพมหานครเป็นเมืองหลวงของประเทศไทย มีประชากรหลายล้านคน",
+        "ขอบคุณที่มาเยี่ยมชม ฯลฯ",
+    ],
+    "english": [
+        "Hello world.",
+        "This is a test of the chunker, which should split nicely!",
+        "Is the work evenly sized?",
+        "Parallel synthesis works best when every chunk takes about the same time to speak.",
+    ],
+}
+
+
+def build_corpus(language: str, size: int, seed: int = 0) -> str:
+    """Builds a corpus of roughly size characters from the sample sentences."""
+    rng = random.Random(seed)
+    if language == "mixed":
+        pools = [sentence for sentences in SAMPLE_SENTENCES.values() for sentence in sentences]
+    else:
+        pools = SAMPLE_SENTENCES[language]
+    parts = []
+    length = 0
+    while length < size:
+        sentence = rng.choice(pools)
+        # paragraph breaks every few sentences, otherwise spaces as in running Thai/Lao text
+        separator = "\n" if rng.random() < 0.05 else " "
+        parts.append(sentence + separator)
+        length += len(sentence) + 1
+    return "".join(parts)
+
+
+# Unbroken Thai/Lao runs that force mid-word cuts (SARA AM, leading vowels, stacked marks)
+SYLLABLE_CASES = [
+    "กำ" * 50,
+    "เกไปโมใจแม่" * 20,
+    "น้ำ" * 40,
+    "ຄຳ" * 50 + "ເກ" * 30,
+    "ແມ່ນໍ້າ" * 30,
+]
+
+
+def check_syllable_cuts() -> bool:
+    """Regression check: forced cuts must never orphan a Thai/Lao vowel or tone mark."""
+    ok = True
+    for text in SYLLABLE_CASES:
+        chunks = chunk_text(text, target_seconds=1)
+        for chunk in chunks:
+            head, tail = chunk[0], chunk[-1]
+            if head in FOLLOWING_CHARS or unicodedata.category(head) == "Mn" or tail in LEADING_CHARS:
+                print(f"bad cut in {text[:12]}...: chunk {chunk[:12]!r}")
+                ok = False
+        if "".join(chunks) != text:
+            print(f"chunks of {text[:12]}... do not reassemble to the input")
+            ok = False
+    return ok
+
+
+def run(name: str, text: str, target: float, max_chars: int, repeat: int):
+    timings = []
+    chunks = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = chunk_text(text, target_seconds=target, max_chars=max_chars)
+        timings.append(time.perf_counter() - started)
+
+    durations = [estimate_duration(chunk) for chunk in chunks]
+    best = min(timings)
+    mean = statistics.mean(durations)
+    spread = statistics.pstdev(durations) / mean if len(durations) > 1 else 0.0
+    print(
+        f"{name:<10} {len(text):>10,} chars  {best * 1000:>9.1f} ms  "
+        f"{len(text) / best / 1e6:>6.2f} Mchar/s  {len(chunks):>6} chunks  "
+        f"audio {mean:>5.1f}s avg / {min(durations):>5.1f}-{max(durations):>5.1f}s  cv {spread:.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the duration-targeted text chunker")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000],
+                        help="Corpus sizes in characters")
+    parser.add_argument("--languages", nargs="+", default=["lao", "thai", "english", "mixed"],
+                        choices=["lao", "thai", "english", "mixed"], help="Synthetic corpora to run")
+    parser.add_argument("--corpus", type=Path, help="Benchmark a text file instead of synthetic corpora")
+    parser.add_argument("--target", type=float, default=20.0, help="Target seconds of speech per chunk")
+    parser.add_argument("--max-chars", type=int, default=3000, help="Maximum characters per chunk")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per corpus (best time is reported)")
+    args = parser.parse_args()
+
+    if not check_syllable_cuts():
+        sys.exit("syllable-safe cut check failed")
+    print("syllable-safe cuts: ok")
+
+    print(f"target {args.target}s per chunk, max {args.max_chars} chars")
+    if args.corpus:
+        run(args.corpus.name[:10], args.corpus.read_text(encoding="utf-8"), args.target, args.max_chars, args.repeat)
+        return
+
+    for language in args.languages:
+        for size in args.sizes:
+            run(language, build_corpus(language, size), args.target, args.max_chars, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
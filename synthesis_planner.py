@@ -0,0 +1,171 @@
+"""
+🗺️ Synthesis Planner
+วางแผนการสร้างเสียงหลายภาษาให้ใช้คำขอ Edge TTS น้อยที่สุด: รวมตัวเลข เครื่องหมายวรรคตอน
+และคำภาษาอื่นสั้นๆ เข้ากับส่วนข้างเคียงที่เสียงอ่านได้ แล้วรวมส่วนที่ใช้เสียงเดียวกันที่อยู่ติดกัน
+"""
+
+from typing import Callable, Dict, Any, List, Tuple, Iterable, Optional
+
+# ภาษาที่ไม่ต้องใช้เสียงเฉพาะ เสียงของทุกภาษาอ่านได้
+NEUTRAL_LANGUAGES = ("numbers", "punctuation")
+
+# ภาษาของเสียง -> ภาษาอื่นที่เสียงนั้นอ่านคำสั้นๆ ได้
+DEFAULT_FOLD_LANGUAGES = {
+    "lao": ("english",),
+    "thai": ("english",)
+}
+
+# ความยาวสูงสุด (ตัวอักษร) ของคำภาษาอื่นที่รวมเข้ากับส่วนข้างเคียงได้
+DEFAULT_SHORT_RUN_CHARS = 12
+
+
+class _PlannedSegment:
+    """ส่วนของแผน: ชิ้นข้อความที่สร้างด้วยเสียงและความเร็วเดียวกันในคำขอเดียว"""
+
+    __slots__ = ("parts", "language", "languages", "voice", "speed")
+
+    def __init__(self, text: str, language: str, voice: str, speed: float):
+        self.parts = [text]
+        self.language = language
+        self.languages = [language]
+        self.voice = voice
+        self.speed = speed
+
+    def append(self, text: str, language: str):
+        self.parts.append(_separator(self.parts[-1], text, language) + text)
+        if language not in self.languages:
+            self.languages.append(language)
+
+    def prepend(self, pieces: List[Tuple[str, str]]):
+        first_language = self.language
+        for text, language in reversed(pieces):
+            self.parts[0] = text + _separator(text, self.parts[0], first_language) + self.parts[0]
+            first_language = language
+            if language not in self.languages:
+                self.languages.append(language)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "text": "".join(self.parts),
+            "voice": self.voice,
+            "speed": self.speed,
+            "language": self.language,
+            "languages": self.languages
+        }
+
+
+def _separator(left: str, right: str, right_language: str) -> str:
+    """ช่องว่างระหว่างชิ้นข้อความที่นำมารวม (ตัวแยกส่วนภาษาตัดช่องว่างระหว่างส่วนทิ้งไป)"""
+    if right_language == "punctuation" or not left or not right or left[-1].isspace() or right[0].isspace():
+        return ""
+    return " "
+
+
+def plan_synthesis(segments: Iterable[Tuple[str, str]],
+                   voice_for_language: Callable[[str], str],
+                   speed_for_language: Callable[[str], float],
+                   fold_languages: Optional[Dict[str, Iterable[str]]] = None,
+                   short_run_chars: int = DEFAULT_SHORT_RUN_CHARS) -> Dict[str, Any]:
+    """
+    สร้างแผนการสร้างเสียงจากส่วนภาษา (ผลของ detect_language_segments)
+
+    Args:
+        segments: ลำดับ (ข้อความ, ภาษา)
+        voice_for_language: ฟังก์ชันเลือกเสียงของภาษา
+        speed_for_language: ฟังก์ชันเลือกความเร็วของภาษา
+        fold_languages: ภาษาของเสียง -> ภาษาที่เสียงนั้นอ่านคำสั้นๆ ได้ (None = DEFAULT_FOLD_LANGUAGES)
+        short_run_chars: ความยาวสูงสุดของคำภาษาอื่นที่รวมเข้ากับส่วนข้างเคียงได้
+
+    Returns:
+        Dict: {"segments": [{"text", "voice", "speed", "language", "languages"}, ...] ตามลำดับ,
+               "expected_requests": จำนวนคำขอ Edge TTS, "source_segments": จำนวนส่วนภาษาเดิม}
+    """
+    if fold_languages is None:
+        fold_languages = DEFAULT_FOLD_LANGUAGES
+    fold_languages = {language: set(others) for language, others in fold_languages.items()}
+    # ภาษาที่อาจถูกรวมเข้ากับส่วนอื่นได้ (ใช้ตัดสินใจชิ้นข้อความต้นเรื่อง)
+    foldable = set(NEUTRAL_LANGUAGES).union(*fold_languages.values())
+
+    planned: List[_PlannedSegment] = []
+    # ชิ้นข้อความต้นเรื่องที่ยังไม่มีส่วนหลักให้รวมด้วย
+    leading: List[Tuple[str, str]] = []
+    source_segments = 0
+
+    def can_fold(host_language: str, text: str, language: str) -> bool:
+        if language in NEUTRAL_LANGUAGES:
+            return True
+        return len(text.strip()) <= short_run_chars and language in fold_languages.get(host_language, ())
+
+    for text, language in segments:
+        if not text.strip():
+            continue
+        source_segments += 1
+
+        if planned and can_fold(planned[-1].language, text, language):
+            planned[-1].append(text, language)
+            continue
+        if not planned and language in foldable and (language in NEUTRAL_LANGUAGES or len(text.strip()) <= short_run_chars):
+            # รอดูส่วนหลักถัดไปก่อนตัดสินใจว่าจะรวมได้หรือไม่
+            leading.append((text, language))
+            continue
+
+        voice = voice_for_language(language)
+        speed = speed_for_language(language)
+        if leading:
+            if all(can_fold(language, piece, piece_language) for piece, piece_language in leading):
+                segment = _PlannedSegment(text, language, voice, speed)
+                segment.prepend(leading)
+                planned.append(segment)
+                leading = []
+                continue
+            planned.extend(_flush(leading, voice_for_language, speed_for_language))
+            leading = []
+
+        previous = planned[-1] if planned else None
+        if previous is not None and previous.voice == voice and previous.speed == speed:
+            # เสียงเดียวกันต่อเนื่องกัน (เช่น มีคำภาษาอื่นคั่นที่ถูกรวมไปแล้ว) ใช้คำขอเดียว
+            previous.append(text, language)
+        else:
+            planned.append(_PlannedSegment(text, language, voice, speed))
+
+    if leading:
+        planned.extend(_flush(leading, voice_for_language, speed_for_language))
+
+    plan = [segment.to_dict() for segment in planned]
+    return {
+        "segments": plan,
+        "expected_requests": len(plan),
+        "source_segments": source_segments
+    }
+
+
+def _flush(pieces: List[Tuple[str, str]], voice_for_language: Callable[[str], str],
+           speed_for_language: Callable[[str], float]) -> List[_PlannedSegment]:
+    """สร้างส่วนของแผนจากชิ้นข้อความที่รวมกับส่วนหลักไม่ได้ (ชิ้นที่เป็นกลางติดไปกับชิ้นก่อนหน้า)"""
+    planned: List[_PlannedSegment] = []
+    neutral: List[Tuple[str, str]] = []
+    for text, language in pieces:
+        if language in NEUTRAL_LANGUAGES:
+            if planned:
+                planned[-1].append(text, language)
+            else:
+                neutral.append((text, language))
+            continue
+        voice = voice_for_language(language)
+        speed = speed_for_language(language)
+        if planned and planned[-1].voice == voice and planned[-1].speed == speed:
+            planned[-1].append(text, language)
+            continue
+        segment = _PlannedSegment(text, language, voice, speed)
+        if neutral:
+            segment.prepend(neutral)
+            neutral = []
+        planned.append(segment)
+    if neutral:
+        # ข้อความทั้งหมดเป็นตัวเลข/เครื่องหมาย ใช้เสียงของภาษาแรก
+        text, language = neutral[0]
+        segment = _PlannedSegment(text, language, voice_for_language(language), speed_for_language(language))
+        for text, language in neutral[1:]:
+            segment.append(text, language)
+        planned.append(segment)
+    return planned
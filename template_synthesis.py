@@ -0,0 +1,114 @@
+"""
+🧩 Template Synthesis
+แยกข้อความแม่แบบ เช่น "Order {id} has shipped to {city}" เป็นส่วนคงที่และช่องที่เปลี่ยนค่า
+เสียงของส่วนคงที่สร้างครั้งเดียวต่อชุดเสียง/โมเดล RVC/พารามิเตอร์ แล้วเก็บเป็น PCM ไว้ใช้ซ้ำ
+"""
+
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+from render_store import RenderStore
+
+STATIC = "static"
+SLOT = "slot"
+
+
+def parse_template(template: str) -> List[Tuple[str, str]]:
+    """
+    แยกข้อความแม่แบบเป็นส่วนๆ ตามลำดับ (ใช้ {{ และ }} แทนวงเล็บปีกกาจริง)
+
+    Args:
+        template: ข้อความแม่แบบ
+
+    Returns:
+        List[Tuple[str, str]]: ลำดับของ (STATIC, ข้อความ) หรือ (SLOT, ชื่อช่อง)
+
+    Raises:
+        ValueError: วงเล็บไม่ครบคู่ หรือชื่อช่องไม่ถูกต้อง
+    """
+    parts = []
+    for literal, field, _, _ in Formatter().parse(template):
+        if literal:
+            parts.append((STATIC, literal))
+        if field is not None:
+            if not field.isidentifier():
+                raise ValueError(f"Invalid template slot: {{{field}}}")
+            parts.append((SLOT, field))
+    return parts
+
+
+def is_speakable(text: str) -> bool:
+    """ข้อความมีตัวอักษรหรือตัวเลขที่อ่านออกเสียงได้หรือไม่ (ส่วนที่มีแต่เครื่องหมายไม่ต้องสร้างเสียง)"""
+    return any(ch.isalnum() for ch in text)
+
+
+class FragmentCache:
+    """แคช PCM ของส่วนคงที่: หน่วยความจำแบบ LRU และดิสก์ผ่าน RenderStore"""
+
+    def __init__(self, root: str = "storage/cache/templates", max_entries: int = 512,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        """
+        เริ่มต้นแคช
+
+        Args:
+            root: โฟลเดอร์เก็บ PCM บนดิสก์ (None = ใช้หน่วยความจำอย่างเดียว)
+            max_entries: จำนวนส่วนคงที่สูงสุดในหน่วยความจำ
+            max_disk_bytes: ขนาดสูงสุดของ PCM บนดิสก์ (ไฟล์ที่ใช้ล่าสุดนานที่สุดถูกลบก่อน)
+        """
+        self.store = RenderStore(root, max_disk_bytes=max_disk_bytes) if root else None
+        self.max_entries = max(1, int(max_entries))
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, settings_key: str, text: str) -> Optional[np.ndarray]:
+        """ดึงเสียงของส่วนคงที่ (float32) หรือ None ถ้ายังไม่เคยสร้าง"""
+        key = (settings_key, RenderStore.unit_key(text))
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        audio = self.store.load_pcm(*key) if self.store else None
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, settings_key: str, text: str, audio: np.ndarray):
+        """เก็บเสียงของส่วนคงที่"""
+        key = (settings_key, RenderStore.unit_key(text))
+        if self.store:
+            self.store.save_pcm(*key, audio)
+        with self._lock:
+            self._remember(key, audio)
+
+    def _remember(self, key: Tuple[str, str], audio: np.ndarray):
+        self._memory[key] = audio
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """สถิติของแคช"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,256 @@
+"""
+✂️ Text Chunker
+แบ่งข้อความยาวเป็น chunk ตามความยาวเสียงพูดโดยประมาณ (ไม่ใช่จำนวนตัวอักษร)
+รองรับจุดแบ่งของภาษาไทย/ลาว (ช่องว่างระหว่างวลี, ฯ, ๆ, ๚) และจุดจบประโยคภาษาละติน
+ทำงานแบบ linear time: หาจุดแบ่งด้วย regex รอบเดียว แล้วเลือกจุดตัดแบบ greedy
+"""
+
+import re
+import unicodedata
+from typing import List, Tuple, Dict
+
+# ระดับของจุดแบ่ง: ยิ่งสูงยิ่งควรตัดตรงนั้น
+BREAK_FORCED = 0
+BREAK_WORD = 1
+BREAK_PHRASE = 2
+BREAK_SENTENCE = 3
+
+THAI_LAO = r"\u0E00-\u0EFF"
+
+# ลำดับของ alternative มีผล: จุดแบ่งที่แรงกว่าอยู่ก่อน
+BREAK_PATTERN = re.compile(
+    r"(?P<sentence>\s*\n\s*"
+    r"|[.!?…]+[\"'”’)\]]*(?:\s+|$)"
+    r"|[。！？]\s*"
+    r"|[\u0E5A\u0E5B]\s*)"
+    r"|(?P<phrase>[,;:，、]\s*"
+    r"|[\u0E2F\u0E46\u0EAF\u0EC6]\s+"
+    rf"|(?<=[{THAI_LAO}])\s+(?=[{THAI_LAO}]))"
+    r"|(?P<word>\s+)"
+)
+BREAK_STRENGTH = {"sentence": BREAK_SENTENCE, "phrase": BREAK_PHRASE, "word": BREAK_WORD}
+
+# เวลาหยุดหลังจุดแบ่งแต่ละระดับ (วินาที)
+BREAK_PAUSE = {BREAK_FORCED: 0.0, BREAK_WORD: 0.0, BREAK_PHRASE: 0.15, BREAK_SENTENCE: 0.35}
+
+# เวลาพูดโดยประมาณต่อตัวอักษรที่ความเร็ว 1.0 (วินาที) แยกตามประเภทตัวอักษร
+CHAR_SECONDS = {
+    "T": 0.065,   # พยัญชนะ/สระเต็มตัว ไทยและลาว
+    "M": 0.0,     # สระบน-ล่างและวรรณยุกต์ (combining mark) ไม่เพิ่มเวลา
+    "L": 0.07,    # ตัวอักษรละติน
+    "C": 0.22,    # อักษรจีน/ญี่ปุ่น
+    "D": 0.2,     # ตัวเลข (อ่านเป็นคำ)
+}
+OTHER_SECONDS = 0.02  # ช่องว่างและเครื่องหมายอื่นๆ
+
+# สระ/เครื่องหมายไทยและลาวที่ต้องอยู่ต่อท้ายพยัญชนะ (รวมตัวที่เป็น Lo เช่น สระอำ สระอา ๆ)
+FOLLOWING_CHARS = frozenset(
+    [chr(code) for code in range(0x0E30, 0x0E3B)]
+    + [chr(code) for code in range(0x0E45, 0x0E4F)]
+    + [chr(code) for code in range(0x0EB0, 0x0EBD)]
+    + [chr(code) for code in range(0x0EC6, 0x0ECE)]
+)
+# สระหน้า (เ แ โ ใ ไ และ ເ ແ ໂ ໃ ໄ) เขียนก่อนพยัญชนะ ห้ามตัดหลังสระเหล่านี้
+LEADING_CHARS = frozenset(
+    [chr(code) for code in range(0x0E40, 0x0E45)]
+    + [chr(code) for code in range(0x0EC0, 0x0EC5)]
+)
+# ระยะถอยหลังสูงสุดเพื่อหาจุดตัดระหว่างพยางค์ (ตัวอักษร)
+MAX_CLUSTER_CHARS = 8
+
+
+def _build_class_table() -> Dict[int, str]:
+    """ตาราง str.translate สำหรับแปลงตัวอักษรเป็นรหัสประเภท (ตัวอักษรอื่นคงเดิม)"""
+    table = {}
+    for code in range(0x0E00, 0x0F00):
+        table[code] = "M" if unicodedata.category(chr(code)) == "Mn" else "T"
+    for code in list(range(0x41, 0x5B)) + list(range(0x61, 0x7B)):
+        table[code] = "L"
+    for code in range(0x30, 0x3A):
+        table[code] = "D"
+    for code in list(range(0x3040, 0x3100)) + list(range(0x4E00, 0xA000)):
+        table[code] = "C"
+    return table
+
+
+CLASS_TABLE = _build_class_table()
+
+
+def estimate_duration(text: str, speed: float = 1.0) -> float:
+    """ประมาณความยาวเสียงพูดของข้อความ (วินาที) ที่ความเร็ว speed"""
+    return _classes_duration(text.translate(CLASS_TABLE)) / max(speed, 0.1)
+
+
+def _classes_duration(classes: str) -> float:
+    counted = 0
+    seconds = 0.0
+    for code, per_char in CHAR_SECONDS.items():
+        count = classes.count(code)
+        counted += count
+        seconds += count * per_char
+    return seconds + (len(classes) - counted) * OTHER_SECONDS
+
+
+def _can_cut(text: str, position: int) -> bool:
+    """ตัดก่อน text[position] ได้หรือไม่ โดยไม่แยกสระ/วรรณยุกต์ออกจากพยัญชนะ"""
+    if position < len(text):
+        char = text[position]
+        if char in FOLLOWING_CHARS or unicodedata.category(char) == "Mn":
+            return False
+    return position == 0 or text[position - 1] not in LEADING_CHARS
+
+
+def _safe_cut(text: str, position: int, start: int = 0) -> int:
+    """
+    เลื่อนจุดตัดกลางคำไปที่ขอบพยางค์ที่ใกล้ที่สุด
+
+    ถอยหลังก่อน (chunk ไม่ยาวเกินขีดจำกัด) ถ้าไม่เจอภายใน MAX_CLUSTER_CHARS ตัวหรือถึง start จึงเลื่อนไปข้างหน้า
+    """
+    for cut in range(position, max(start, position - MAX_CLUSTER_CHARS), -1):
+        if _can_cut(text, cut):
+            return cut
+    while position < len(text) and not _can_cut(text, position):
+        position += 1
+    return position
+
+
+def _pieces(text: str, classes: str, target_seconds: float, max_chars: int,
+            speed: float) -> List[Tuple[int, float, int]]:
+    """
+    แบ่งข้อความเป็นชิ้นระหว่างจุดแบ่ง
+
+    Returns:
+        List[(ตำแหน่งสิ้นสุด, เวลาพูดของชิ้นรวมช่วงหยุด, ระดับจุดแบ่งท้ายชิ้น)]
+    """
+    pieces = []
+    start = 0
+
+    def add(end: int, strength: int):
+        nonlocal start
+        duration = _classes_duration(classes[start:end]) / speed
+        # ชิ้นที่ไม่มีจุดแบ่งเลยแต่ยาวเกินเป้าหมาย/ขนาดสูงสุด ต้องตัดตรงกลางคำ
+        limit_chars = max_chars
+        if target_seconds > 0 and duration > target_seconds:
+            limit_chars = min(limit_chars, max(1, int((end - start) * target_seconds / duration)))
+        while end - start > limit_chars:
+            cut = _safe_cut(text, start + limit_chars, start)
+            if cut >= end:
+                break
+            pieces.append((cut, _classes_duration(classes[start:cut]) / speed, BREAK_FORCED))
+            start = cut
+        pieces.append((end, _classes_duration(classes[start:end]) / speed + BREAK_PAUSE[strength], strength))
+        start = end
+
+    for match in BREAK_PATTERN.finditer(text):
+        end = match.end()
+        if end > start:
+            add(end, BREAK_STRENGTH[match.lastgroup])
+    if start < len(text):
+        add(len(text), BREAK_SENTENCE)
+    return pieces
+
+
+def chunk_text(text: str, target_seconds: float = 20.0, max_chars: int = 3000,
+               speed: float = 1.0, min_fill: float = 0.5) -> List[str]:
+    """
+    แบ่งข้อความเป็น chunk ที่มีความยาวเสียงพูดใกล้เคียงกัน
+
+    Args:
+        text: ข้อความที่ต้องการแบ่ง
+        target_seconds: ความยาวเสียงเป้าหมายต่อ chunk (0 = ใช้ max_chars อย่างเดียว)
+        max_chars: จำนวนตัวอักษรสูงสุดต่อ chunk
+        speed: ความเร็วในการพูด (ใช้ประมาณเวลา)
+        min_fill: สัดส่วนขั้นต่ำของเป้าหมายที่ chunk ต้องมี ก่อนจะเลือกจุดแบ่งที่แรงกว่าแทนจุดแบ่งล่าสุด
+
+    Returns:
+        List[str]: รายการ chunk ตามลำดับ (ตัดช่องว่างหัวท้ายแล้ว)
+    """
+    if not text or not text.strip():
+        return []
+    speed = max(speed, 0.1)
+    max_chars = max(1, int(max_chars))
+    classes = text.translate(CLASS_TABLE)
+    pieces = _pieces(text, classes, target_seconds, max_chars, speed)
+
+    chunks = []
+    start = 0
+    duration = 0.0
+    last_start = 0
+    last_duration = 0.0
+    # จุดแบ่งล่าสุดของแต่ละระดับใน chunk ปัจจุบัน: ระดับ -> (ตำแหน่ง, เวลาพูดจากต้น chunk)
+    candidates: Dict[int, Tuple[int, float]] = {}
+
+    def over(end: int, total: float) -> bool:
+        return end - start > max_chars or (target_seconds > 0 and total > target_seconds)
+
+    def filled(position: int, at: float) -> bool:
+        return (target_seconds > 0 and at >= min_fill * target_seconds) or position - start >= min_fill * max_chars
+
+    for end, piece_duration, strength in pieces:
+        while candidates and over(end, duration + piece_duration):
+            # ตัดที่จุดแบ่งที่แรงที่สุดที่ทำให้ chunk ยาวพอ ถ้าไม่มีใช้จุดแบ่งล่าสุด
+            usable = [level for level, (position, at) in candidates.items() if filled(position, at)]
+            if usable:
+                cut, cut_at = candidates[max(usable)]
+            else:
+                cut, cut_at = max(candidates.values())
+            chunk = text[start:cut].strip()
+            if chunk:
+                chunks.append(chunk)
+                last_start, last_duration = start, cut_at
+            start = cut
+            duration -= cut_at
+            candidates = {
+                level: (position, at - cut_at)
+                for level, (position, at) in candidates.items() if position > cut
+            }
+        duration += piece_duration
+        candidates[strength] = (end, duration)
+
+    tail = text[start:].strip()
+    if tail:
+        # ส่วนท้ายที่สั้นมากรวมกับ chunk ก่อนหน้าถ้ายังไม่ยาวเกินไป
+        if (chunks and target_seconds > 0 and duration < min_fill * target_seconds
+                and last_duration + duration <= target_seconds * (1 + min_fill)
+                and len(text) - last_start <= max_chars):
+            chunks[-1] = text[last_start:].strip()
+        else:
+            chunks.append(tail)
+    return chunks
+
+
+def split_sentences(text: str, target_seconds: float = 0.0, max_chars: int = 3000,
+                    speed: float = 1.0) -> List[str]:
+    """
+    แบ่งข้อความเป็นประโยค โดยตัดเฉพาะที่จุดจบประโยค
+
+    ต่างจาก chunk_text ตรงที่ขอบเขตของแต่ละประโยคขึ้นกับข้อความของประโยคนั้นเท่านั้น
+    การแก้ไขประโยคหนึ่งจึงไม่ทำให้ขอบเขตของประโยคอื่นเลื่อน (ใช้กับการเรนเดอร์ใหม่เฉพาะส่วนที่แก้)
+
+    Args:
+        text: ข้อความที่ต้องการแบ่ง
+        target_seconds: ความยาวเสียงสูงสุดต่อประโยค ประโยคที่ยาวกว่าจะถูกแบ่งต่อด้วย chunk_text (0 = ไม่จำกัด)
+        max_chars: จำนวนตัวอักษรสูงสุดต่อประโยค
+        speed: ความเร็วในการพูด (ใช้ประมาณเวลา)
+
+    Returns:
+        List[str]: รายการประโยคตามลำดับ (ตัดช่องว่างหัวท้ายแล้ว)
+    """
+    sentences = []
+    start = 0
+
+    def add(end: int):
+        sentence = text[start:end].strip()
+        if not sentence:
+            return
+        if len(sentence) > max_chars or (target_seconds > 0 and estimate_duration(sentence, speed) > target_seconds):
+            sentences.extend(chunk_text(sentence, target_seconds=target_seconds, max_chars=max_chars, speed=speed))
+        else:
+            sentences.append(sentence)
+
+    for match in BREAK_PATTERN.finditer(text):
+        if match.lastgroup == "sentence":
+            add(match.end())
+            start = match.end()
+    add(len(text))
+    return sentences
@@ -0,0 +1,97 @@
+"""
+🔤 Language Segmenter
+แยกข้อความหลายภาษาเป็นส่วนๆ ตามช่วง Unicode ด้วย regex ที่คอมไพล์ไว้ครั้งเดียว
+สแกนข้อความรอบเดียว (linear time) และจำผลลัพธ์ของข้อความที่เพิ่งแยกไป
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+# ช่วงตัวอักษรของแต่ละภาษา
+LAO_RANGE = r"\u0E80-\u0EFF"
+THAI_RANGE = r"\u0E00-\u0E7F"
+CJK_RANGE = r"\u4E00-\u9FFF"
+KANA_RANGE = r"\u3040-\u309F\u30A0-\u30FF"
+
+# ลำดับของ alternative มีผล: ภาษาที่อยู่ก่อนจะถูกเลือกเมื่อหลายรูปแบบเริ่มที่ตำแหน่งเดียวกัน
+LANGUAGE_PATTERNS = {
+    'english': r'[a-zA-Z]+(?:\s+[a-zA-Z]+)*',
+    'lao': rf'[{LAO_RANGE}]+(?:\s+[{LAO_RANGE}]+)*',
+    'thai': rf'[{THAI_RANGE}]+(?:\s+[{THAI_RANGE}]+)*',
+    'chinese': rf'[{CJK_RANGE}]+(?:\s+[{CJK_RANGE}]+)*',
+    'japanese': rf'[{KANA_RANGE}{CJK_RANGE}]+(?:\s+[{KANA_RANGE}{CJK_RANGE}]+)*',
+    'numbers': r'\d+(?:\.\d+)?',
+    'punctuation': rf'[^\w\s{THAI_RANGE}{LAO_RANGE}{CJK_RANGE}{KANA_RANGE}]+'
+}
+
+SEGMENT_PATTERN = re.compile(
+    '|'.join(f'(?P<{language}>{pattern})' for language, pattern in LANGUAGE_PATTERNS.items())
+)
+LAO_CHAR = re.compile(f'[{LAO_RANGE}]')
+ENGLISH_CHAR = re.compile(r'[a-zA-Z]')
+
+# จำนวนข้อความที่จำผลการแยกไว้
+SEGMENT_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def segment_languages(text: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    แยกข้อความตามภาษา (ผลลัพธ์ถูกจำไว้ ข้อความเดียวกันจะไม่ถูกแยกซ้ำ)
+
+    ข้อความที่มีทั้งลาวและอังกฤษจะถูกแยกเป็นส่วนๆ ส่วนข้อความอื่นถือเป็นภาษาเดียวทั้งข้อความ
+
+    Args:
+        text: ข้อความที่ต้องการแยก
+
+    Returns:
+        Tuple[Tuple[str, str], ...]: ลำดับของ (ข้อความ, ภาษา) ที่รวมส่วนภาษาเดียวกันที่ติดกันแล้ว
+    """
+    if not text.strip():
+        return ()
+
+    has_lao = LAO_CHAR.search(text) is not None
+    has_english = ENGLISH_CHAR.search(text) is not None
+    if not (has_lao and has_english):
+        if has_lao:
+            return ((text, 'lao'),)
+        if has_english:
+            return ((text, 'english'),)
+        return ((text, 'unknown'),)
+
+    # แต่ละส่วนเก็บเป็นรายการชิ้นข้อความ แล้ว join ครั้งเดียวตอนจบ
+    segments: List[Tuple[List[str], str]] = []
+    leading_gap = ""
+    position = 0
+
+    def append(segment: str, language: str):
+        # รวมกับส่วนก่อนหน้าทันทีถ้าเป็นภาษาเดียวกัน
+        if segments and segments[-1][1] == language:
+            segments[-1][0].append(segment)
+        else:
+            segments.append(([segment], language))
+
+    for match in SEGMENT_PATTERN.finditer(text):
+        start = match.start()
+        if start > position:
+            gap = text[position:start]
+            if gap.strip():
+                # ข้อความที่ไม่ตรงรูปแบบใดใช้ภาษาของส่วนที่อยู่ติดกัน (ส่วนก่อนหน้า หรือส่วนถัดไปถ้าอยู่ต้นข้อความ)
+                if segments:
+                    append(gap, segments[-1][1])
+                else:
+                    leading_gap = gap
+        append(leading_gap + match.group(), match.lastgroup)
+        leading_gap = ""
+        position = match.end()
+
+    if not segments:
+        # ไม่เจอรูปแบบใดๆ ให้ถือว่าเป็นภาษาลาว
+        return ((text, 'lao'),)
+
+    remaining = text[position:]
+    if remaining.strip():
+        append(remaining, segments[-1][1])
+
+    return tuple(("".join(parts), language) for parts, language in segments)
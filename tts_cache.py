@@ -0,0 +1,212 @@
+"""
+💾 TTS Segment Cache
+แคชเสียง Edge TTS ระดับ segment (ข้อความ + เสียง + rate + pitch) ทั้งในหน่วยความจำและบนดิสก์
+"""
+
+import os
+import re
+import asyncio
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+logger = logging.getLogger("TTS_CACHE")
+
+# จำนวนการเขียนลงดิสก์ระหว่างการตรวจขนาดโฟลเดอร์แคช
+PRUNE_EVERY = 32
+
+
+def normalize_text(text: str) -> str:
+    """ทำให้ข้อความอยู่ในรูปมาตรฐานก่อนสร้าง key (Unicode NFC, ช่องว่างซ้ำ, ช่องว่างหัวท้าย)"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+class _OwnerCancelled(Exception):
+    """คำขอที่กำลังสร้างเสียงถูกยกเลิกก่อนได้ผล ผู้รอ key เดียวกันต้องลองใหม่เอง"""
+
+
+class TTSCache:
+    """แคชเสียง TTS แบบ content-addressed: LRU ในหน่วยความจำ + ไฟล์บนดิสก์"""
+
+    def __init__(self, max_memory_bytes: int = 64 * 1024 * 1024,
+                 disk_dir: Optional[str] = "storage/cache/tts",
+                 max_disk_bytes: int = 512 * 1024 * 1024, suffix: str = ".mp3"):
+        """
+        เริ่มต้นแคช
+
+        Args:
+            max_memory_bytes: ขนาดสูงสุดของแคชในหน่วยความจำ (0 = ปิด)
+            disk_dir: โฟลเดอร์แคชบนดิสก์ (None = ไม่ใช้ดิสก์)
+            max_disk_bytes: ขนาดสูงสุดของแคชบนดิสก์
+            suffix: นามสกุลไฟล์บนดิสก์ (".mp3" สำหรับเสียง Edge TTS, ".wav" สำหรับเสียงที่แปลงด้วย RVC)
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self.suffix = suffix
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._writes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "deduplicated": 0, "evictions": 0}
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, voice: str, rate: str, pitch: str) -> str:
+        """สร้าง key จากข้อความที่ normalize แล้ว เสียง rate และ pitch"""
+        payload = "\x1f".join([normalize_text(text), voice, rate, pitch])
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}{self.suffix}"
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        """ดึงเสียงจากแคชในหน่วยความจำ"""
+        with self._lock:
+            audio_data = self._memory.get(key)
+            if audio_data is not None:
+                self._memory.move_to_end(key)
+            return audio_data
+
+    def put_memory(self, key: str, audio_data: bytes):
+        """เก็บเสียงในหน่วยความจำ และไล่รายการเก่าออกเมื่อเกินขนาด"""
+        if len(audio_data) > self.max_memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            self._memory[key] = audio_data
+            self._memory_bytes += len(audio_data)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self.stats["evictions"] += 1
+
+    def read_disk(self, key: str) -> Optional[bytes]:
+        """อ่านเสียงจากแคชบนดิสก์ (อัปเดตเวลาเพื่อใช้เป็น LRU)"""
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            audio_data = path.read_bytes()
+            os.utime(path)
+            return audio_data
+        except OSError:
+            return None
+
+    def write_disk(self, key: str, audio_data: bytes):
+        """เขียนเสียงลงดิสก์แบบ atomic และตัดไฟล์เก่าเมื่อเกินขนาด"""
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = path.parent / f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            tmp_path.write_bytes(audio_data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache entry: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 0
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """ลบไฟล์ที่ใช้ล่าสุดนานที่สุดจนขนาดรวมไม่เกิน max_disk_bytes"""
+        if not self.disk_dir:
+            return
+        entries = []
+        for path in self.disk_dir.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+                self.stats["evictions"] += 1
+            except OSError:
+                continue
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        ดึงเสียงจากแคช หรือสร้างใหม่ครั้งเดียวแม้มีหลายคำขอ key เดียวกันพร้อมกัน
+
+        Args:
+            key: key ของ segment (จาก make_key)
+            factory: coroutine function ที่สร้างเสียงเมื่อไม่มีในแคช
+
+        Returns:
+            bytes: ข้อมูลเสียง
+        """
+        while True:
+            audio_data = self.get_memory(key)
+            if audio_data is not None:
+                self.stats["memory_hits"] += 1
+                return audio_data
+
+            # มีคำขอเดียวกันกำลังสร้างอยู่ รอผลร่วมกัน
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            self.stats["deduplicated"] += 1
+            try:
+                return await asyncio.shield(in_flight)
+            except _OwnerCancelled:
+                # เจ้าของถูกยกเลิก (ผู้รอเองไม่ได้ถูกยกเลิก) ลองใหม่ โดยอาจกลายเป็นเจ้าของเอง
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            audio_data = await asyncio.to_thread(self.read_disk, key)
+            if audio_data is not None:
+                self.stats["disk_hits"] += 1
+                self.put_memory(key, audio_data)
+                future.set_result(audio_data)
+            else:
+                self.stats["misses"] += 1
+                audio_data = await factory()
+                self.put_memory(key, audio_data)
+                # ส่งผลให้ผู้รอก่อนเขียนดิสก์ การยกเลิกระหว่างเขียนจึงไม่กระทบผู้รอ
+                future.set_result(audio_data)
+                await asyncio.to_thread(self.write_disk, key, audio_data)
+            return audio_data
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(_OwnerCancelled() if isinstance(e, asyncio.CancelledError) else e)
+                # ป้องกันคำเตือน "exception was never retrieved" เมื่อไม่มีผู้รอ
+                future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """สถิติของแคช"""
+        with self._lock:
+            memory_entries = len(self._memory)
+            memory_bytes = self._memory_bytes
+        lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_mb": round(memory_bytes / (1024 * 1024), 2),
+            "disk_dir": str(self.disk_dir) if self.disk_dir else None
+        }
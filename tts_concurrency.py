@@ -0,0 +1,364 @@
+"""
+🚦 Adaptive Concurrency Controller
+ควบคุมจำนวนคำขอ Edge TTS ที่ทำพร้อมกันแบบปรับตัวเอง (AIMD) ร่วมกันทุกคำขอ
+พร้อม token bucket จำกัดอัตราคำขอ, retry แบบ backoff + jitter และนโยบาย hedged request
+"""
+
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Callable, Awaitable, TypeVar, AsyncIterator
+
+logger = logging.getLogger("TTS_CONCURRENCY")
+
+T = TypeVar("T")
+
+# น้ำหนักของค่าเฉลี่ยเคลื่อนที่ของ latency
+LATENCY_ALPHA = 0.2
+
+
+class TokenBucket:
+    """token bucket จำกัดอัตราคำขอ (rate token ต่อวินาที สะสมได้สูงสุด burst token)"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """ลองหยิบ token หนึ่งตัว คืนเวลาที่ต้องรอ (0 = ได้ token แล้ว)"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return 0.0
+            return (1.0 - self.tokens) / self.rate
+
+    def try_acquire(self) -> bool:
+        """หยิบ token ทันทีถ้ามี (ไม่รอ)"""
+        return self.rate <= 0 or self._take() <= 0
+
+    async def acquire(self):
+        """รอจนได้ token (rate <= 0 = ไม่จำกัด)"""
+        if self.rate <= 0:
+            return
+        while True:
+            delay = self._take()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+
+class AdaptiveConcurrencyController:
+    """
+    ตัวควบคุมจำนวนงานพร้อมกันแบบ AIMD สำหรับ async callable ใดๆ
+
+    เพิ่ม limit ทีละน้อย (additive increase) เมื่องานสำเร็จและ latency ปกติ และลด limit
+    เป็นสัดส่วน (multiplicative decrease) เมื่อเกิดข้อผิดพลาดหรือ latency สูงผิดปกติ
+    """
+
+    def __init__(self, initial_limit: int = 2, min_limit: int = 1, max_limit: int = 8,
+                 adaptive: bool = True, decrease_factor: float = 0.7,
+                 latency_tolerance: float = 2.0, rate_per_s: float = 10.0, burst: float = 10.0,
+                 max_retries: int = 2, retry_base_s: float = 0.25, retry_max_s: float = 4.0):
+        """
+        เริ่มต้นตัวควบคุม
+
+        Args:
+            initial_limit: จำนวนงานพร้อมกันเริ่มต้น
+            min_limit: จำนวนงานพร้อมกันต่ำสุด
+            max_limit: จำนวนงานพร้อมกันสูงสุด
+            adaptive: ปรับ limit อัตโนมัติหรือไม่ (False = ใช้ initial_limit ตลอด)
+            decrease_factor: สัดส่วนที่คูณ limit เมื่อพบความแออัด
+            latency_tolerance: latency ต่อหน่วยงานที่เกินค่าต่ำสุดที่เคยพบกี่เท่าจึงถือว่าแออัด
+            rate_per_s: จำนวนคำขอสูงสุดต่อวินาที (0 = ไม่จำกัด)
+            burst: จำนวนคำขอที่ส่งติดกันได้ก่อนถูกจำกัดอัตรา
+            max_retries: จำนวนครั้งที่ลองใหม่เมื่อเกิดข้อผิดพลาด
+            retry_base_s: เวลารอพื้นฐานก่อนลองใหม่ (เพิ่มเป็นเท่าตัวทุกครั้ง)
+            retry_max_s: เวลารอสูงสุดก่อนลองใหม่
+        """
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(self.max_limit, max(self.min_limit, int(initial_limit))))
+        self.adaptive = adaptive
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.max_retries = max(0, int(max_retries))
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self.bucket = TokenBucket(rate_per_s, burst)
+
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+        self._last_decrease = 0.0
+        self.min_unit_latency: Optional[float] = None
+        self.avg_latency: Optional[float] = None
+        self.stats = {"successes": 0, "failures": 0, "retries": 0, "increases": 0, "decreases": 0}
+
+    async def _acquire_slot(self):
+        """รอจนจำนวนงานพร้อมกันต่ำกว่า limit"""
+        with self._lock:
+            if self.in_flight < int(self.limit) and not self._waiters:
+                self.in_flight += 1
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                    raise
+            # ได้ slot มาแล้วแต่ถูกยกเลิกพอดี ต้องคืน slot
+            # (ถ้า future ถูกยกเลิกก่อนได้ผล _resolve จะคืน slot ให้เอง)
+            if not future.cancelled():
+                self._release_slot()
+            raise
+
+    def _release_slot(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake_waiters()
+
+    def _wake_waiters(self):
+        """ปล่อยงานที่รออยู่ตามจำนวน slot ที่ว่าง (เรียกขณะถือ lock)"""
+        while self._waiters and self.in_flight < int(self.limit):
+            future = self._waiters.popleft()
+            self.in_flight += 1
+            # future อาจมาจาก event loop อื่น (core ใช้ร่วมกันหลาย loop ได้)
+            future.get_loop().call_soon_threadsafe(self._resolve, future)
+
+    def _resolve(self, future: asyncio.Future):
+        if not future.done():
+            future.set_result(None)
+        else:
+            # ผู้รอถูกยกเลิกไปแล้ว คืน slot ที่จองไว้ให้
+            self._release_slot()
+
+    def _on_success(self, latency: float, cost: float):
+        """อัปเดต limit หลังงานสำเร็จ"""
+        unit_latency = latency / max(1.0, cost)
+        with self._lock:
+            self.stats["successes"] += 1
+            self.avg_latency = latency if self.avg_latency is None else \
+                self.avg_latency + LATENCY_ALPHA * (latency - self.avg_latency)
+            if self.min_unit_latency is None or unit_latency < self.min_unit_latency:
+                self.min_unit_latency = unit_latency
+            if not self.adaptive:
+                return
+            if unit_latency > self.min_unit_latency * self.latency_tolerance:
+                self._decrease()
+            elif self.limit < self.max_limit:
+                # additive increase: เพิ่มประมาณ 1 ต่อ limit งานที่สำเร็จ
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.stats["increases"] += 1
+                self._wake_waiters()
+
+    def _on_failure(self):
+        with self._lock:
+            self.stats["failures"] += 1
+            if self.adaptive:
+                self._decrease()
+
+    def _decrease(self):
+        """multiplicative decrease ไม่เกินหนึ่งครั้งต่อช่วง latency เฉลี่ย (เรียกขณะถือ lock)"""
+        now = time.monotonic()
+        if now - self._last_decrease < (self.avg_latency or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        self.stats["decreases"] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        """เวลารอก่อนลองใหม่แบบ exponential backoff + full jitter"""
+        return random.uniform(0, min(self.retry_max_s, self.retry_base_s * (2 ** attempt)))
+
+    async def run(self, func: Callable[[], Awaitable[T]], cost: float = 1.0) -> T:
+        """
+        รันงานภายใต้การควบคุม concurrency, อัตราคำขอ และ retry
+
+        Args:
+            func: coroutine function ที่ไม่รับอาร์กิวเมนต์ (เรียกใหม่ทุกครั้งที่ลองใหม่)
+            cost: ขนาดของงาน (เช่น จำนวนตัวอักษร) ใช้ปรับ latency ให้เทียบกันได้
+
+        Returns:
+            ผลลัพธ์ของ func
+
+        Raises:
+            Exception: ข้อผิดพลาดครั้งสุดท้ายเมื่อลองครบ max_retries แล้ว
+        """
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            await self._acquire_slot()
+            started = time.monotonic()
+            try:
+                result = await func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._on_failure()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                attempt += 1
+                with self._lock:
+                    self.stats["retries"] += 1
+                logger.warning(f"TTS request failed ({e}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            else:
+                self._on_success(time.monotonic() - started, cost)
+                return result
+            finally:
+                self._release_slot()
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        ถือ slot และ token ตลอดช่วงของงาน streaming (ลองใหม่ไม่ได้เพราะส่งข้อมูลออกไปแล้ว)
+
+        ระยะเวลาของ stream ขึ้นกับความเร็วของผู้รับด้วย จึงไม่นำมาคิด latency ข้อผิดพลาดยังลด limit ตามปกติ
+        """
+        await self.bucket.acquire()
+        await self._acquire_slot()
+        try:
+            yield
+        except Exception:
+            self._on_failure()
+            raise
+        else:
+            with self._lock:
+                self.stats["successes"] += 1
+        finally:
+            self._release_slot()
+
+    def try_reserve(self) -> bool:
+        """
+        จอง slot และ token ทันทีถ้ามีว่าง (ไม่รอ และไม่แซงงานที่รอคิวอยู่)
+
+        ใช้กับงานที่ไม่จำเป็น เช่น คำขอซ้ำของ hedging ต้องคืน slot ด้วย release_reserved เมื่องานจบ
+        """
+        with self._lock:
+            if self.in_flight >= int(self.limit) or self._waiters:
+                return False
+            self.in_flight += 1
+        if not self.bucket.try_acquire():
+            self._release_slot()
+            return False
+        return True
+
+    def release_reserved(self, task: asyncio.Future):
+        """คืน slot ที่จองด้วย try_reserve (ใช้เป็น done callback ของ task จึงคืนได้แม้ task ถูกยกเลิกก่อนเริ่ม)"""
+        try:
+            if not task.cancelled():
+                if task.exception() is not None:
+                    self._on_failure()
+                else:
+                    with self._lock:
+                        self.stats["successes"] += 1
+        finally:
+            self._release_slot()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """ค่า limit ปัจจุบันและสถิติของตัวควบคุม"""
+        with self._lock:
+            return {
+                **self.stats,
+                "adaptive": self.adaptive,
+                "limit": int(self.limit),
+                "limit_exact": round(self.limit, 2),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "rate_per_s": self.bucket.rate,
+                "tokens": round(self.bucket.tokens, 2),
+                "avg_latency_s": round(self.avg_latency, 3) if self.avg_latency is not None else None
+            }
+
+
+class HedgingPolicy:
+    """
+    นโยบาย hedged request: ถ้าคำขอยังไม่ได้ chunk แรกภายในเวลาที่ percentile กำหนด
+    ให้ส่งคำขอซ้ำ โดยจำนวนคำขอซ้ำต้องไม่เกิน budget ของจำนวนคำขอทั้งหมด
+    """
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.05, min_delay_s: float = 0.3,
+                 min_samples: int = 20, window: int = 200):
+        """
+        เริ่มต้นนโยบาย
+
+        Args:
+            percentile: percentile ของเวลาถึง chunk แรกที่ใช้เป็นกำหนดเวลาส่งคำขอซ้ำ
+            budget: สัดส่วนคำขอซ้ำสูงสุดเทียบกับคำขอทั้งหมด (0.05 = 5%)
+            min_delay_s: กำหนดเวลาต่ำสุดก่อนส่งคำขอซ้ำ
+            min_samples: จำนวนตัวอย่างขั้นต่ำก่อนเริ่มส่งคำขอซ้ำ
+            window: จำนวนตัวอย่างล่าสุดที่ใช้คำนวณ percentile
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay_s = min_delay_s
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "hedges_throttled": 0}
+
+    def record_request(self):
+        with self._lock:
+            self.stats["requests"] += 1
+
+    def record_first_chunk(self, latency: float, hedged: bool):
+        """บันทึกเวลาถึง chunk แรกของคำขอที่ชนะ"""
+        with self._lock:
+            self._samples.append(latency)
+            if hedged:
+                self.stats["hedge_wins"] += 1
+
+    def deadline(self) -> Optional[float]:
+        """กำหนดเวลาก่อนส่งคำขอซ้ำ (None = ตัวอย่างยังไม่พอ ไม่ส่งคำขอซ้ำ)"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay_s, ordered[index])
+
+    def try_hedge(self) -> bool:
+        """จองสิทธิ์ส่งคำขอซ้ำหนึ่งครั้งถ้ายังอยู่ใน budget"""
+        with self._lock:
+            if self.stats["hedges"] + 1 > self.budget * self.stats["requests"]:
+                return False
+            self.stats["hedges"] += 1
+            return True
+
+    def cancel_hedge(self):
+        """คืนสิทธิ์ที่จองด้วย try_hedge เมื่อส่งคำขอซ้ำไม่ได้ (ตัวควบคุม concurrency ไม่มี slot หรือ token ว่าง)"""
+        with self._lock:
+            self.stats["hedges"] -= 1
+            self.stats["hedges_throttled"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """สถิติการส่งคำขอซ้ำ"""
+        deadline = self.deadline()
+        with self._lock:
+            requests = self.stats["requests"]
+            hedges = self.stats["hedges"]
+            return {
+                **self.stats,
+                "hedge_rate": round(hedges / requests, 4) if requests else 0.0,
+                "win_rate": round(self.stats["hedge_wins"] / hedges, 3) if hedges else 0.0,
+                "budget": self.budget,
+                "percentile": self.percentile,
+                "deadline_ms": round(deadline * 1000) if deadline is not None else None,
+                "samples": len(self._samples)
+            }
@@ -7,15 +7,98 @@ import os
 import sys
 import asyncio
 import re
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
-from typing import Optional, Dict, Any, List, Union, Tuple
+from typing import Optional, Dict, Any, List, Union, Tuple, AsyncIterator
 from model_utils import safe_model_processing, normalize_model_name
+from voice_catalog import VoiceCatalog, LANGUAGE_CODES
+from text_segmenter import segment_languages
+from synthesis_planner import plan_synthesis, DEFAULT_SHORT_RUN_CHARS
+from text_chunker import chunk_text, split_sentences
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("TTS_RVC_CORE")
 
+# แมปปิ้งภาษาไปยังเสียงหลัก (ถ้าไม่ระบุเสียงเฉพาะ)
+LANGUAGE_VOICE_MAPPING = {
+    'english': 'en-US-AriaNeural',
+    'lao': 'lo-LA-KeomanyNeural',      # เสียงผู้หญิงเป็นหลัก
+    'thai': 'th-TH-PremwadeeNeural',
+    'chinese': 'zh-CN-XiaoxiaoNeural',
+    'japanese': 'ja-JP-NanamiNeural'
+}
+
+# รหัสภาษาของ locale -> ชื่อภาษาที่ใช้ในระบบ
+LANGUAGE_NAMES = {code: name for name, code in LANGUAGE_CODES.items()}
+
+LAO_VOICES = (
+    'lo-LA-KeomanyNeural',      # ผู้หญิง - เสียงหลัก
+    'lo-LA-ChanthavongNeural'   # ผู้ชาย - เสียงรอง
+)
+
+VOICE_INFO = {
+    # เสียงภาษาลาว
+    'lo-LA-KeomanyNeural': {
+        'language': 'lao',
+        'gender': 'female',
+        'name_lao': 'ແກ້ວມະນີ',
+        'name_thai': 'แก้วมณี',
+        'description': 'เสียงผู้หญิงลาว นุ่มนวล เป็นธรรมชาติ',
+        'recommended_speed': 0.7
+    },
+    'lo-LA-ChanthavongNeural': {
+        'language': 'lao',
+        'gender': 'male',
+        'name_lao': 'ຈັນທະວົງ',
+        'name_thai': 'จันทวง',
+        'description': 'เสียงผู้ชายลาว แข็งแกร่ง ชัดเจน',
+        'recommended_speed': 0.7
+    },
+    # เสียงภาษาไทย
+    'th-TH-PremwadeeNeural': {
+        'language': 'thai',
+        'gender': 'female',
+        'name_thai': 'เปรมวดี',
+        'description': 'เสียงผู้หญิงไทย นุ่มนวล',
+        'recommended_speed': 0.8
+    },
+    'th-TH-NiwatNeural': {
+        'language': 'thai',
+        'gender': 'male',
+        'name_thai': 'นิวัฒน์',
+        'description': 'เสียงผู้ชายไทย แข็งแกร่ง',
+        'recommended_speed': 0.8
+    },
+    # เสียงภาษาอังกฤษ
+    'en-US-AriaNeural': {
+        'language': 'english',
+        'gender': 'female',
+        'description': 'American Female - Natural and expressive',
+        'recommended_speed': 1.0
+    },
+    'en-US-GuyNeural': {
+        'language': 'english',
+        'gender': 'male',
+        'description': 'American Male - Clear and confident',
+        'recommended_speed': 1.0
+    }
+}
+
+UNKNOWN_VOICE_INFO = {
+    'language': 'unknown',
+    'gender': 'unknown',
+    'description': 'Unknown voice',
+    'recommended_speed': 1.0
+}
+
+class RVCQueueFullError(Exception):
+    """คิวงานแปลงเสียง RVC เต็ม (มีงานค้างเกินกว่าที่ตั้งค่าไว้)"""
+    pass
+
 class TTSRVCCore:
     """ระบบหลักสำหรับ TTS และ RVC"""
     
@@ -43,10 +126,51 @@ class TTSRVCCore:
         # ตั้งค่า GPU
         self.setup_device(device, use_gpu, gpu_id)
         
+        # executor สำหรับงาน RVC (ไม่ให้ event loop ค้างระหว่าง inference)
+        self._setup_rvc_executor()
+        
         # สถานะของระบบ
         self.tts_available = False
         self.rvc_available = False
         self.rvc_instance = None
+        self.rvc_workers = None
+        
+        # แคชเสียง TTS ระดับ segment
+        self.tts_cache = None
+        if self.performance_config.get("tts_cache_enabled", True):
+            from tts_cache import TTSCache
+            self.tts_cache = TTSCache(
+                max_memory_bytes=self.performance_config.get("tts_cache_memory_mb", 64) * 1024 * 1024,
+                disk_dir=self.performance_config.get("tts_cache_dir", "storage/cache/tts") or None,
+                max_disk_bytes=self.performance_config.get("tts_cache_disk_mb", 512) * 1024 * 1024
+            )
+        
+        # แคชเสียงที่แปลงด้วย RVC (key จากเสียงต้นทาง + โมเดล + พารามิเตอร์)
+        self.rvc_cache = None
+        if self.performance_config.get("rvc_cache_enabled", False):
+            from tts_cache import TTSCache
+            self.rvc_cache = TTSCache(
+                max_memory_bytes=self.performance_config.get("rvc_cache_memory_mb", 64) * 1024 * 1024,
+                disk_dir=self.performance_config.get("rvc_cache_dir", "storage/cache/rvc") or None,
+                max_disk_bytes=self.performance_config.get("rvc_cache_disk_mb", 1024) * 1024 * 1024,
+                suffix=".wav"
+            )
+        # ชื่อโมเดลที่ผู้ใช้ส่งมา -> ชื่อโมเดลจริง (ไม่ต้องสแกนโฟลเดอร์โมเดลทุกครั้งที่แปลงเสียง)
+        self._rvc_model_keys: Dict[str, str] = {}
+        
+        # ที่เก็บการเรนเดอร์เอกสารยาว และแคช PCM ของส่วนคงที่ในข้อความแม่แบบ (สร้างเมื่อใช้ครั้งแรก)
+        self.render_store = None
+        self.template_cache = None
+        
+        # ตัวควบคุม concurrency ของคำขอ Edge TTS (ใช้ร่วมกันทุกคำขอ)
+        self._setup_tts_controller()
+        
+        # แคตตาล็อกเสียง Edge TTS (โหลดครั้งเดียว รีเฟรชเบื้องหลังตาม TTL)
+        self.voice_catalog = VoiceCatalog(
+            cache_path=self.performance_config.get("voice_catalog_path", "storage/cache/voices.json")
+            if self.performance_config.get("cache_tts_voices", True) else None,
+            ttl_seconds=self.performance_config.get("voice_catalog_ttl_s", 24 * 3600)
+        )
         
         # โหลดระบบ
         self._initialize_systems()
@@ -75,12 +199,15 @@ class TTSRVCCore:
             "tts_chunk_size": 5000,
             "tts_max_concurrent": 1,
             "rvc_batch_size": 1,
+            "rvc_batch_wait_ms": 20,
             "rvc_use_half_precision": True,
             "rvc_cache_models": True,
+            "rvc_max_workers": 1,
+            "rvc_max_queue": 8,
             "audio_sample_rate": 44100,
             "audio_chunk_duration": 10,
             "audio_use_soxr": True,
-            "use_multiprocessing": True,
+            "use_multiprocessing": False,
             "max_workers": 1,
             "memory_limit_gb": 2,
             "gpu_memory_fraction": 0.8,
@@ -88,6 +215,50 @@ class TTSRVCCore:
             "gpu_mixed_precision": True
         }
     
+    def _setup_rvc_executor(self):
+        """สร้าง executor สำหรับงาน RVC ตามจำนวน worker และความยาวคิวที่กำหนด"""
+        self.rvc_max_workers = max(1, int(self.performance_config.get("rvc_max_workers", 1)))
+        if self.performance_config.get("use_multiprocessing", False):
+            # ต้องมี thread รอผลอย่างน้อยเท่าจำนวน worker process
+            self.rvc_max_workers = max(self.rvc_max_workers, int(self.performance_config.get("max_workers", 1)))
+        else:
+            # micro-batch รวมงานได้สูงสุดเท่าจำนวน thread ที่รอพร้อมกัน
+            self.rvc_max_workers = max(self.rvc_max_workers, int(self.performance_config.get("rvc_batch_size", 1)))
+        self.rvc_max_queue = max(0, int(self.performance_config.get("rvc_max_queue", 8)))
+        self.rvc_executor = ThreadPoolExecutor(
+            max_workers=self.rvc_max_workers,
+            thread_name_prefix="rvc"
+        )
+        # จำกัดจำนวนงานทั้งหมด (กำลังประมวลผล + รอคิว)
+        self._rvc_slots = threading.BoundedSemaphore(self.rvc_max_workers + self.rvc_max_queue)
+        self._rvc_in_flight = 0
+        self._rvc_in_flight_lock = threading.Lock()
+    
+    def _setup_tts_controller(self):
+        """สร้างตัวควบคุม concurrency แบบ AIMD พร้อม token bucket และ retry สำหรับ Edge TTS"""
+        from tts_concurrency import AdaptiveConcurrencyController, HedgingPolicy
+        config = self.performance_config
+        self.tts_controller = AdaptiveConcurrencyController(
+            initial_limit=config.get("tts_max_concurrent", 1),
+            min_limit=config.get("tts_concurrency_min", 1),
+            max_limit=config.get("tts_concurrency_max", 8),
+            adaptive=config.get("tts_adaptive_concurrency", True),
+            rate_per_s=config.get("tts_rate_limit_per_s", 10),
+            burst=config.get("tts_rate_burst", 10),
+            max_retries=config.get("tts_max_retries", 2),
+            retry_base_s=config.get("tts_retry_base_ms", 250) / 1000,
+            retry_max_s=config.get("tts_retry_max_ms", 4000) / 1000
+        )
+        
+        # hedged request สำหรับลด tail latency (เปิดใช้เมื่อกำหนด tts_hedging)
+        self.tts_hedging = None
+        if config.get("tts_hedging", False):
+            self.tts_hedging = HedgingPolicy(
+                percentile=config.get("tts_hedge_percentile", 95),
+                budget=config.get("tts_hedge_budget", 0.05),
+                min_delay_s=config.get("tts_hedge_min_delay_ms", 300) / 1000
+            )
+    
     def setup_device(self, device: str = None, use_gpu: bool = True, gpu_id: int = 0):
         """
         ตั้งค่าอุปกรณ์ที่ใช้ประมวลผล
@@ -178,11 +349,40 @@ class TTSRVCCore:
             )
             self.rvc_available = True
             logger.info(f"✅ RVC system loaded on {self.device}")
+            
+            # worker process แยกสำหรับการแปลงเสียง (ถ้าเปิดใช้)
+            if self.performance_config.get("use_multiprocessing", False):
+                from rvc_workers import RVCWorkerPool
+                self.rvc_workers = RVCWorkerPool(
+                    num_workers=self.performance_config.get("max_workers", 1),
+                    models_dir=str(self.models_dir),
+                    device=self.device,
+                    performance_config=self.performance_config,
+                    threads_per_worker=self.performance_config.get("rvc_worker_threads"),
+                    models_per_worker=self.rvc_instance.cache_size_limit,
+                    affinity_max_delay=self.performance_config.get("rvc_affinity_max_delay_s", 2.0)
+                )
         except ImportError as e:
             logger.warning(f"⚠️ RVC system not available: {e}")
         except Exception as e:
             logger.warning(f"⚠️ RVC system initialization failed: {e}")
     
+    def shutdown(self):
+        """ปิดระบบและคืนทรัพยากร (โมเดล RVC, หน่วยความจำ GPU, ไฟล์ชั่วคราว)"""
+        if self.rvc_instance is not None:
+            try:
+                self.rvc_instance.cleanup()
+            except Exception as e:
+                logger.warning(f"RVC cleanup failed: {e}")
+        if self.rvc_workers is not None:
+            self.rvc_workers.shutdown()
+            self.rvc_workers = None
+        self.rvc_instance = None
+        self.rvc_available = False
+        self.rvc_executor.shutdown(wait=False, cancel_futures=True)
+        self.cleanup_temp_files()
+        logger.info("TTS-RVC Core shut down")
+    
     def get_system_status(self) -> Dict[str, Any]:
         """ดึงสถานะระบบ"""
         return {
@@ -190,7 +390,19 @@ class TTSRVCCore:
             "rvc_available": self.rvc_available,
             "device": self.device,
             "gpu_name": self.get_gpu_name(int(self.device.split(':')[-1])) if "cuda" in self.device and self.gpu_available else "CPU",
-            "rvc_models_count": len(self.get_available_rvc_models()) if self.rvc_available else 0
+            "rvc_models_count": len(self.get_available_rvc_models()) if self.rvc_available else 0,
+            "rvc_executor": {
+                "max_workers": self.rvc_max_workers,
+                "max_queue": self.rvc_max_queue,
+                "in_flight": self._rvc_in_flight
+            },
+            "rvc_workers": self.rvc_workers.get_status() if self.rvc_workers else None,
+            "tts_cache": self.tts_cache.get_stats() if self.tts_cache else None,
+            "rvc_cache": self.rvc_cache.get_stats() if self.rvc_cache else None,
+            "voice_catalog": self.voice_catalog.get_stats(),
+            "tts_concurrency": self.tts_controller.get_stats(),
+            "tts_hedging": self.tts_hedging.get_stats() if self.tts_hedging else None,
+            "template_cache": self.template_cache.get_stats() if self.template_cache else None
         }
     
     async def test_edge_tts_connection(self, voice: str = "th-TH-PremwadeeNeural") -> bool:
@@ -219,14 +431,9 @@ class TTSRVCCore:
             return False
     
     async def get_available_edge_voices(self) -> List[str]:
-        """ดึงรายชื่อ voice ที่มีใน Edge TTS"""
-        try:
-            import edge_tts
-            voices = await edge_tts.list_voices()
-            return [voice["ShortName"] for voice in voices]
-        except Exception as e:
-            logger.error(f"Error getting Edge TTS voices: {e}")
-            return []
+        """ดึงรายชื่อ voice ที่มีใน Edge TTS (จาก voice catalog)"""
+        await self.voice_catalog.ensure_loaded()
+        return self.voice_catalog.short_names()
     
     def get_available_rvc_models(self) -> List[str]:
         """ดึงรายชื่อโมเดล RVC ที่มีอยู่"""
@@ -268,8 +475,7 @@ class TTSRVCCore:
                 raise Exception("Text is empty or contains only whitespace")
             
             # ทำความสะอาดข้อความ - ลบอักขระควบคุมที่ไม่จำเป็น
-            cleaned_text = text.strip()
-            cleaned_text = ''.join(char for char in cleaned_text if ord(char) >= 32 or char in '\n\r\t')
+            cleaned_text = self._clean_text(text)
             
             if not cleaned_text:
                 raise Exception("Text is empty after cleaning")
@@ -278,21 +484,20 @@ class TTSRVCCore:
             if not voice or not voice.strip():
                 raise Exception("Voice is not specified")
             
-            # ตรวจสอบว่า voice มีอยู่จริงหรือไม่
-            try:
-                available_voices = await self.get_available_edge_voices()
-                if voice not in available_voices:
-                    logger.warning(f"Voice '{voice}' not found in available voices. Available voices: {available_voices[:5]}...")
-                    # ลองใช้ voice เริ่มต้น
-                    fallback_voice = "th-TH-PremwadeeNeural"
-                    if fallback_voice in available_voices:
-                        logger.info(f"Using fallback voice: {fallback_voice}")
-                        voice = fallback_voice
-                    else:
-                        raise Exception(f"Voice '{voice}' not available and no fallback voice found")
-            except Exception as voice_error:
-                logger.warning(f"Could not verify voice availability: {voice_error}")
+            # ตรวจสอบว่า voice มีอยู่จริงหรือไม่ (จาก voice catalog ไม่ต้องเรียก list_voices ทุกคำขอ)
+            await self.voice_catalog.ensure_loaded()
+            voice_valid = self.voice_catalog.is_valid(voice)
+            if voice_valid is None:
+                logger.warning("Could not verify voice availability: voice catalog is empty")
                 # ดำเนินการต่อโดยไม่ตรวจสอบ voice
+            elif not voice_valid:
+                # ลองใช้ voice เริ่มต้น
+                fallback_voice = "th-TH-PremwadeeNeural"
+                if self.voice_catalog.is_valid(fallback_voice):
+                    logger.warning(f"Voice '{voice}' not found in voice catalog, using fallback voice: {fallback_voice}")
+                    voice = fallback_voice
+                else:
+                    logger.warning(f"Voice '{voice}' not available and no fallback voice found")
             
             # ถ้าเปิดใช้งานหลายภาษา ให้แยกข้อความตามภาษา
             if enable_multi_language:
@@ -303,66 +508,36 @@ class TTSRVCCore:
                     # มีหลายภาษา ให้ประมวลผลแยกกัน
                     all_audio_data = []
                     
-                    # ใช้การตั้งค่าประสิทธิภาพ
-                    max_concurrent = self.performance_config.get("tts_max_concurrent", 1)
+                    # วางแผนให้ใช้คำขอน้อยที่สุด (รวมตัวเลข/เครื่องหมาย/คำสั้นๆ และส่วนที่ใช้เสียงเดียวกัน)
+                    plan = self.plan_multi_language_synthesis(language_segments, voice, speed)
+                    planned_segments = plan["segments"]
                     
-                    # กรอง segments ที่ไม่ต้องการ
-                    valid_segments = []
-                    for segment_text, language in language_segments:
-                        if not segment_text.strip():
-                            continue
-                        
-                        # ข้ามเครื่องหมายวรรคตอนเดี่ยวๆ
-                        if language == 'punctuation' and len(segment_text.strip()) <= 2:
-                            logger.debug(f"Skipping punctuation segment: '{segment_text}'")
-                            continue
-                        
-                        valid_segments.append((segment_text, language))
+                    # ส่งทุก segment พร้อมกัน จำนวนคำขอ Edge TTS ที่ทำจริงถูกจำกัดโดย tts_controller
+                    logger.info(f"Synthesis plan: {plan['expected_requests']} requests from {plan['source_segments']} segments (TTS concurrency limit={self.tts_controller.get_stats()['limit']})")
                     
-                    if max_concurrent > 1 and len(valid_segments) > 1:
-                        # ใช้ concurrent processing
-                        logger.info(f"Processing {len(valid_segments)} segments with max_concurrent={max_concurrent}")
-                        
-                        semaphore = asyncio.Semaphore(max_concurrent)
-                        
-                        async def process_segment(segment_text, language):
-                            async with semaphore:
-                                segment_voice = self.get_voice_for_language(language, voice)
-                                # ใช้ speed ที่เหมาะสมสำหรับแต่ละภาษา
-                                segment_speed = self.get_speed_for_language(language, speed)
-                                logger.info(f"Processing segment '{segment_text[:30]}...' with language '{language}' using voice '{segment_voice}' speed {segment_speed}")
-                                
-                                try:
-                                    segment_audio = await self._generate_single_tts(segment_text, segment_voice, segment_speed, pitch)
-                                    if segment_audio and len(segment_audio) > 0:
-                                        return segment_audio
-                                except Exception as e:
-                                    logger.warning(f"Failed to generate audio for segment '{segment_text}': {e}")
-                                    return None
-                        
-                        # รัน segments แบบ concurrent
-                        tasks = [process_segment(text, lang) for text, lang in valid_segments]
-                        results = await asyncio.gather(*tasks, return_exceptions=True)
+                    async def process_segment(segment: Dict[str, Any]):
+                        logger.info(f"Processing segment '{segment['text'][:30]}...' with languages {segment['languages']} using voice '{segment['voice']}' speed {segment['speed']}")
                         
-                        # รวบรวมผลลัพธ์
-                        for result in results:
-                            if isinstance(result, bytes) and len(result) > 0:
-                                all_audio_data.append(result)
-                    else:
-                        # ใช้ sequential processing
-                        for segment_text, language in valid_segments:
-                            segment_voice = self.get_voice_for_language(language, voice)
-                            # ใช้ speed ที่เหมาะสมสำหรับแต่ละภาษา
-                            segment_speed = self.get_speed_for_language(language, speed)
-                            logger.info(f"Processing segment '{segment_text[:30]}...' with language '{language}' using voice '{segment_voice}' speed {segment_speed}")
-                            
-                            try:
-                                segment_audio = await self._generate_single_tts(segment_text, segment_voice, segment_speed, pitch)
-                                if segment_audio and len(segment_audio) > 0:
-                                    all_audio_data.append(segment_audio)
-                            except Exception as e:
-                                logger.warning(f"Failed to generate audio for segment '{segment_text}': {e}")
-                                continue
+                        try:
+                            segment_audio = await self._generate_single_tts(segment["text"], segment["voice"], segment["speed"], pitch)
+                            if segment_audio and len(segment_audio) > 0:
+                                return segment_audio
+                        except Exception as e:
+                            logger.warning(f"Failed to generate audio for segment '{segment['text']}': {e}")
+                            return None
+                    
+                    if len(planned_segments) == 1:
+                        # ทั้งข้อความใช้คำขอเดียว ไม่ต้องรวมเสียง
+                        segment = planned_segments[0]
+                        return await self._generate_single_tts(segment["text"], segment["voice"], segment["speed"], pitch)
+                    
+                    tasks = [process_segment(segment) for segment in planned_segments]
+                    results = await asyncio.gather(*tasks, return_exceptions=True)
+                    
+                    # รวบรวมผลลัพธ์ตามลำดับ
+                    for result in results:
+                        if isinstance(result, bytes) and len(result) > 0:
+                            all_audio_data.append(result)
                     
                     # รวมเสียงทั้งหมด
                     if all_audio_data:
@@ -383,6 +558,11 @@ class TTSRVCCore:
             logger.error(f"TTS generation failed: {e}")
             raise Exception(f"TTS generation failed: {str(e)}")
     
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        """ตัดช่องว่างหัวท้ายและลบอักขระควบคุม (ยกเว้นขึ้นบรรทัดใหม่และ tab)"""
+        return ''.join(char for char in text.strip() if ord(char) >= 32 or char in '\n\r\t')
+    
     async def _generate_single_tts(self, text: str, voice: str, speed: float = 1.0, 
                                   pitch: str = "+0Hz") -> bytes:
         """
@@ -397,33 +577,132 @@ class TTSRVCCore:
         Returns:
             bytes: ข้อมูลเสียงในรูปแบบ bytes
         """
-        import edge_tts
-        
-        # ปรับ rate สำหรับ speed
-        if speed != 1.0:
-            rate = f"{speed:+.0%}"
-        else:
-            rate = "+0%"
+        if self.tts_cache is None:
+            return await self._synthesize_single_tts(text, voice, speed, pitch)
         
+        # ใช้แคช segment (segment ซ้ำในคำขอเดียวกันจะสร้างเพียงครั้งเดียว)
+        key = self.tts_cache.make_key(text, voice, self._edge_rate(speed), pitch)
+        return await self.tts_cache.get_or_create(
+            key, lambda: self._synthesize_single_tts(text, voice, speed, pitch)
+        )
+    
+    async def _synthesize_single_tts(self, text: str, voice: str, speed: float = 1.0,
+                                     pitch: str = "+0Hz") -> bytes:
+        """สร้างเสียงจาก Edge TTS โดยตรง (ไม่ผ่านแคช)"""
         logger.info(f"Generating single TTS: '{text[:50]}...' with voice '{voice}'")
         
+        async def synthesize() -> bytes:
+            if self.tts_hedging is not None:
+                return await self._synthesize_hedged(text, voice, speed, pitch)
+            # สร้างเสียง (เก็บเป็นรายการ chunk แล้วรวมครั้งเดียว)
+            audio_chunks = []
+            async for chunk in self._stream_edge_audio(text, voice, speed, pitch):
+                audio_chunks.append(chunk)
+            logger.info(f"Received {len(audio_chunks)} audio chunks")
+            return b"".join(audio_chunks)
+        
+        # จำกัด concurrency/อัตราคำขอร่วมกันทุกคำขอ และลองใหม่เมื่อล้มเหลว
+        audio_data = await self.tts_controller.run(synthesize, cost=len(text))
+        logger.info(f"Single TTS generated: {len(audio_data)} bytes")
+        return audio_data
+    
+    async def _synthesize_hedged(self, text: str, voice: str, speed: float = 1.0,
+                                 pitch: str = "+0Hz") -> bytes:
+        """
+        สร้างเสียงแบบ hedged request
+        
+        ถ้าคำขอแรกยังไม่ได้ chunk เสียงแรกภายในกำหนดเวลา (percentile ของเวลาถึง chunk แรก)
+        และยังอยู่ใน budget จะส่งคำขอซ้ำ แล้วใช้คำขอที่ได้ chunk แรกก่อนและยกเลิกอีกคำขอ
+        """
+        import time
+        
+        policy = self.tts_hedging
+        policy.record_request()
+        winner = asyncio.get_running_loop().create_future()
+        # เวลาถึง chunk แรกวัดจากเริ่มคำขอเสมอ (ถ้าวัดจากตอนส่งคำขอซ้ำ deadline จะลดลงเรื่อยๆ)
+        started = time.monotonic()
+        
+        async def attempt(index: int) -> bytes:
+            audio_chunks = []
+            async for chunk in self._stream_edge_audio(text, voice, speed, pitch):
+                if not audio_chunks and not winner.done():
+                    winner.set_result(index)
+                    policy.record_first_chunk(time.monotonic() - started, hedged=index > 0)
+                audio_chunks.append(chunk)
+            logger.info(f"Received {len(audio_chunks)} audio chunks")
+            return b"".join(audio_chunks)
+        
+        attempts = [asyncio.create_task(attempt(0))]
+        try:
+            deadline = policy.deadline()
+            if deadline is not None:
+                done, _ = await asyncio.wait({winner, attempts[0]}, timeout=deadline,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done and policy.try_hedge():
+                    # คำขอซ้ำต้องอยู่ใน limit และอัตราคำขอของ tts_controller เหมือนคำขออื่น ถ้าไม่ว่างทันทีก็ไม่ส่ง
+                    if self.tts_controller.try_reserve():
+                        logger.info(f"No audio after {deadline:.2f}s, sending hedged TTS request")
+                        hedge = asyncio.create_task(attempt(1))
+                        hedge.add_done_callback(self.tts_controller.release_reserved)
+                        attempts.append(hedge)
+                    else:
+                        policy.cancel_hedge()
+            
+            # รอจนมีคำขอที่ได้ chunk แรก หรือทุกคำขอจบ (ล้มเหลวก่อนได้เสียง)
+            while not winner.done():
+                live = [task for task in attempts if not task.done()]
+                if not live:
+                    break
+                await asyncio.wait({winner, *live}, return_when=asyncio.FIRST_COMPLETED)
+            
+            if winner.done():
+                chosen = attempts[winner.result()]
+                for task in attempts:
+                    if task is not chosen:
+                        task.cancel()
+                return await chosen
+            
+            # ไม่มีคำขอใดได้เสียง ส่งต่อข้อผิดพลาดของคำขอแรก
+            return await attempts[0]
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+            # ป้องกันคำเตือน "exception was never retrieved" ของคำขอที่แพ้
+            for task in attempts:
+                if task.done() and not task.cancelled():
+                    task.exception()
+    
+    async def _stream_edge_audio(self, text: str, voice: str, speed: float = 1.0,
+                                 pitch: str = "+0Hz") -> AsyncIterator[bytes]:
+        """
+        ส่งต่อ chunk เสียง MP3 จาก Edge TTS ทันทีที่ได้รับ
+        
+        Args:
+            text: ข้อความที่ต้องการแปลง
+            voice: เสียงที่ใช้
+            speed: ความเร็วในการพูด
+            pitch: ระดับเสียง
+            
+        Yields:
+            bytes: chunk เสียง MP3
+        """
+        import edge_tts
+        
         # สร้าง Communicate object
         communicate = edge_tts.Communicate(
             text=text,
             voice=voice,
-            rate=rate,
+            rate=self._edge_rate(speed),
             pitch=pitch
         )
         
-        # สร้างเสียง
-        audio_data = b""
-        chunk_count = 0
-        
+        received = False
         try:
             async for chunk in communicate.stream():
                 if chunk["type"] == "audio":
-                    audio_data += chunk["data"]
-                    chunk_count += 1
+                    received = True
+                    yield chunk["data"]
                 elif chunk["type"] == "WordBoundary":
                     logger.debug(f"Word boundary: {chunk}")
                 elif chunk["type"] == "SentenceBoundary":
@@ -432,15 +711,102 @@ class TTSRVCCore:
             logger.error(f"Error during streaming: {stream_error}")
             raise Exception(f"Streaming error: {str(stream_error)}")
         
-        logger.info(f"Received {chunk_count} audio chunks")
-        
         # ตรวจสอบว่าได้เสียงจริงหรือไม่
-        if not audio_data:
+        if not received:
             logger.error("No audio was received. Please verify that your parameters are correct.")
             raise Exception("No audio was received. Please verify that your parameters are correct.")
+    
+    @staticmethod
+    def _edge_rate(speed: float) -> str:
+        """แปลง speed เป็นค่า rate ของ Edge TTS"""
+        if speed != 1.0:
+            return f"{speed:+.0%}"
+        return "+0%"
+    
+    async def stream_tts(self, text: str, voice: str, speed: float = 1.0,
+                         pitch: str = "+0Hz", output_format: str = "mp3",
+                         sample_rate: int = 24000) -> AsyncIterator[bytes]:
+        """
+        สร้างเสียง TTS แบบ streaming ส่งเสียงออกทันทีที่ Edge TTS ส่งมา
         
-        logger.info(f"Single TTS generated: {len(audio_data)} bytes")
-        return audio_data
+        Args:
+            text: ข้อความที่ต้องการแปลง
+            voice: เสียงที่ใช้
+            speed: ความเร็วในการพูด
+            pitch: ระดับเสียง
+            output_format: "mp3" (ส่งต่อตรง) หรือ "pcm" (16-bit mono little-endian ผ่าน ffmpeg)
+            sample_rate: sample rate ของ PCM
+            
+        Yields:
+            bytes: chunk เสียงตามรูปแบบที่เลือก
+        """
+        if not self.tts_available:
+            raise Exception("TTS system not available")
+        
+        cleaned_text = self._clean_text(text or "")
+        if not cleaned_text:
+            raise Exception("Text is empty or contains only whitespace")
+        if not voice or not voice.strip():
+            raise Exception("Voice is not specified")
+        if output_format not in ("mp3", "pcm"):
+            raise Exception(f"Unsupported stream format: {output_format}")
+        
+        # stream ใช้ slot ของ tts_controller ตลอดการสร้างเสียง เหมือนคำขอ Edge TTS อื่นๆ
+        async with self.tts_controller.slot():
+            source = self._stream_edge_audio(cleaned_text, voice, speed, pitch)
+            if output_format == "pcm":
+                source = self._transcode_stream(source, sample_rate)
+            async for chunk in source:
+                yield chunk
+    
+    async def _transcode_stream(self, source: AsyncIterator[bytes], sample_rate: int = 24000,
+                                chunk_size: int = 4096) -> AsyncIterator[bytes]:
+        """
+        แปลง MP3 stream เป็น PCM 16-bit mono แบบต่อเนื่องผ่าน ffmpeg
+        
+        Args:
+            source: stream เสียง MP3
+            sample_rate: sample rate ของ PCM
+            chunk_size: ขนาด chunk ที่อ่านจาก ffmpeg
+            
+        Yields:
+            bytes: chunk เสียง PCM
+        """
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-f", "mp3", "-i", "pipe:0",
+            "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        
+        async def feed():
+            try:
+                async for chunk in source:
+                    process.stdin.write(chunk)
+                    await process.stdin.drain()
+            finally:
+                process.stdin.close()
+        
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                data = await process.stdout.read(chunk_size)
+                if not data:
+                    break
+                yield data
+            await feeder
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            await process.wait()
     
     def _combine_audio_segments(self, audio_segments: List[bytes]) -> bytes:
         """
@@ -508,11 +874,76 @@ class TTSRVCCore:
             # ถ้าไม่สามารถรวมได้ ให้ส่งคืนส่วนแรก
             return audio_segments[0] if audio_segments else b""
     
+    @staticmethod
+    def _decode_audio_bytes(audio_data: bytes) -> Tuple["np.ndarray", int]:
+        """
+        ถอดรหัสข้อมูลเสียง (MP3/WAV/...) ในหน่วยความจำเป็น numpy array แบบ mono
+        
+        Args:
+            audio_data: ข้อมูลเสียงในรูปแบบ bytes
+            
+        Returns:
+            Tuple[np.ndarray, int]: (ตัวอย่างเสียง float32 ช่วง -1..1, sample rate)
+        """
+        import io
+        import numpy as np
+        import soundfile as sf
+        
+        try:
+            # libsndfile อ่าน WAV/FLAC/OGG (และ MP3 ในเวอร์ชันใหม่) ได้โดยไม่ต้องเรียก ffmpeg
+            audio_array, sample_rate = sf.read(io.BytesIO(audio_data), dtype='float32')
+        except Exception as sf_error:
+            logger.debug(f"soundfile could not decode audio, falling back to pydub: {sf_error}")
+            from pydub import AudioSegment
+            
+            # Edge TTS ส่งมาเป็น MP3
+            audio_segment = AudioSegment.from_file(io.BytesIO(audio_data))
+            samples = np.array(audio_segment.get_array_of_samples())
+            if audio_segment.channels > 1:
+                samples = samples.reshape((-1, audio_segment.channels))
+            scale = float(1 << (8 * audio_segment.sample_width - 1))
+            audio_array = samples.astype(np.float32) / scale
+            sample_rate = audio_segment.frame_rate
+        
+        # แปลงเป็น mono ถ้าเป็น stereo
+        if audio_array.ndim > 1:
+            audio_array = np.mean(audio_array, axis=1)
+        
+        # ตรวจสอบและแก้ไขข้อมูลเสียง
+        if np.isnan(audio_array).any():
+            audio_array = np.nan_to_num(audio_array, nan=0.0)
+        
+        return audio_array.astype(np.float32, copy=False), int(sample_rate)
+    
+    @classmethod
+    def _decode_resampled(cls, audio_data: bytes, sample_rate: int) -> "np.ndarray":
+        """
+        ถอดรหัสเสียงและแปลง sample rate เป็น sample_rate (งาน CPU ที่บล็อก ควรเรียกผ่าน asyncio.to_thread)
+        
+        Returns:
+            np.ndarray: ตัวอย่างเสียง float32 mono ที่ sample_rate
+        """
+        audio_array, audio_sr = cls._decode_audio_bytes(audio_data)
+        if audio_sr != sample_rate:
+            import soxr
+            audio_array = soxr.resample(audio_array, audio_sr, sample_rate)
+        return audio_array
+    
+    @staticmethod
+    def _encode_wav_bytes(audio_array: "np.ndarray", sample_rate: int) -> bytes:
+        """เข้ารหัส numpy array เป็นไฟล์ WAV (PCM 16-bit) ในหน่วยความจำ"""
+        import io
+        import soundfile as sf
+        
+        output_io = io.BytesIO()
+        sf.write(output_io, audio_array, sample_rate, format='WAV', subtype='PCM_16')
+        return output_io.getvalue()
+    
     def convert_voice(self, audio_data: bytes, model_name: str, 
                      transpose: int = 0, index_ratio: float = 0.75,
                      f0_method: str = "rmvpe") -> bytes:
         """
-        แปลงเสียงด้วย RVC
+        แปลงเสียงด้วย RVC (ประมวลผลในหน่วยความจำทั้งหมด ไม่มีไฟล์ชั่วคราว)
         
         Args:
             audio_data: ข้อมูลเสียงที่ต้องการแปลง
@@ -522,150 +953,149 @@ class TTSRVCCore:
             f0_method: วิธีการคำนวณ f0
             
         Returns:
-            bytes: ข้อมูลเสียงที่แปลงแล้ว
+            bytes: ข้อมูลเสียงที่แปลงแล้ว (WAV)
         """
         if not self.rvc_available:
             raise Exception("RVC system not available")
         
         try:
-            # สร้างชื่อไฟล์ที่ไม่ซ้ำกัน
-            import time
-            timestamp = int(time.time() * 1000)
-            temp_input = self.temp_dir / f"rvc_input_{timestamp}.wav"
-            temp_output = self.temp_dir / f"rvc_output_{timestamp}.wav"
-            
-            # แปลงไฟล์เสียงให้เป็นรูปแบบ WAV ที่ถูกต้อง
+            # ถอดรหัสเสียงในหน่วยความจำ
             try:
-                import io
-                import soundfile as sf
-                import numpy as np
-                from pydub import AudioSegment
-                
-                # ลองอ่านเป็น MP3 ก่อน (Edge TTS ส่งมาเป็น MP3)
-                try:
-                    # แปลง MP3 เป็น WAV โดยใช้ pydub
-                    audio_io = io.BytesIO(audio_data)
-                    audio_segment = AudioSegment.from_mp3(audio_io)
-                    
-                    # แปลงเป็น numpy array
-                    samples = np.array(audio_segment.get_array_of_samples())
-                    
-                    # ถ้าเป็น stereo ให้แปลงเป็น mono
-                    if audio_segment.channels == 2:
-                        samples = samples.reshape((-1, 2))
-                        samples = np.mean(samples, axis=1)
-                    
-                    # Normalize audio
-                    samples = samples.astype(np.float32) / 32768.0
-                    
-                    # บันทึกเป็น WAV
-                    sf.write(str(temp_input), samples, audio_segment.frame_rate, format='WAV', subtype='PCM_16')
-                    
-                    logger.info(f"Converted MP3 to WAV: {temp_input} (sample_rate={audio_segment.frame_rate})")
-                    
-                except Exception as mp3_error:
-                    logger.debug(f"Not MP3 format or pydub conversion failed: {mp3_error}")
-                    
-                    # ถ้าไม่ใช่ MP3 ให้ลองอ่านเป็น WAV โดยตรง
-                    audio_io = io.BytesIO(audio_data)
-                    audio_array, sample_rate = sf.read(audio_io)
-                    
-                    # แปลงเป็น mono ถ้าเป็น stereo
-                    if len(audio_array.shape) > 1:
-                        audio_array = np.mean(audio_array, axis=1)
-                    
-                    # ตรวจสอบและแก้ไขข้อมูลเสียง
-                    if np.isnan(audio_array).any():
-                        audio_array = np.nan_to_num(audio_array, nan=0.0)
-                    
-                    # บันทึกเป็นไฟล์ WAV ที่ถูกต้อง
-                    sf.write(str(temp_input), audio_array, sample_rate, format='WAV', subtype='PCM_16')
-                    
-                    logger.info(f"Saved audio as WAV: {temp_input} (sample_rate={sample_rate})")
-                
+                audio_array, sample_rate = self._decode_audio_bytes(audio_data)
             except Exception as conversion_error:
-                logger.error(f"Failed to convert audio format: {conversion_error}")
-                
-                # ถ้าแปลงไม่ได้เลย ให้ลองบันทึกเป็นไฟล์ชั่วคราวและใช้ ffmpeg
-                temp_mp3 = self.temp_dir / f"temp_{timestamp}.mp3"
-                with open(temp_mp3, "wb") as f:
-                    f.write(audio_data)
-                
-                # ใช้ ffmpeg แปลงเป็น WAV
-                import subprocess
-                ffmpeg_cmd = [
-                    "ffmpeg", "-y", "-i", str(temp_mp3),
-                    "-acodec", "pcm_s16le", "-ar", "44100", "-ac", "1",
-                    str(temp_input)
-                ]
-                
-                result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    logger.error(f"FFmpeg conversion failed: {result.stderr}")
-                    raise Exception(f"Audio format conversion failed: {result.stderr}")
-                
-                # ลบไฟล์ MP3 ชั่วคราว
-                temp_mp3.unlink(missing_ok=True)
-                logger.info(f"Converted audio using FFmpeg: {temp_input}")
-            
-            # ตรวจสอบว่าไฟล์ถูกสร้างขึ้นหรือไม่
-            if not temp_input.exists():
-                raise Exception("Failed to create input audio file")
+                logger.error(f"Failed to decode audio: {conversion_error}")
+                raise Exception(f"Audio format conversion failed: {conversion_error}")
             
-            # ตรวจสอบขนาดไฟล์
-            file_size = temp_input.stat().st_size
-            if file_size == 0:
-                raise Exception("Input audio file is empty")
+            if audio_array.size == 0:
+                raise Exception("Input audio is empty")
             
-            logger.info(f"Created input file: {temp_input} ({file_size} bytes)")
+            logger.info(f"Decoded input audio: {audio_array.size} samples (sample_rate={sample_rate})")
             
-            # แปลงเสียง
-            result_path = self.rvc_instance.convert_voice(
-                input_path=str(temp_input),
-                output_path=str(temp_output),
+            # แปลงเสียง (ใน worker process ถ้าเปิดใช้ ไม่เช่นนั้นใน process นี้)
+            if self.rvc_workers:
+                # ใช้ชื่อโมเดลที่ resolve แล้ว เพื่อให้ชื่อเรียกต่างกันของโมเดลเดียวกันไปที่ worker เดียวกัน
+                resolved_model, _ = safe_model_processing(model_name, self.get_available_rvc_models())
+                model_name = resolved_model or model_name
+                converter = self.rvc_workers.convert_array
+            else:
+                converter = self.rvc_instance.convert_voice_array
+            result = converter(
+                audio_array,
+                sample_rate,
                 model_name=model_name,
-                transpose=transpose,
-                index_ratio=index_ratio,
+                pitch=transpose,
+                index_rate=index_ratio,
                 f0_method=f0_method
             )
             
             # ตรวจสอบว่าการแปลงสำเร็จหรือไม่
-            if result_path is None:
-                raise Exception("RVC conversion failed - no output path returned")
-            
-            # ตรวจสอบว่าไฟล์ผลลัพธ์ถูกสร้างขึ้นหรือไม่
-            if not Path(result_path).exists():
-                raise Exception(f"RVC output file not found: {result_path}")
+            if result is None:
+                raise Exception("RVC conversion failed - no audio returned")
             
-            # อ่านผลลัพธ์
-            with open(result_path, "rb") as f:
-                converted_audio = f.read()
+            converted_array, tgt_sr = result
+            if converted_array is None or len(converted_array) == 0:
+                raise Exception("RVC output audio is empty")
             
-            if len(converted_audio) == 0:
-                raise Exception("RVC output file is empty")
-            
-            # ลบไฟล์ชั่วคราว
-            try:
-                temp_input.unlink(missing_ok=True)
-                if Path(result_path) != temp_output:
-                    Path(result_path).unlink(missing_ok=True)
-                temp_output.unlink(missing_ok=True)
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to cleanup temp files: {cleanup_error}")
+            converted_audio = self._encode_wav_bytes(converted_array, tgt_sr)
             
             logger.info(f"Voice conversion completed: {len(converted_audio)} bytes")
             return converted_audio
             
         except Exception as e:
             logger.error(f"Voice conversion failed: {e}")
-            # ลบไฟล์ชั่วคราวในกรณี error
-            try:
-                temp_input.unlink(missing_ok=True)
-                temp_output.unlink(missing_ok=True)
-            except:
-                pass
             raise Exception(f"Voice conversion failed: {str(e)}")
     
+    async def _resolve_rvc_model(self, model_name: Any) -> Tuple[Optional[str], Optional[str]]:
+        """
+        หาชื่อโมเดล RVC จริงจากชื่อที่ผู้ใช้ส่งมา โดยไม่บล็อก event loop
+        
+        สแกนโฟลเดอร์โมเดลใน thread เฉพาะชื่อที่ยังไม่เคยพบ ชื่อที่ resolve แล้วถูกจำไว้
+        
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (ชื่อโมเดล หรือ None, ข้อความผิดพลาด) แบบเดียวกับ safe_model_processing
+        """
+        cacheable = isinstance(model_name, str)
+        resolved_model = self._rvc_model_keys.get(model_name) if cacheable else None
+        if resolved_model is not None:
+            return resolved_model, None
+        available = await asyncio.to_thread(self.get_available_rvc_models)
+        resolved_model, model_error = safe_model_processing(model_name, available)
+        if resolved_model and model_error is None and cacheable:
+            # เก็บเฉพาะชื่อที่มีโมเดลจริง จำนวนจึงไม่เกินจำนวนโมเดล
+            self._rvc_model_keys[model_name] = resolved_model
+        return resolved_model, model_error
+    
+    async def convert_voice_async(self, audio_data: bytes, model_name: str,
+                                  transpose: int = 0, index_ratio: float = 0.75,
+                                  f0_method: str = "rmvpe", background: bool = False) -> bytes:
+        """
+        แปลงเสียงด้วย RVC ผ่าน executor โดยไม่บล็อก event loop
+        
+        Args:
+            audio_data: ข้อมูลเสียงที่ต้องการแปลง
+            model_name: ชื่อโมเดล RVC
+            transpose: การขยับ pitch (-12 ถึง 12)
+            index_ratio: อัตราส่วน index (0.0-1.0)
+            f0_method: วิธีการคำนวณ f0
+            background: งานเบื้องหลัง (เช่น pre-warm) ส่งได้เฉพาะเมื่อยังเหลือ worker ว่างให้คำขอจริงอย่างน้อยหนึ่งตัว
+            
+        Returns:
+            bytes: ข้อมูลเสียงที่แปลงแล้ว (WAV)
+            
+        Raises:
+            RVCQueueFullError: เมื่อมีงานค้างในคิวเกินกว่าที่กำหนด หรืองานเบื้องหลังไม่มี worker ว่าง
+        """
+        if self.rvc_cache is None:
+            return await self._submit_conversion(audio_data, model_name, transpose, index_ratio, f0_method,
+                                                 background)
+        
+        # เสียงต้นทางเดียวกัน (เช่น จากแคช TTS) กับโมเดลและพารามิเตอร์เดียวกัน ได้ผลลัพธ์เดิม
+        resolved_model, _ = await self._resolve_rvc_model(model_name)
+        key = self.rvc_cache.make_key(
+            hashlib.sha1(audio_data).hexdigest(),
+            resolved_model or model_name,
+            f"{transpose}:{index_ratio}",
+            f0_method
+        )
+        return await self.rvc_cache.get_or_create(
+            key, lambda: self._submit_conversion(audio_data, model_name, transpose, index_ratio, f0_method,
+                                                 background)
+        )
+    
+    async def _submit_conversion(self, audio_data: bytes, model_name: str, transpose: int,
+                                 index_ratio: float, f0_method: str, background: bool = False) -> bytes:
+        """ส่งงานแปลงเสียงเข้า executor ของ RVC (ไม่ผ่านแคช)"""
+        if not self._rvc_slots.acquire(blocking=False):
+            raise RVCQueueFullError(
+                f"RVC queue is full ({self.rvc_max_workers} running, {self.rvc_max_queue} queued)"
+            )
+        
+        with self._rvc_in_flight_lock:
+            # ตรวจพร้อมกับการนับงาน เพื่อให้งานเบื้องหลังไม่แย่ง worker ตัวสุดท้ายของคำขอจริง
+            idle = not background or self._rvc_in_flight + 1 < self.rvc_max_workers
+            if idle:
+                self._rvc_in_flight += 1
+        if not idle:
+            self._rvc_slots.release()
+            raise RVCQueueFullError("No idle RVC worker for background conversion")
+        
+        def _release(_future):
+            # คืน slot เมื่องานเสร็จจริง (แม้ผู้เรียกจะยกเลิกการรอไปแล้ว)
+            with self._rvc_in_flight_lock:
+                self._rvc_in_flight -= 1
+            self._rvc_slots.release()
+        
+        try:
+            future = self.rvc_executor.submit(
+                self.convert_voice, audio_data, model_name,
+                transpose, index_ratio, f0_method
+            )
+        except Exception:
+            _release(None)
+            raise
+        future.add_done_callback(_release)
+        return await asyncio.wrap_future(future)
+    
     async def process_unified(self, text: str, tts_voice: str, 
                             enable_rvc: bool = False, rvc_model: str = None,
                             tts_speed: float = 1.0, tts_pitch: str = "+0Hz",
@@ -709,7 +1139,8 @@ class TTSRVCCore:
             
             # เพิ่มข้อมูลการตรวจจับภาษา
             if enable_multi_language:
-                language_segments = self.detect_language_segments(text)
+                # ใช้ข้อความเดียวกับ generate_tts เพื่อใช้ผลการแยกที่จำไว้แล้ว
+                language_segments = self.detect_language_segments(self._clean_text(text))
                 result["stats"]["language_segments"] = len(language_segments)
                 result["stats"]["detected_languages"] = list(set(lang for _, lang in language_segments))
                 
@@ -725,6 +1156,9 @@ class TTSRVCCore:
                         "speed": speed
                     })
                 result["stats"]["language_segments_detail"] = language_segments_detail
+                result["stats"]["tts_requests"] = self.plan_multi_language_synthesis(
+                    language_segments, tts_voice, tts_speed
+                )["expected_requests"] if len(language_segments) > 1 else 1
                 
                 logger.info(f"Detected languages: {result['stats']['detected_languages']}")
                 logger.info(f"Language segments: {len(language_segments)} segments")
@@ -762,7 +1196,7 @@ class TTSRVCCore:
                     else:
                         logger.info(f"Step 2: Applying voice conversion with model '{rvc_model}'...")
                         try:
-                            converted_audio = self.convert_voice(
+                            converted_audio = await self.convert_voice_async(
                                 tts_audio, rvc_model, rvc_transpose, 
                                 rvc_index_ratio, rvc_f0_method
                             )
@@ -807,140 +1241,669 @@ class TTSRVCCore:
             })
             return result
     
-    def smart_chunk_text(self, text: str, max_chunk_size: int = 8000) -> List[str]:
+    def smart_chunk_text(self, text: str, max_chunk_size: int = 8000,
+                         target_seconds: float = None, speed: float = 1.0) -> List[str]:
         """
-        แบ่งข้อความอย่างชาญฉลาด เพื่อไม่ให้เกินขีดจำกัดของ TTS
+        แบ่งข้อความอย่างชาญฉลาด ตามความยาวเสียงพูดโดยประมาณ และไม่ให้เกินขีดจำกัดของ TTS
+        
+        ตัดที่จุดจบประโยค (รวมถึง ๚ ฯ ๆ และช่องว่างระหว่างวลีของภาษาไทย/ลาว) ก่อนตัดกลางคำ
         
         Args:
             text: ข้อความที่ต้องการแบ่ง
-            max_chunk_size: ขนาดสูงสุดของแต่ละส่วน
+            max_chunk_size: ขนาดสูงสุดของแต่ละส่วน (ตัวอักษร)
+            target_seconds: ความยาวเสียงเป้าหมายต่อส่วน (None = ใช้ tts_chunk_target_s จากการตั้งค่า)
+            speed: ความเร็วในการพูด (ใช้ประมาณความยาวเสียง)
             
         Returns:
             List[str]: รายการข้อความที่แบ่งแล้ว
         """
-        if len(text) <= max_chunk_size:
-            return [text]
+        if target_seconds is None:
+            target_seconds = self.performance_config.get("tts_chunk_target_s", 20)
         
-        chunks = []
-        current_chunk = ""
+        chunks = chunk_text(text, target_seconds=target_seconds, max_chars=max_chunk_size, speed=speed)
         
-        # แบ่งตามประโยค
-        sentences = text.replace(".", ".\\n").replace("!", "!\\n").replace("?", "?\\n").split("\\n")
+        logger.info(f"Text chunked into {len(chunks)} parts")
+        return chunks
+    
+    def _split_stream_chunks(self, text: str, first_chunk_chars: int = 60,
+                             max_chunk_chars: int = 400) -> List[str]:
+        """
+        แบ่งข้อความสำหรับการประมวลผลแบบ pipeline โดยให้ส่วนแรกสั้นเพื่อให้ได้เสียงแรกเร็วที่สุด
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
+        Args:
+            text: ข้อความที่ต้องการแบ่ง
+            first_chunk_chars: ขนาดสูงสุดของส่วนแรก
+            max_chunk_chars: ขนาดสูงสุดของส่วนถัดไป
             
-            # ถ้าเพิ่มประโยคนี้แล้วยังไม่เกินขีดจำกัด
-            if len(current_chunk) + len(sentence) + 1 <= max_chunk_size:
-                if current_chunk:
-                    current_chunk += " " + sentence
-                else:
-                    current_chunk = sentence
+        Returns:
+            List[str]: รายการข้อความตามลำดับ
+        """
+        # แบ่งเป็นส่วนเล็กตามประโยค/คำ ก่อน แล้วรวมส่วนหลังส่วนแรกกลับให้ยาวขึ้น
+        pieces = self.smart_chunk_text(text, first_chunk_chars)
+        chunks = pieces[:1]
+        current_chunk = ""
+        for piece in pieces[1:]:
+            if current_chunk and len(current_chunk) + len(piece) + 1 > max_chunk_chars:
+                chunks.append(current_chunk)
+                current_chunk = piece
             else:
-                # เก็บ chunk ปัจจุบัน
-                if current_chunk:
-                    chunks.append(current_chunk)
-                
-                # เริ่ม chunk ใหม่
-                if len(sentence) <= max_chunk_size:
-                    current_chunk = sentence
-                else:
-                    # ประโยคยาวเกินไป ต้องแบ่งเป็นคำ
-                    words = sentence.split()
-                    temp_chunk = ""
-                    for word in words:
-                        if len(temp_chunk) + len(word) + 1 <= max_chunk_size:
-                            if temp_chunk:
-                                temp_chunk += " " + word
-                            else:
-                                temp_chunk = word
-                        else:
-                            if temp_chunk:
-                                chunks.append(temp_chunk)
-                            temp_chunk = word
-                    current_chunk = temp_chunk
-        
-        # เพิ่ม chunk สุดท้าย
+                current_chunk = f"{current_chunk} {piece}" if current_chunk else piece
         if current_chunk:
             chunks.append(current_chunk)
-        
-        logger.info(f"Text chunked into {len(chunks)} parts")
         return chunks
     
+    async def stream_unified(self, text: str, tts_voice: str, rvc_model: str = None,
+                             tts_speed: float = 1.0, tts_pitch: str = "+0Hz",
+                             rvc_transpose: int = 0, rvc_index_ratio: float = 0.75,
+                             rvc_f0_method: str = "rmvpe", first_chunk_chars: int = 60,
+                             max_chunk_chars: int = 400, crossfade_ms: int = 20,
+                             sample_rate: int = None, lookahead: int = 2) -> AsyncIterator[bytes]:
+        """
+        ประมวลผล TTS + RVC แบบ pipeline ทีละประโยค และส่งเสียงออกทันทีตามลำดับ
+        
+        ขณะที่ RVC แปลงประโยคที่ N อยู่ Edge TTS จะสร้างประโยคที่ N+1 ไปพร้อมกัน
+        รอยต่อระหว่างประโยคใช้ crossfade สั้นๆ
+        
+        Args:
+            text: ข้อความที่ต้องการแปลง
+            tts_voice: เสียง TTS
+            rvc_model: โมเดล RVC (None = TTS อย่างเดียว)
+            tts_speed: ความเร็ว TTS
+            tts_pitch: ระดับเสียง TTS
+            rvc_transpose: การขยับ pitch RVC
+            rvc_index_ratio: อัตราส่วน index RVC
+            rvc_f0_method: วิธีการ f0 RVC
+            first_chunk_chars: ขนาดสูงสุดของประโยคแรก (ยิ่งสั้นยิ่งได้เสียงแรกเร็ว)
+            max_chunk_chars: ขนาดสูงสุดของส่วนถัดไป
+            crossfade_ms: ความยาว crossfade ที่รอยต่อ (มิลลิวินาที)
+            sample_rate: sample rate ของ PCM ที่ส่งออก (None = audio_sample_rate ในการตั้งค่า)
+            lookahead: จำนวนประโยคที่สร้างล่วงหน้าได้ระหว่างรอส่งออก
+            
+        Yields:
+            bytes: เสียง PCM 16-bit mono little-endian
+        """
+        import numpy as np
+        
+        if not self.tts_available:
+            raise Exception("TTS system not available")
+        if rvc_model and not self.rvc_available:
+            raise Exception("RVC system not available")
+        
+        sample_rate = sample_rate or self.performance_config.get("audio_sample_rate", 44100)
+        chunks = self._split_stream_chunks(text.strip(), first_chunk_chars, max_chunk_chars)
+        logger.info(f"Streaming unified processing: {len(chunks)} chunks (first: {len(chunks[0]) if chunks else 0} chars)")
+        
+        loop = asyncio.get_running_loop()
+        jobs: asyncio.Queue = asyncio.Queue(maxsize=max(1, lookahead))
+        
+        async def produce():
+            # สร้าง TTS ทีละประโยค แล้วส่งต่อให้ RVC ทันที (ไม่รอให้ประโยคก่อนหน้าแปลงเสร็จ)
+            try:
+                for chunk in chunks:
+                    tts_audio = await self.generate_tts(chunk, tts_voice, tts_speed, tts_pitch)
+                    if rvc_model:
+                        job = asyncio.ensure_future(self.convert_voice_async(
+                            tts_audio, rvc_model, rvc_transpose, rvc_index_ratio, rvc_f0_method
+                        ))
+                    else:
+                        job = loop.create_future()
+                        job.set_result(tts_audio)
+                    await jobs.put(job)
+            except Exception as e:
+                failed = loop.create_future()
+                failed.set_exception(e)
+                await jobs.put(failed)
+            await jobs.put(None)
+        
+        producer = asyncio.create_task(produce())
+        pending_jobs = []
+        fade_len = int(sample_rate * crossfade_ms / 1000)
+        tail = np.zeros(0, dtype=np.float32)
+        
+        try:
+            while True:
+                job = await jobs.get()
+                if job is None:
+                    break
+                pending_jobs.append(job)
+                audio_bytes = await job
+                pending_jobs.remove(job)
+                
+                # ถอดรหัส/resample นอก event loop (ไม่บล็อกคำขออื่นระหว่าง stream)
+                audio_array = await asyncio.to_thread(self._decode_resampled, audio_bytes, sample_rate)
+                
+                # crossfade กับท้ายของประโยคก่อนหน้า
+                n = min(len(tail), len(audio_array))
+                if n > 0:
+                    ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+                    audio_array = audio_array.copy()
+                    audio_array[:n] = tail[-n:] * (1.0 - ramp) + audio_array[:n] * ramp
+                    audio_array = np.concatenate([tail[:-n], audio_array])
+                elif len(tail):
+                    audio_array = np.concatenate([tail, audio_array])
+                
+                # เก็บท้ายไว้สำหรับ crossfade กับประโยคถัดไป
+                split = max(0, len(audio_array) - fade_len)
+                tail = audio_array[split:]
+                if split:
+                    yield self._encode_pcm16(audio_array[:split])
+            
+            if len(tail):
+                yield self._encode_pcm16(tail)
+        finally:
+            producer.cancel()
+            for job in pending_jobs:
+                job.cancel()
+            while not jobs.empty():
+                job = jobs.get_nowait()
+                if job is not None:
+                    job.cancel()
+    
+    @staticmethod
+    def _encode_pcm16(audio_array: "np.ndarray") -> bytes:
+        """แปลงเสียง float32 เป็น PCM 16-bit little-endian"""
+        import numpy as np
+        
+        return (np.clip(audio_array, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    
     async def process_long_text(self, text: str, tts_voice: str,
                                max_chunk_size: int = 8000, **kwargs) -> Dict[str, Any]:
         """
-        ประมวลผลข้อความยาวด้วยการแบ่ง chunk
+        ประมวลผลข้อความยาวด้วยการแบ่ง chunk และประมวลผลหลาย chunk พร้อมกัน
+        
+        TTS ทำพร้อมกันตาม limit ของ tts_controller และ RVC ตามจำนวน worker ของ RVC
+        เสียงของแต่ละ chunk ถูกถอดรหัสแล้วรวมตามลำดับเป็นไฟล์ WAV เดียว
         
         Args:
             text: ข้อความยาว
             tts_voice: เสียง TTS
             max_chunk_size: ขนาดสูงสุดของแต่ละ chunk
             **kwargs: พารามิเตอร์อื่นๆ สำหรับ process_unified
+                (document_id: ถ้าระบุ ใช้ render_document สร้างเสียงใหม่เฉพาะประโยคที่แก้ไข)
             
         Returns:
-            Dict: ผลลัพธ์รวมจากทุก chunk
+            Dict: ผลลัพธ์รวมจากทุก chunk (รูปแบบเดียวกับ process_unified)
         """
-        # แบ่งข้อความ
-        chunks = self.smart_chunk_text(text, max_chunk_size)
+        import time
+        import numpy as np
+        
+        document_id = kwargs.pop("document_id", None)
+        if document_id:
+            return await self.render_document(text, tts_voice, document_id, max_chunk_size=max_chunk_size, **kwargs)
+        
+        # แบ่งข้อความตามความยาวเสียงพูด เพื่อให้แต่ละ chunk ที่ประมวลผลพร้อมกันใช้เวลาใกล้เคียงกัน
+        chunks = self.smart_chunk_text(text, max_chunk_size, speed=kwargs.get("tts_speed", 1.0))
         
-        if len(chunks) == 1:
+        if len(chunks) <= 1:
             # ข้อความสั้น ใช้ process_unified ธรรมดา
             return await self.process_unified(text, tts_voice, **kwargs)
         
-        # ประมวลผล chunk ทีละตัว
-        all_audio_data = []
-        all_processing_steps = []
-        total_stats = {
-            "chunks_count": len(chunks),
-            "total_text_length": len(text),
-            "chunk_sizes": [len(chunk) for chunk in chunks]
+        tts_speed = kwargs.get("tts_speed", 1.0)
+        tts_pitch = kwargs.get("tts_pitch", "+0Hz")
+        enable_multi_language = kwargs.get("enable_multi_language", False)
+        rvc_model = kwargs.get("rvc_model") if kwargs.get("enable_rvc") else None
+        
+        if rvc_model:
+            if not self.rvc_available:
+                return {"success": False, "error": "RVC system not available", "chunks_processed": 0}
+            rvc_model, model_error = await self._resolve_rvc_model(rvc_model)
+            if not rvc_model:
+                return {"success": False, "error": model_error, "chunks_processed": 0}
+        
+        rvc_semaphore = asyncio.Semaphore(self.rvc_max_workers)
+        
+        async def process_chunk(index: int, chunk: str):
+            started = time.perf_counter()
+            try:
+                audio_data = await self.generate_tts(chunk, tts_voice, tts_speed, tts_pitch, enable_multi_language)
+                tts_time = time.perf_counter() - started
+                
+                rvc_time = 0.0
+                if rvc_model:
+                    rvc_started = time.perf_counter()
+                    async with rvc_semaphore:
+                        audio_data = await self.convert_voice_async(
+                            audio_data, rvc_model,
+                            kwargs.get("rvc_transpose", 0),
+                            kwargs.get("rvc_index_ratio", 0.75),
+                            kwargs.get("rvc_f0_method", "rmvpe")
+                        )
+                    rvc_time = time.perf_counter() - rvc_started
+                
+                # ถอดรหัสนอก event loop (ffmpeg/pydub ใช้เวลานานกับ chunk ยาว)
+                audio_array, sample_rate = await asyncio.to_thread(self._decode_audio_bytes, audio_data)
+            except Exception as e:
+                raise Exception(f"Chunk {index + 1} processing failed: {e}") from e
+            
+            logger.info(f"Chunk {index + 1}/{len(chunks)} done: {len(chunk)} chars in {time.perf_counter() - started:.2f}s")
+            return audio_array, sample_rate, {
+                "chunk": index + 1,
+                "chars": len(chunk),
+                "started_s": round(started - wall_start, 3),
+                "tts_s": round(tts_time, 3),
+                "rvc_s": round(rvc_time, 3),
+                "total_s": round(time.perf_counter() - started, 3),
+                "audio_s": round(len(audio_array) / sample_rate, 3)
+            }
+        
+        wall_start = time.perf_counter()
+        tasks = [asyncio.create_task(process_chunk(i, chunk)) for i, chunk in enumerate(chunks)]
+        try:
+            results = await asyncio.gather(*tasks)
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            logger.error(f"Long text processing failed: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "chunks_processed": sum(1 for task in tasks if task.done() and not task.cancelled() and task.exception() is None)
+            }
+        
+        # รวมเสียงตามลำดับเป็น PCM เดียว แล้วเข้ารหัสเป็น WAV (นอก event loop)
+        output_sr = results[0][1]
+        
+        def combine() -> bytes:
+            pcm_parts = []
+            for audio_array, sample_rate, _ in results:
+                if sample_rate != output_sr:
+                    import soxr
+                    audio_array = soxr.resample(audio_array, sample_rate, output_sr)
+                pcm_parts.append(audio_array)
+            return self._encode_wav_bytes(np.concatenate(pcm_parts), output_sr)
+        
+        try:
+            combined_audio = await asyncio.to_thread(combine)
+        except Exception as e:
+            logger.error(f"Audio combination failed: {e}")
+            return {
+                "success": False,
+                "error": f"Audio combination failed: {str(e)}",
+                "chunks_processed": len(chunks)
+            }
+        
+        chunk_timings = [timing for _, _, timing in results]
+        processing_steps = ["tts_generation"] + (["voice_conversion"] if rvc_model else [])
+        return {
+            "success": True,
+            "final_audio_data": combined_audio,
+            "processing_steps": [f"chunk_{i+1}_{step}" for i in range(len(chunks)) for step in processing_steps],
+            "error": None,
+            "stats": {
+                "chunks_count": len(chunks),
+                "total_text_length": len(text),
+                "chunk_sizes": [len(chunk) for chunk in chunks],
+                "chunk_timings": chunk_timings,
+                "wall_time_s": round(time.perf_counter() - wall_start, 3),
+                "sum_chunk_time_s": round(sum(timing["total_s"] for timing in chunk_timings), 3),
+                "final_audio_size": len(combined_audio),
+                "sample_rate": output_sr,
+                "chunks_processed": len(chunks),
+                "processing_method": "multi_chunk_concurrent",
+                "voice_conversion_applied": bool(rvc_model),
+                "device": self.device
+            }
         }
+    
+    def _get_render_store(self):
+        """ที่เก็บ manifest และ PCM ของการเรนเดอร์เอกสาร (ใช้ร่วมกันทุกคำขอ เพื่อให้การจำกัดขนาดบนดิสก์ทำงาน)"""
+        if self.render_store is None:
+            from render_store import RenderStore
+            self.render_store = RenderStore(
+                self.performance_config.get("render_dir", "storage/renders"),
+                max_disk_bytes=self.performance_config.get("render_disk_mb", 2048) * 1024 * 1024,
+                max_manifest_bytes=self.performance_config.get("render_manifests_mb", 64) * 1024 * 1024
+            )
+        return self.render_store
+    
+    async def render_document(self, text: str, tts_voice: str, document_id: str,
+                              tts_speed: float = 1.0, tts_pitch: str = "+0Hz",
+                              enable_multi_language: bool = False, enable_rvc: bool = False,
+                              rvc_model: str = None, rvc_transpose: int = 0,
+                              rvc_index_ratio: float = 0.75, rvc_f0_method: str = "rmvpe",
+                              crossfade_ms: int = 20, max_chunk_size: int = 8000) -> Dict[str, Any]:
+        """
+        เรนเดอร์เอกสารยาวแบบ incremental: สร้างเสียงใหม่เฉพาะประโยคที่เปลี่ยนจากการเรนเดอร์ครั้งก่อน
         
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i+1}/{len(chunks)}: {len(chunk)} chars")
-            
-            chunk_result = await self.process_unified(chunk, tts_voice, **kwargs)
-            
-            if chunk_result["success"]:
-                all_audio_data.append(chunk_result["audio_data"])
-                all_processing_steps.extend([f"chunk_{i+1}_{step}" for step in chunk_result["processing_steps"]])
-            else:
-                logger.error(f"Chunk {i+1} failed: {chunk_result.get('error')}")
-                return {
-                    "success": False,
-                    "error": f"Chunk {i+1} processing failed: {chunk_result.get('error')}",
-                    "chunks_processed": i
-                }
+        ข้อความถูกแบ่งเป็นประโยค (ขอบเขตไม่เลื่อนเมื่อแก้ประโยคอื่น) แต่ละประโยคมี key จากข้อความ
+        เสียง PCM ของประโยคเก็บไว้ใน RenderStore แยกตามการตั้งค่าเสียง/RVC ประโยคที่มีเสียงอยู่แล้วไม่ต้องผ่าน
+        Edge TTS และ RVC อีก เสียงสุดท้ายประกอบจาก PCM ทั้งหมดพร้อม crossfade ที่รอยต่อ
+        manifest ของเอกสารบันทึกลำดับประโยคไว้บนดิสก์สำหรับเปรียบเทียบครั้งถัดไป
+        
+        Args:
+            text: ข้อความของเอกสาร
+            tts_voice: เสียง TTS
+            document_id: รหัสเอกสาร (ใช้ชื่อเดิมเมื่อส่งเอกสารที่แก้ไขแล้วมาอีกครั้ง)
+            tts_speed: ความเร็ว TTS
+            tts_pitch: ระดับเสียง TTS
+            enable_multi_language: เปิดใช้งานหลายภาษา
+            enable_rvc: เปิดใช้งาน RVC
+            rvc_model: โมเดล RVC
+            rvc_transpose: การขยับ pitch RVC
+            rvc_index_ratio: อัตราส่วน index RVC
+            rvc_f0_method: วิธีการ f0 RVC
+            crossfade_ms: ความยาว crossfade ที่รอยต่อ (มิลลิวินาที)
+            max_chunk_size: ขนาดสูงสุดของแต่ละประโยค (ตัวอักษร)
             
-            # หน่วงเวลาเล็กน้อยระหว่าง chunk
-            await asyncio.sleep(0.1)
+        Returns:
+            Dict: ผลลัพธ์รูปแบบเดียวกับ process_long_text พร้อมสถิติการใช้เสียงเดิม
+        """
+        import time
+        
+        wall_start = time.perf_counter()
+        rvc_model = rvc_model if enable_rvc else None
+        if rvc_model:
+            if not self.rvc_available:
+                return {"success": False, "error": "RVC system not available", "chunks_processed": 0}
+            rvc_model, model_error = await self._resolve_rvc_model(rvc_model)
+            if not rvc_model:
+                return {"success": False, "error": model_error, "chunks_processed": 0}
+        
+        sample_rate = self.performance_config.get("audio_sample_rate", 44100)
+        settings = {
+            "tts_voice": tts_voice,
+            "tts_speed": tts_speed,
+            "tts_pitch": tts_pitch,
+            "enable_multi_language": enable_multi_language,
+            "rvc_model": rvc_model,
+            "rvc_transpose": rvc_transpose if rvc_model else None,
+            "rvc_index_ratio": rvc_index_ratio if rvc_model else None,
+            "rvc_f0_method": rvc_f0_method if rvc_model else None,
+            "sample_rate": sample_rate
+        }
+        store = self._get_render_store()
+        settings_key = store.settings_key(settings)
+        
+        sentences = split_sentences(
+            self._clean_text(text),
+            target_seconds=self.performance_config.get("render_sentence_target_s", 10),
+            max_chars=max_chunk_size,
+            speed=tts_speed
+        )
+        if not sentences:
+            return {"success": False, "error": "Text is empty", "chunks_processed": 0}
+        keys = [store.unit_key(sentence) for sentence in sentences]
+        
+        previous = await asyncio.to_thread(store.load_manifest, document_id)
+        previous_keys = []
+        if previous and previous.get("settings_key") == settings_key:
+            previous_keys = [unit["key"] for unit in previous.get("sentences", [])]
+        diff = store.diff(previous_keys, keys)
+        
+        # โหลดเสียงที่เคยเรนเดอร์แล้ว (ประโยคซ้ำในเอกสารโหลด/สร้างครั้งเดียว)
+        sentence_for_key = dict(zip(keys, sentences))
+        audio_by_key = {}
+        for key in sentence_for_key:
+            audio = await asyncio.to_thread(store.load_pcm, settings_key, key)
+            if audio is not None:
+                audio_by_key[key] = audio
+        missing = [key for key in sentence_for_key if key not in audio_by_key]
+        reused = len(sentence_for_key) - len(missing)
+        logger.info(f"Rendering document '{document_id}': {len(sentences)} sentences, "
+                    f"{len(missing)} to synthesize, {reused} reused")
+        
+        rvc_semaphore = asyncio.Semaphore(self.rvc_max_workers)
+        
+        async def render_sentence(key: str):
+            sentence = sentence_for_key[key]
+            try:
+                audio_data = await self.generate_tts(sentence, tts_voice, tts_speed, tts_pitch, enable_multi_language)
+                if rvc_model:
+                    async with rvc_semaphore:
+                        audio_data = await self.convert_voice_async(
+                            audio_data, rvc_model, rvc_transpose, rvc_index_ratio, rvc_f0_method
+                        )
+                audio_array = await asyncio.to_thread(self._decode_resampled, audio_data, sample_rate)
+            except Exception as e:
+                raise Exception(f"Sentence '{sentence[:40]}' processing failed: {e}") from e
+            await asyncio.to_thread(store.save_pcm, settings_key, key, audio_array)
+            audio_by_key[key] = audio_array
         
-        # รวมเสียงทั้งหมด
+        tasks = [asyncio.create_task(render_sentence(key)) for key in missing]
         try:
-            combined_audio = b"".join(all_audio_data)
-            
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            logger.error(f"Document render failed: {e}")
+            # เสียงของประโยคที่เสร็จแล้วถูกเก็บไว้ ครั้งถัดไปจะไม่ต้องสร้างใหม่
             return {
-                "success": True,
-                "audio_data": combined_audio,
-                "processing_steps": all_processing_steps,
-                "stats": {
-                    **total_stats,
-                    "final_audio_size": len(combined_audio),
-                    "chunks_processed": len(chunks),
-                    "processing_method": "multi_chunk",
-                    "device": self.device
-                }
+                "success": False,
+                "error": str(e),
+                "chunks_processed": sum(1 for task in tasks if task.done() and not task.cancelled() and task.exception() is None)
             }
+        
+        try:
+            parts = [audio_by_key[key] for key in keys]
+            combined_audio = await asyncio.to_thread(
+                lambda: self._encode_wav_bytes(
+                    self._crossfade_concat(parts, int(sample_rate * crossfade_ms / 1000)), sample_rate
+                )
+            )
         except Exception as e:
             logger.error(f"Audio combination failed: {e}")
             return {
                 "success": False,
                 "error": f"Audio combination failed: {str(e)}",
-                "chunks_processed": len(chunks)
+                "chunks_processed": len(sentences)
             }
+        
+        await asyncio.to_thread(store.save_manifest, document_id, {
+            "settings": settings,
+            "settings_key": settings_key,
+            "sample_rate": sample_rate,
+            "sentences": [
+                {"key": key, "text": sentence, "samples": len(audio_by_key[key])}
+                for key, sentence in zip(keys, sentences)
+            ]
+        })
+        
+        processing_steps = ["tts_generation"] + (["voice_conversion"] if rvc_model else [])
+        return {
+            "success": True,
+            "final_audio_data": combined_audio,
+            "processing_steps": (processing_steps if missing else []) + ["incremental_render"],
+            "error": None,
+            "stats": {
+                "document_id": document_id,
+                "sentences_count": len(sentences),
+                "sentences_synthesized": len(missing),
+                "sentences_reused": reused,
+                "diff": diff,
+                "total_text_length": len(text),
+                "wall_time_s": round(time.perf_counter() - wall_start, 3),
+                "final_audio_size": len(combined_audio),
+                "sample_rate": sample_rate,
+                "chunks_processed": len(sentences),
+                "processing_method": "incremental_render",
+                "voice_conversion_applied": bool(rvc_model),
+                "device": self.device
+            }
+        }
+    
+    async def synthesize_template(self, template: str, slots: Dict[str, Any], tts_voice: str,
+                                  tts_speed: float = 1.0, tts_pitch: str = "+0Hz",
+                                  enable_rvc: bool = False, rvc_model: str = None,
+                                  rvc_transpose: int = 0, rvc_index_ratio: float = 0.75,
+                                  rvc_f0_method: str = "rmvpe", crossfade_ms: int = None) -> Dict[str, Any]:
+        """
+        สร้างเสียงจากข้อความแม่แบบ เช่น "Order {id} has shipped to {city}"
+        
+        ส่วนคงที่ของแม่แบบสร้างเสียง (TTS + RVC) ครั้งเดียวต่อชุดเสียง/โมเดล/พารามิเตอร์ แล้วใช้ PCM จากแคช
+        เฉพาะค่าของช่องเท่านั้นที่สร้างเสียงใหม่ทุกครั้ง ทุกส่วนถูกตัดความเงียบหัวท้าย
+        แล้วต่อกันด้วย crossfade สั้นๆ ที่รอยต่อ
+        
+        Args:
+            template: ข้อความแม่แบบ (ชื่อช่องอยู่ใน {} และใช้ {{ }} แทนวงเล็บปีกกาจริง)
+            slots: ค่าของแต่ละช่อง
+            tts_voice: เสียง TTS
+            tts_speed: ความเร็ว TTS
+            tts_pitch: ระดับเสียง TTS
+            enable_rvc: เปิดใช้งาน RVC
+            rvc_model: โมเดล RVC
+            rvc_transpose: การขยับ pitch RVC
+            rvc_index_ratio: อัตราส่วน index RVC
+            rvc_f0_method: วิธีการ f0 RVC
+            crossfade_ms: ความยาว crossfade ที่รอยต่อ (None = template_crossfade_ms ในการตั้งค่า)
+            
+        Returns:
+            Dict: ผลลัพธ์รูปแบบเดียวกับ process_unified (final_audio_data เป็น WAV)
+        """
+        import time
+        from render_store import RenderStore
+        from template_synthesis import parse_template, is_speakable, FragmentCache, STATIC
+        
+        started = time.perf_counter()
+        result = {"success": False, "final_audio_data": None, "processing_steps": [], "error": None, "stats": {}}
+        
+        try:
+            parts = parse_template(template)
+        except ValueError as e:
+            result["error"] = f"Invalid template: {e}"
+            return result
+        missing_slots = sorted({name for kind, name in parts if kind != STATIC and name not in slots})
+        if missing_slots:
+            result["error"] = f"Missing template slots: {', '.join(missing_slots)}"
+            return result
+        
+        rvc_model = rvc_model if enable_rvc else None
+        if rvc_model:
+            if not self.rvc_available:
+                result["error"] = "RVC system not available"
+                return result
+            rvc_model, model_error = await self._resolve_rvc_model(rvc_model)
+            if not rvc_model:
+                result["error"] = model_error
+                return result
+        
+        if self.template_cache is None:
+            self.template_cache = FragmentCache(
+                root=self.performance_config.get("template_cache_dir", "storage/cache/templates") or None,
+                max_entries=self.performance_config.get("template_cache_entries", 512),
+                max_disk_bytes=self.performance_config.get("template_cache_disk_mb", 256) * 1024 * 1024
+            )
+        sample_rate = self.performance_config.get("audio_sample_rate", 44100)
+        settings_key = RenderStore.settings_key({
+            "tts_voice": tts_voice,
+            "tts_speed": tts_speed,
+            "tts_pitch": tts_pitch,
+            "rvc_model": rvc_model,
+            "rvc_transpose": rvc_transpose if rvc_model else None,
+            "rvc_index_ratio": rvc_index_ratio if rvc_model else None,
+            "rvc_f0_method": rvc_f0_method if rvc_model else None,
+            "sample_rate": sample_rate
+        })
+        keep_ms = self.performance_config.get("template_trim_keep_ms", 40)
+        rvc_semaphore = asyncio.Semaphore(self.rvc_max_workers)
+        
+        async def render(text: str):
+            audio_data = await self.generate_tts(text, tts_voice, tts_speed, tts_pitch)
+            if rvc_model:
+                async with rvc_semaphore:
+                    audio_data = await self.convert_voice_async(
+                        audio_data, rvc_model, rvc_transpose, rvc_index_ratio, rvc_f0_method
+                    )
+            def decode():
+                audio_array = self._decode_resampled(audio_data, sample_rate)
+                return self._trim_silence(audio_array, sample_rate, keep_ms=keep_ms)
+            
+            return await asyncio.to_thread(decode)
+        
+        async def static_fragment(text: str):
+            audio = await asyncio.to_thread(self.template_cache.get, settings_key, text)
+            if audio is None:
+                audio = await render(text)
+                await asyncio.to_thread(self.template_cache.put, settings_key, text, audio)
+                synthesized_static.add(text)
+            return audio
+        
+        # ส่วนคงที่ที่ซ้ำกันในแม่แบบเดียวกันดึง/สร้างครั้งเดียว ส่วนที่มีแต่เครื่องหมายวรรคตอนข้ามไป
+        fragments = []
+        static_jobs = {}
+        slot_count = 0
+        synthesized_static = set()
+        for kind, value in parts:
+            text = (value if kind == STATIC else str(slots[value])).strip()
+            if not is_speakable(text):
+                continue
+            if kind == STATIC:
+                if text not in static_jobs:
+                    static_jobs[text] = asyncio.ensure_future(static_fragment(text))
+                fragments.append(static_jobs[text])
+            else:
+                slot_count += 1
+                fragments.append(asyncio.ensure_future(render(text)))
+        if not fragments:
+            result["error"] = "Template has nothing to speak"
+            return result
+        
+        unique_jobs = list({id(job): job for job in fragments}.values())
+        try:
+            await asyncio.gather(*unique_jobs)
+        except Exception as e:
+            for job in unique_jobs:
+                job.cancel()
+            logger.error(f"Template synthesis failed: {e}")
+            result["error"] = str(e)
+            return result
+        
+        if crossfade_ms is None:
+            crossfade_ms = self.performance_config.get("template_crossfade_ms", 15)
+        parts = [job.result() for job in fragments]
+        audio_array = await asyncio.to_thread(
+            self._crossfade_concat, parts, int(sample_rate * crossfade_ms / 1000)
+        )
+        result["final_audio_data"] = await asyncio.to_thread(self._encode_wav_bytes, audio_array, sample_rate)
+        result["success"] = True
+        result["processing_steps"] = ["tts_generation"] + (["voice_conversion"] if rvc_model else []) + ["template_assembly"]
+        result["stats"] = {
+            "fragments": len(fragments),
+            "static_fragments": len(static_jobs),
+            "static_cached": len(static_jobs) - len(synthesized_static),
+            "static_synthesized": len(synthesized_static),
+            "slots_synthesized": slot_count,
+            "audio_duration_s": round(len(audio_array) / sample_rate, 3),
+            "sample_rate": sample_rate,
+            "total_time_s": round(time.perf_counter() - started, 3),
+            "voice_conversion_applied": bool(rvc_model)
+        }
+        return result
+    
+    @staticmethod
+    def _trim_silence(audio_array: "np.ndarray", sample_rate: int, threshold: float = 0.01,
+                      keep_ms: int = 40) -> "np.ndarray":
+        """ตัดความเงียบหัวท้ายของเสียง โดยเหลือไว้ keep_ms เพื่อให้รอยต่อเป็นธรรมชาติ"""
+        import numpy as np
+        
+        voiced = np.flatnonzero(np.abs(audio_array) > threshold)
+        if not len(voiced):
+            return audio_array[:0]
+        keep = int(sample_rate * keep_ms / 1000)
+        return audio_array[max(0, voiced[0] - keep):voiced[-1] + keep + 1]
+    
+    @staticmethod
+    def _crossfade_concat(parts: List["np.ndarray"], fade_len: int) -> "np.ndarray":
+        """ต่อเสียงหลายส่วนตามลำดับ โดยทำ crossfade แบบ linear ที่รอยต่อ"""
+        import numpy as np
+        
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return np.zeros(0, dtype=np.float32)
+        
+        output = []
+        current = parts[0]
+        for part in parts[1:]:
+            n = min(fade_len, len(current), len(part))
+            if n > 0:
+                ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+                blended = current[-n:] * (1.0 - ramp) + part[:n] * ramp
+                output.append(current[:-n])
+                current = np.concatenate([blended, part[n:]])
+            else:
+                output.append(current)
+                current = part
+        output.append(current)
+        return np.concatenate(output).astype(np.float32, copy=False)
     
     def cleanup_temp_files(self):
         """ลบไฟล์ชั่วคราวที่เก่า"""
@@ -1074,7 +2037,7 @@ class TTSRVCCore:
 
     def detect_language_segments(self, text: str) -> List[Tuple[str, str]]:
         """
-        ตรวจจับและแยกข้อความตามภาษาแบบปรับปรุง
+        ตรวจจับและแยกข้อความตามภาษา (สแกนรอบเดียวด้วย regex ที่คอมไพล์ไว้ และจำผลของข้อความเดิม)
         
         Args:
             text: ข้อความที่ต้องการแยก
@@ -1082,131 +2045,7 @@ class TTSRVCCore:
         Returns:
             List[Tuple[str, str]]: รายการ (ข้อความ, ภาษา)
         """
-        if not text.strip():
-            return []
-        
-        segments = []
-        
-        # รูปแบบการตรวจจับภาษาแบบปรับปรุง
-        patterns = {
-            'english': r'[a-zA-Z]+(?:\\s+[a-zA-Z]+)*',
-            'lao': r'[\u0E80-\u0EFF]+(?:\\s+[\u0E80-\u0EFF]+)*',
-            'thai': r'[\u0E00-\u0E7F]+(?:\\s+[\u0E00-\u0E7F]+)*',
-            'chinese': r'[\u4E00-\u9FFF]+(?:\\s+[\u4E00-\u9FFF]+)*',
-            'japanese': r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]+(?:\\s+[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]+)*',
-            'numbers': r'\\d+(?:\\.\\d+)?',
-            'punctuation': r'[^\\w\\s\u0E00-\u0E7F\u0E80-\u0EFF\u4E00-\u9FFF\u3040-\u309F\u30A0-\u30FF]'
-        }
-        
-        # ตรวจสอบว่ามีตัวอักษรลาวในข้อความหรือไม่
-        has_lao = bool(re.search(r'[\u0E80-\u0EFF]', text))
-        has_english = bool(re.search(r'[a-zA-Z]', text))
-        
-        # ถ้ามีทั้งลาวและอังกฤษ ให้ใช้ multi-language detection
-        if has_lao and has_english:
-            # สร้าง regex pattern รวมแบบปรับปรุง
-            all_patterns = []
-            for lang_code, pattern in patterns.items():
-                all_patterns.append(f'(?P<{lang_code}>{pattern})')
-            
-            combined_pattern = '|'.join(all_patterns)
-            
-            # หา matches ทั้งหมด
-            matches = list(re.finditer(combined_pattern, text, re.UNICODE))
-            
-            if not matches:
-                # ถ้าไม่เจอรูปแบบใดๆ ให้ถือว่าเป็นภาษาลาว
-                return [(text, 'lao')]
-            
-            # จัดเรียงตามตำแหน่ง
-            matches.sort(key=lambda x: x.start())
-            
-            # แยกข้อความเป็นส่วนๆ
-            current_pos = 0
-            
-            for match in matches:
-                # เพิ่มข้อความที่ไม่ตรงกับรูปแบบใดๆ (ช่องว่าง, ฯลฯ)
-                if match.start() > current_pos:
-                    gap_text = text[current_pos:match.start()]
-                    if gap_text.strip():
-                        # กำหนดภาษาตามข้อความรอบข้าง
-                        surrounding_lang = self._determine_surrounding_language(matches, current_pos)
-                        segments.append((gap_text, surrounding_lang))
-                
-                # เพิ่มข้อความที่ตรงกับรูปแบบ
-                for lang_code in patterns.keys():
-                    if match.group(lang_code):
-                        segments.append((match.group(lang_code), lang_code))
-                        break
-                
-                current_pos = match.end()
-            
-            # เพิ่มข้อความที่เหลือ
-            if current_pos < len(text):
-                remaining_text = text[current_pos:]
-                if remaining_text.strip():
-                    surrounding_lang = self._determine_surrounding_language(matches, current_pos)
-                    segments.append((remaining_text, surrounding_lang))
-            
-            # รวมส่วนที่ติดกันและมีภาษาเดียวกัน
-            merged_segments = self._merge_adjacent_segments(segments)
-            
-            return merged_segments
-        else:
-            # ถ้ามีภาษาเดียว ให้ใช้ภาษาเดียว
-            if has_lao:
-                return [(text, 'lao')]
-            elif has_english:
-                return [(text, 'english')]
-            else:
-                return [(text, 'unknown')]
-        
-
-    
-    def _determine_surrounding_language(self, matches: List, position: int) -> str:
-        """กำหนดภาษาตามข้อความรอบข้าง"""
-        # หา match ที่ใกล้ที่สุด
-        closest_match = None
-        min_distance = float('inf')
-        
-        for match in matches:
-            distance = min(abs(match.start() - position), abs(match.end() - position))
-            if distance < min_distance:
-                min_distance = distance
-                closest_match = match
-        
-        if closest_match:
-            # กำหนดภาษาตาม match ที่ใกล้ที่สุด
-            for lang_code in ['lao', 'thai', 'english', 'chinese', 'japanese', 'numbers', 'punctuation']:
-                if closest_match.group(lang_code):
-                    return lang_code
-        
-        return 'lao'  # ค่าเริ่มต้น
-    
-    def _merge_adjacent_segments(self, segments: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
-        """รวมส่วนที่ติดกันและมีภาษาเดียวกัน"""
-        if not segments:
-            return []
-        
-        merged = []
-        current_text = segments[0][0]
-        current_lang = segments[0][1]
-        
-        for text, lang in segments[1:]:
-            # รวมถ้าภาษาเดียวกัน
-            if lang == current_lang:
-                current_text += text
-            else:
-                # บันทึกส่วนปัจจุบัน
-                merged.append((current_text, current_lang))
-                # เริ่มส่วนใหม่
-                current_text = text
-                current_lang = lang
-        
-        # บันทึกส่วนสุดท้าย
-        merged.append((current_text, current_lang))
-        
-        return merged
+        return list(segment_languages(text))
     
     def get_voice_for_language(self, language: str, base_voice: str) -> str:
         """
@@ -1219,15 +2058,6 @@ class TTSRVCCore:
         Returns:
             str: เสียงที่เหมาะสม
         """
-        # แมปปิ้งภาษาไปยังเสียงหลัก (ถ้าไม่ระบุเสียงเฉพาะ)
-        language_voice_mapping = {
-            'english': 'en-US-AriaNeural',
-            'lao': 'lo-LA-KeomanyNeural',      # เสียงผู้หญิงเป็นหลัก
-            'thai': 'th-TH-PremwadeeNeural',
-            'chinese': 'zh-CN-XiaoxiaoNeural',
-            'japanese': 'ja-JP-NanamiNeural'
-        }
-        
         # ถ้าเป็นตัวเลขหรือเครื่องหมายวรรคตอน ให้ใช้เสียงของข้อความรอบข้าง
         if language in ['numbers', 'punctuation']:
             return base_voice
@@ -1237,10 +2067,32 @@ class TTSRVCCore:
             return 'lo-LA-KeomanyNeural'
         
         # ถ้า base_voice เป็นเสียงลาวเฉพาะ ให้ใช้เสียงนั้น
-        if language == 'lao' and base_voice in self.get_available_lao_voices():
+        if language == 'lao' and base_voice in LAO_VOICES:
             return base_voice
             
-        return language_voice_mapping.get(language, base_voice)
+        # ใช้เสียงหลักของภาษา หรือเสียงแรกของภาษานั้นใน voice catalog ถ้าไม่มีเสียงหลัก
+        return self.voice_catalog.voice_for_language(language, LANGUAGE_VOICE_MAPPING.get(language, base_voice))
+    
+    def plan_multi_language_synthesis(self, language_segments: List[Tuple[str, str]], voice: str,
+                                      speed: float = 1.0) -> Dict[str, Any]:
+        """
+        วางแผนคำขอ Edge TTS สำหรับข้อความหลายภาษา
+        
+        Args:
+            language_segments: ผลของ detect_language_segments
+            voice: เสียงเริ่มต้น
+            speed: ความเร็วเริ่มต้น
+            
+        Returns:
+            Dict: แผนการสร้างเสียง (ดู synthesis_planner.plan_synthesis)
+        """
+        return plan_synthesis(
+            language_segments,
+            lambda language: self.get_voice_for_language(language, voice),
+            lambda language: self.get_speed_for_language(language, speed),
+            fold_languages=self.performance_config.get("tts_plan_fold_languages"),
+            short_run_chars=self.performance_config.get("tts_plan_short_run_chars", DEFAULT_SHORT_RUN_CHARS)
+        )
     
     def get_available_lao_voices(self) -> List[str]:
         """
@@ -1249,10 +2101,7 @@ class TTSRVCCore:
         Returns:
             List[str]: รายการเสียงภาษาลาว
         """
-        return [
-            'lo-LA-KeomanyNeural',      # ผู้หญิง - เสียงหลัก
-            'lo-LA-ChanthavongNeural'   # ผู้ชาย - เสียงรอง
-        ]
+        return list(LAO_VOICES)
     
     def get_voice_info(self, voice_name: str) -> Dict[str, Any]:
         """
@@ -1264,60 +2113,22 @@ class TTSRVCCore:
         Returns:
             Dict: ข้อมูลเสียง
         """
-        voice_info_mapping = {
-            # เสียงภาษาลาว
-            'lo-LA-KeomanyNeural': {
-                'language': 'lao',
-                'gender': 'female',
-                'name_lao': 'ແກ້ວມະນີ',
-                'name_thai': 'แก้วมณี',
-                'description': 'เสียงผู้หญิงลาว นุ่มนวล เป็นธรรมชาติ',
-                'recommended_speed': 0.7
-            },
-            'lo-LA-ChanthavongNeural': {
-                'language': 'lao',
-                'gender': 'male', 
-                'name_lao': 'ຈັນທະວົງ',
-                'name_thai': 'จันทวง',
-                'description': 'เสียงผู้ชายลาว แข็งแกร่ง ชัดเจน',
-                'recommended_speed': 0.7
-            },
-            # เสียงภาษาไทย
-            'th-TH-PremwadeeNeural': {
-                'language': 'thai',
-                'gender': 'female',
-                'name_thai': 'เปรมวดี',
-                'description': 'เสียงผู้หญิงไทย นุ่มนวล',
-                'recommended_speed': 0.8
-            },
-            'th-TH-NiwatNeural': {
-                'language': 'thai', 
-                'gender': 'male',
-                'name_thai': 'นิวัฒน์',
-                'description': 'เสียงผู้ชายไทย แข็งแกร่ง',
-                'recommended_speed': 0.8
-            },
-            # เสียงภาษาอังกฤษ
-            'en-US-AriaNeural': {
-                'language': 'english',
-                'gender': 'female',
-                'description': 'American Female - Natural and expressive',
-                'recommended_speed': 1.0
-            },
-            'en-US-GuyNeural': {
-                'language': 'english',
-                'gender': 'male', 
-                'description': 'American Male - Clear and confident',
+        info = VOICE_INFO.get(voice_name)
+        if info is not None:
+            return dict(info)
+        
+        # เสียงที่ไม่มีข้อมูลกำหนดไว้ ใช้ข้อมูลพื้นฐานจาก voice catalog
+        entry = self.voice_catalog.get(voice_name)
+        if entry is not None:
+            language_code = entry.get("Locale", "").split("-")[0].lower()
+            return {
+                'language': LANGUAGE_NAMES.get(language_code, language_code or 'unknown'),
+                'gender': entry.get("Gender", "unknown").lower(),
+                'description': entry.get("FriendlyName", voice_name),
                 'recommended_speed': 1.0
             }
-        }
         
-        return voice_info_mapping.get(voice_name, {
-            'language': 'unknown',
-            'gender': 'unknown',
-            'description': 'Unknown voice',
-            'recommended_speed': 1.0
-        })
+        return dict(UNKNOWN_VOICE_INFO)
     
     def get_speed_for_language(self, language: str, base_speed: float = 1.0) -> float:
         """
@@ -1472,11 +2283,37 @@ SUPPORTED_VOICES = {
     "zh-CN-XiaoxiaoNeural": {"name": "Xiaoxiao (Chinese Female)", "gender": "Female", "language": "Chinese"}
 }
 
+# Instance กลางที่ใช้ร่วมกันทั้ง process (โมเดล, predictor และรายชื่อเสียงโหลดครั้งเดียว)
+_shared_core: Optional[TTSRVCCore] = None
+_shared_core_lock = threading.Lock()
+
 # Helper functions
 def create_core_instance(**kwargs) -> TTSRVCCore:
     """สร้าง instance ของ TTS-RVC Core"""
     return TTSRVCCore(**kwargs)
 
+def get_shared_core(**kwargs) -> TTSRVCCore:
+    """
+    ดึง instance กลางของ TTS-RVC Core (สร้างในการเรียกครั้งแรกเท่านั้น)
+    
+    Args:
+        **kwargs: พารามิเตอร์สำหรับ TTSRVCCore ใช้เฉพาะตอนสร้างครั้งแรก
+    """
+    global _shared_core
+    if _shared_core is None:
+        with _shared_core_lock:
+            if _shared_core is None:
+                _shared_core = TTSRVCCore(**kwargs)
+    return _shared_core
+
+def shutdown_shared_core():
+    """ปิด instance กลางและคืนทรัพยากร"""
+    global _shared_core
+    with _shared_core_lock:
+        core, _shared_core = _shared_core, None
+    if core is not None:
+        core.shutdown()
+
 def get_supported_voices() -> Dict[str, Dict[str, str]]:
     """ดึงรายการเสียงที่รองรับ"""
     return SUPPORTED_VOICES
@@ -0,0 +1,193 @@
+"""
+🗣️ Voice Catalog
+รายชื่อเสียง Edge TTS ที่โหลดครั้งเดียว เก็บลงดิสก์สำหรับการเริ่มระบบแบบออฟไลน์
+และรีเฟรชเบื้องหลังเมื่อเกินอายุ (TTL) แทนการเรียก edge_tts.list_voices() ทุกคำขอ
+"""
+
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+logger = logging.getLogger("VOICE_CATALOG")
+
+# ชื่อภาษาที่ใช้ในระบบ -> รหัสภาษาของ locale (เช่น th-TH -> th)
+LANGUAGE_CODES = {
+    "thai": "th",
+    "lao": "lo",
+    "english": "en",
+    "chinese": "zh",
+    "japanese": "ja"
+}
+
+# เวลารอก่อนลองดึงรายชื่อเสียงใหม่หลังจากดึงไม่สำเร็จ (วินาที)
+RETRY_INTERVAL = 60.0
+
+
+class VoiceCatalog:
+    """แคตตาล็อกเสียง Edge TTS พร้อมดัชนีตาม ShortName, locale และภาษา"""
+
+    def __init__(self, cache_path: Optional[str] = "storage/cache/voices.json",
+                 ttl_seconds: float = 24 * 3600):
+        """
+        เริ่มต้นแคตตาล็อก (โหลดจากดิสก์ทันทีถ้ามีไฟล์)
+
+        Args:
+            cache_path: ไฟล์เก็บรายชื่อเสียงบนดิสก์ (None = ไม่ใช้ดิสก์)
+            ttl_seconds: อายุของรายชื่อเสียงก่อนรีเฟรชเบื้องหลัง
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ttl_seconds = ttl_seconds
+
+        self.by_short_name: Dict[str, Dict[str, Any]] = {}
+        self.by_locale: Dict[str, List[str]] = {}
+        self.by_language: Dict[str, List[str]] = {}
+        self.loaded_at = 0.0
+        self.source = None
+
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._last_attempt = 0.0
+        self.stats = {"refreshes": 0, "refresh_failures": 0}
+
+        self._load_disk()
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.by_short_name)
+
+    def is_stale(self) -> bool:
+        return time.time() - self.loaded_at > self.ttl_seconds
+
+    def _index(self, voices: List[Dict[str, Any]], loaded_at: float, source: str):
+        """สร้างดัชนีใหม่ทั้งชุดแล้วสลับแทนของเดิม"""
+        by_short_name = {}
+        by_locale: Dict[str, List[str]] = {}
+        by_language: Dict[str, List[str]] = {}
+        for voice in voices:
+            short_name = voice.get("ShortName")
+            if not short_name:
+                continue
+            locale = voice.get("Locale") or "-".join(short_name.split("-")[:2])
+            by_short_name[short_name] = voice
+            by_locale.setdefault(locale, []).append(short_name)
+            by_language.setdefault(locale.split("-")[0].lower(), []).append(short_name)
+
+        self.by_short_name = by_short_name
+        self.by_locale = by_locale
+        self.by_language = by_language
+        self.loaded_at = loaded_at
+        self.source = source
+
+    def _load_disk(self):
+        """โหลดรายชื่อเสียงที่บันทึกไว้บนดิสก์"""
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._index(data.get("voices", []), float(data.get("fetched_at", 0)), "disk")
+            logger.info(f"Loaded {len(self.by_short_name)} voices from {self.cache_path}")
+        except Exception as e:
+            logger.warning(f"Failed to load voice catalog from disk: {e}")
+
+    def _save_disk(self, voices: List[Dict[str, Any]], fetched_at: float):
+        """บันทึกรายชื่อเสียงลงดิสก์แบบ atomic"""
+        if not self.cache_path:
+            return
+        tmp_path = self.cache_path.parent / f"{self.cache_path.name}.tmp"
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": fetched_at, "voices": voices}, f, ensure_ascii=False)
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to save voice catalog: {e}")
+
+    async def refresh(self) -> bool:
+        """ดึงรายชื่อเสียงล่าสุดจาก Edge TTS แล้วบันทึกลงดิสก์"""
+        self._last_attempt = time.time()
+        try:
+            import edge_tts
+            voices = await edge_tts.list_voices()
+        except Exception as e:
+            self.stats["refresh_failures"] += 1
+            logger.warning(f"Failed to refresh voice catalog: {e}")
+            return False
+
+        fetched_at = time.time()
+        self._index(voices, fetched_at, "edge_tts")
+        self.stats["refreshes"] += 1
+        await asyncio.to_thread(self._save_disk, voices, fetched_at)
+        logger.info(f"Voice catalog refreshed: {len(self.by_short_name)} voices")
+        return True
+
+    def _schedule_refresh(self) -> asyncio.Task:
+        """เริ่มรีเฟรชเบื้องหลัง (มีได้ครั้งละหนึ่งงานต่อ event loop)"""
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.get_running_loop().create_task(self.refresh())
+            self._refresh_task = task
+        return task
+
+    async def ensure_loaded(self):
+        """
+        ทำให้แคตตาล็อกพร้อมใช้
+
+        ถ้ายังไม่เคยโหลดเลยจะรอการดึงครั้งแรก, ถ้าเกิน TTL จะใช้ข้อมูลเดิมไปก่อน
+        และรีเฟรชเบื้องหลัง (ไม่อยู่ในเส้นทางของคำขอ)
+        """
+        if time.time() - self._last_attempt < RETRY_INTERVAL:
+            # เพิ่งลองดึงไป (สำเร็จหรือไม่ก็ตาม) ไม่ต้องลองซ้ำ
+            if not self.loaded and self._refresh_task is not None and not self._refresh_task.done():
+                await asyncio.shield(self._refresh_task)
+            return
+        if not self.loaded:
+            await asyncio.shield(self._schedule_refresh())
+        elif self.is_stale():
+            self._schedule_refresh()
+
+    def is_valid(self, voice: str) -> Optional[bool]:
+        """ตรวจสอบว่ามีเสียงนี้หรือไม่ (None = ยังไม่มีข้อมูลให้ตรวจสอบ)"""
+        if not self.loaded:
+            return None
+        return voice in self.by_short_name
+
+    def get(self, voice: str) -> Optional[Dict[str, Any]]:
+        """ข้อมูลของเสียงจาก Edge TTS (Gender, Locale, FriendlyName, ...)"""
+        return self.by_short_name.get(voice)
+
+    def short_names(self) -> List[str]:
+        return list(self.by_short_name)
+
+    def voices_for_language(self, language: str) -> List[str]:
+        """รายชื่อเสียงของภาษา (รับได้ทั้งชื่อภาษา เช่น thai และรหัสภาษา เช่น th)"""
+        return self.by_language.get(LANGUAGE_CODES.get(language, language), [])
+
+    def voice_for_language(self, language: str, preferred: str) -> str:
+        """
+        เลือกเสียงสำหรับภาษา
+
+        Args:
+            language: ภาษาที่ต้องการ
+            preferred: เสียงที่ต้องการใช้ถ้ามีในแคตตาล็อก
+
+        Returns:
+            str: preferred ถ้ามีอยู่ (หรือยังไม่มีข้อมูล), ไม่เช่นนั้นเสียงแรกของภาษานั้น
+        """
+        if self.is_valid(preferred) is not False:
+            return preferred
+        voices = self.voices_for_language(language)
+        return voices[0] if voices else preferred
+
+    def get_stats(self) -> Dict[str, Any]:
+        """สถานะของแคตตาล็อก"""
+        return {
+            **self.stats,
+            "voices": len(self.by_short_name),
+            "locales": len(self.by_locale),
+            "source": self.source,
+            "age_s": round(time.time() - self.loaded_at, 1) if self.loaded else None,
+            "ttl_s": self.ttl_seconds
+        }
@@ -20,7 +20,7 @@ sys.path.insert(0, str(project_root))
 
 # Import core system
 try:
-    from tts_rvc_core import TTSRVCCore, get_supported_voices, create_core_instance
+    from tts_rvc_core import TTSRVCCore, get_supported_voices, create_core_instance, get_shared_core
     CORE_AVAILABLE = True
 except ImportError:
     CORE_AVAILABLE = False
@@ -36,7 +36,7 @@ class CompleteWebInterface:
         
         if CORE_AVAILABLE:
             try:
-                self.core = create_core_instance()
+                self.core = get_shared_core()
                 print("✅ TTS-RVC Core loaded in Complete Web Interface")
             except Exception as e:
                 print(f"⚠️ Failed to load TTS-RVC Core: {e}")
@@ -1232,7 +1232,7 @@ class CompleteWebInterface:
                                 
                                 # RVC (ถ้ามี)
                                 if data.get('enable_rvc') and data.get('rvc_model'):
-                                    audio_data = self.web_interface.core.convert_voice(
+                                    audio_data = await self.web_interface.core.convert_voice_async(
                                         audio_data, 
                                         data['rvc_model'],
                                         data.get('rvc_transpose', 0),